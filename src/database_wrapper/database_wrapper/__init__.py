@@ -8,12 +8,15 @@ import logging
 
 from . import utils
 from .abc import ConnectionABC, ConnectionAsyncABC, CursorABC, CursorAsyncABC
+from .buffered_writer import BufferedWriter, BufferedWriterAsync
 from .common import DataModelType, NoParam, OrderByItem
 from .db_backend import DatabaseBackend
-from .db_data_model import DBDataModel, DBDefaultsDataModel, MetadataDict
+from .db_data_model import ColumnItem, DBDataModel, DBDefaultsDataModel, MetadataDict
 from .db_introspector import ColumnMetaIntrospector, DBIntrospector
 from .db_wrapper import DBWrapper
 from .db_wrapper_async import DBWrapperAsync
+from .materialized import MaterializedResult
+from .pagination import KeysetPage
 from .serialization import SerializeType
 from .utils.dataclass_addons import ignore_unknown_kwargs
 
@@ -33,10 +36,15 @@ __all__ = [
     # Wrappers
     "DBWrapper",
     "DBWrapperAsync",
+    "BufferedWriter",
+    "BufferedWriterAsync",
     # Helpers
     "MetadataDict",
     "DataModelType",
     "OrderByItem",
+    "ColumnItem",
+    "KeysetPage",
+    "MaterializedResult",
     "NoParam",
     "utils",
     "SerializeType",
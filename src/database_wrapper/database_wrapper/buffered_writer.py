@@ -0,0 +1,444 @@
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable
+from typing import Any, Literal
+
+from .db_data_model import DBDataModel
+from .db_wrapper import DBWrapper
+from .db_wrapper_async import DBWrapperAsync
+
+FlushMethod = Literal["insert", "copy"]
+
+FlushErrorCallback = Callable[[Exception, list[DBDataModel]], None]
+
+
+class BufferedWriterMixin:
+    """
+    Mixin class for the BufferedWriter classes to provide the buffering that is
+    shared by both sync and async versions.
+
+    :property max_records: Number of buffered records of a table that triggers a flush
+    :property max_age: Seconds after which the buffered records of a table are flushed
+    :property max_buffered: Maximum number of records buffered and being written, `add` waits above it
+    :property method: Flush with multi-row INSERT ("insert") or `bulk_load` of the wrapper ("copy")
+    :property on_error: Called with the error and the records of a failed flush
+    """
+
+    max_records: int
+    """ Number of buffered records of a table that triggers a flush """
+
+    max_age: float
+    """ Seconds after which the buffered records of a table are flushed """
+
+    max_buffered: int
+    """ Maximum number of records buffered and being written, `add` waits above it """
+
+    method: FlushMethod
+    """
+    Flush with the multi-row INSERT of `insert` ("insert"), which all SQL wrappers support,
+    or with `bulk_load` ("copy"), COPY on PostgreSQL and LOAD DATA on MySQL
+    """
+
+    on_error: FlushErrorCallback | None
+    """ Called with the error and the records of a failed flush, the records are dropped after it """
+
+    logger: logging.Logger
+    """ Logger object """
+
+    def __init__(
+        self,
+        db_wrapper: DBWrapper | DBWrapperAsync,
+        max_records: int = 1000,
+        max_age: float = 1.0,
+        max_buffered: int = 10_000,
+        method: FlushMethod = "insert",
+        on_error: FlushErrorCallback | None = None,
+    ) -> None:
+        if max_records < 1:
+            raise ValueError("Max records must be at least 1")
+        if max_buffered < max_records:
+            raise ValueError("Max buffered must be at least max records")
+
+        # Bulk load is provided by the PostgreSQL and MySQL wrappers only
+        self._bulk_load: Callable[[list[DBDataModel]], Any] | None = getattr(db_wrapper, "bulk_load", None)
+        if method == "copy" and self._bulk_load is None:
+            raise ValueError("Bulk load is not supported by the wrapper")
+
+        self.max_records = max_records
+        self.max_age = max_age
+        self.max_buffered = max_buffered
+        self.method = method
+        self.on_error = on_error
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+        # Buffered records per (schema, table), and when the oldest of them was added
+        self._buffers: dict[tuple[str | None, str], list[DBDataModel]] = {}
+        self._started: dict[tuple[str | None, str], float] = {}
+
+        # Records that were added, and that were written or dropped, the difference is held in memory
+        self._added = 0
+        self._done = 0
+
+        self._flush_all = False
+        self._closed = False
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of records that are buffered or being written.
+        """
+        return self._added - self._done
+
+    ######################
+    ### Helper methods ###
+    ######################
+
+    def _buffer(self, record: DBDataModel) -> bool:
+        """
+        Adds a record to the buffer of its table.
+
+        Returns:
+            bool: True if the background writer should be woken, because the buffer is full
+                or was started and so changes when the next flush is due.
+        """
+        key = (record.schema_name, record.table_name)
+        buffer = self._buffers.get(key)
+        started = buffer is None
+        if buffer is None:
+            buffer = self._buffers[key] = []
+            self._started[key] = time.monotonic()
+
+        buffer.append(record)
+        self._added += 1
+        return started or len(buffer) >= self.max_records
+
+    def _take_due(self) -> list[list[DBDataModel]]:
+        """
+        Takes the buffers that are full, too old, or all of them if a flush was requested.
+
+        Returns:
+            list[list[DBDataModel]]: Batches of at most `max_records` records of one table each.
+        """
+        now = time.monotonic()
+        batches: list[list[DBDataModel]] = []
+        for key in list(self._buffers):
+            buffer = self._buffers[key]
+            if not (self._flush_all or len(buffer) >= self.max_records or now - self._started[key] >= self.max_age):
+                continue
+
+            del self._buffers[key]
+            del self._started[key]
+            batch_size = self.max_records
+            batches.extend(buffer[start : start + batch_size] for start in range(0, len(buffer), batch_size))
+
+        if not self._buffers:
+            self._flush_all = False
+
+        return batches
+
+    def _next_timeout(self) -> float | None:
+        """
+        Seconds until the oldest buffer is due, None if nothing is buffered.
+        """
+        if not self._started:
+            return None
+
+        return max(0.0, min(self._started.values()) + self.max_age - time.monotonic())
+
+    def _handle_error(self, error: Exception, records: list[DBDataModel]) -> None:
+        if self.on_error is None:
+            self.logger.exception(f"Failed to write {len(records)} buffered records", exc_info=error)
+            return
+
+        try:
+            self.on_error(error, records)
+        except Exception:
+            self.logger.exception("Flush error callback failed")
+
+
+class BufferedWriter(BufferedWriterMixin):
+    """
+    Write-behind buffer for a DBWrapper. Records are collected per table and stored in bulk
+    by a background thread when `max_records` of a table are buffered or the oldest is `max_age`
+    seconds old, and on `close()`. When `max_buffered` records are pending, `add` waits until
+    they are written.
+
+    The wrapper is used from the background thread only, so give the writer a wrapper with
+    its own connection, in autocommit mode. Failed flushes are passed to `on_error` and dropped.
+
+    Use it as a context manager or call `close()` to write the remaining records.
+    """
+
+    db_wrapper: DBWrapper
+    """ The wrapper to write with """
+
+    def __init__(
+        self,
+        db_wrapper: DBWrapper,
+        max_records: int = 1000,
+        max_age: float = 1.0,
+        max_buffered: int = 10_000,
+        method: FlushMethod = "insert",
+        on_error: FlushErrorCallback | None = None,
+    ) -> None:
+        """
+        Initializes the writer and starts its background thread.
+
+        Args:
+            db_wrapper (DBWrapper): The wrapper to write with.
+            max_records (int, optional): Number of buffered records of a table that triggers a flush. Defaults to 1000.
+            max_age (float, optional): Seconds after which buffered records are flushed. Defaults to 1.0.
+            max_buffered (int, optional): Maximum number of pending records. Defaults to 10_000.
+            method (FlushMethod, optional): Flush with multi-row INSERT or COPY. Defaults to "insert".
+            on_error (FlushErrorCallback | None, optional): Called with the error and the records
+                of a failed flush. Defaults to None, which logs the error.
+        """
+        super().__init__(db_wrapper, max_records, max_age, max_buffered, method, on_error)
+        self.db_wrapper = db_wrapper
+
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="dbw-buffered-writer", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "BufferedWriter":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        self.close()
+
+    def add(self, record: DBDataModel) -> None:
+        """
+        Adds a record to be stored. Waits while `max_buffered` records are pending.
+
+        Args:
+            record (DBDataModel): The record to store.
+        """
+        with self._condition:
+            while not self._closed and self.pending >= self.max_buffered:
+                self._condition.wait()
+            if self._closed:
+                raise RuntimeError("Writer is closed")
+
+            if self._buffer(record):
+                self._condition.notify_all()
+
+    def add_many(self, records: Iterable[DBDataModel]) -> None:
+        """
+        Adds records to be stored, see `add`.
+
+        Args:
+            records (Iterable[DBDataModel]): The records to store.
+        """
+        for record in records:
+            self.add(record)
+
+    def flush(self) -> None:
+        """
+        Writes all buffered records and waits until the records added so far are written.
+        """
+        with self._condition:
+            target = self._added
+            self._flush_all = True
+            self._condition.notify_all()
+            while self._done < target and self._thread.is_alive():
+                self._condition.wait()
+
+    def close(self) -> None:
+        """
+        Writes the remaining records and stops the background thread.
+        """
+        with self._condition:
+            if self._closed:
+                return
+
+            self._closed = True
+            self._flush_all = True
+            self._condition.notify_all()
+
+        self._thread.join()
+
+    ######################
+    ### Helper methods ###
+    ######################
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                batches = self._take_due()
+                while not batches and not self._closed:
+                    self._condition.wait(self._next_timeout())
+                    batches = self._take_due()
+
+                if not batches:
+                    return
+
+            for records in batches:
+                self._write(records)
+                with self._condition:
+                    self._done += len(records)
+                    self._condition.notify_all()
+
+    def _write(self, records: list[DBDataModel]) -> None:
+        try:
+            if self.method == "copy" and self._bulk_load is not None:
+                self._bulk_load(records)
+            else:
+                self.db_wrapper.insert(records, batch_size=self.max_records)
+
+        except Exception as error:
+            self._handle_error(error, records)
+
+
+class BufferedWriterAsync(BufferedWriterMixin):
+    """
+    Write-behind buffer for a DBWrapperAsync. Records are collected per table and stored in bulk
+    by a background task when `max_records` of a table are buffered or the oldest is `max_age`
+    seconds old, and on `close()`. When `max_buffered` records are pending, `add` waits until
+    they are written.
+
+    The wrapper is used from the background task only, so give the writer a wrapper with
+    its own connection, in autocommit mode. Failed flushes are passed to `on_error` and dropped.
+
+    Use it as an async context manager or call `close()` to write the remaining records.
+    """
+
+    db_wrapper: DBWrapperAsync
+    """ The wrapper to write with """
+
+    def __init__(
+        self,
+        db_wrapper: DBWrapperAsync,
+        max_records: int = 1000,
+        max_age: float = 1.0,
+        max_buffered: int = 10_000,
+        method: FlushMethod = "insert",
+        on_error: FlushErrorCallback | None = None,
+    ) -> None:
+        """
+        Initializes the writer, its background task is started by the first `add`.
+
+        Args:
+            db_wrapper (DBWrapperAsync): The wrapper to write with.
+            max_records (int, optional): Number of buffered records of a table that triggers a flush. Defaults to 1000.
+            max_age (float, optional): Seconds after which buffered records are flushed. Defaults to 1.0.
+            max_buffered (int, optional): Maximum number of pending records. Defaults to 10_000.
+            method (FlushMethod, optional): Flush with multi-row INSERT or COPY. Defaults to "insert".
+            on_error (FlushErrorCallback | None, optional): Called with the error and the records
+                of a failed flush. Defaults to None, which logs the error.
+        """
+        super().__init__(db_wrapper, max_records, max_age, max_buffered, method, on_error)
+        self.db_wrapper = db_wrapper
+
+        self._condition: asyncio.Condition | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    async def __aenter__(self) -> "BufferedWriterAsync":
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        await self.close()
+
+    async def add(self, record: DBDataModel) -> None:
+        """
+        Adds a record to be stored. Waits while `max_buffered` records are pending.
+
+        Args:
+            record (DBDataModel): The record to store.
+        """
+        condition = self._start()
+        async with condition:
+            while not self._closed and self.pending >= self.max_buffered:
+                await condition.wait()
+            if self._closed:
+                raise RuntimeError("Writer is closed")
+
+            if self._buffer(record):
+                condition.notify_all()
+
+    async def add_many(self, records: Iterable[DBDataModel]) -> None:
+        """
+        Adds records to be stored, see `add`.
+
+        Args:
+            records (Iterable[DBDataModel]): The records to store.
+        """
+        for record in records:
+            await self.add(record)
+
+    async def flush(self) -> None:
+        """
+        Writes all buffered records and waits until the records added so far are written.
+        """
+        if self._task is None:
+            return
+
+        condition = self._start()
+        async with condition:
+            target = self._added
+            self._flush_all = True
+            condition.notify_all()
+            while self._done < target and not self._task.done():
+                await condition.wait()
+
+    async def close(self) -> None:
+        """
+        Writes the remaining records and stops the background task.
+        """
+        if self._closed:
+            return
+
+        self._closed = True
+        if self._task is None:
+            return
+
+        condition = self._start()
+        async with condition:
+            self._flush_all = True
+            condition.notify_all()
+
+        await self._task
+
+    ######################
+    ### Helper methods ###
+    ######################
+
+    def _start(self) -> asyncio.Condition:
+        # The condition and the task need a running event loop, so they are created on first use
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(self._condition))
+
+        return self._condition
+
+    async def _run(self, condition: asyncio.Condition) -> None:
+        while True:
+            async with condition:
+                batches = self._take_due()
+                while not batches and not self._closed:
+                    try:
+                        await asyncio.wait_for(condition.wait(), self._next_timeout())
+                    except TimeoutError:
+                        pass
+                    batches = self._take_due()
+
+                if not batches:
+                    return
+
+            for records in batches:
+                await self._write(records)
+                async with condition:
+                    self._done += len(records)
+                    condition.notify_all()
+
+    async def _write(self, records: list[DBDataModel]) -> None:
+        try:
+            if self.method == "copy" and self._bulk_load is not None:
+                await self._bulk_load(records)
+            else:
+                await self.db_wrapper.insert(records, batch_size=self.max_records)
+
+        except Exception as error:
+            self._handle_error(error, records)
@@ -0,0 +1,183 @@
+import datetime
+from collections.abc import Sequence
+from decimal import Decimal
+from functools import reduce
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+
+def _import_numpy() -> Any:
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            "NumPy is required for columnar results, install it with `pip install database_wrapper[numpy]`"
+        ) from e
+
+    return numpy
+
+
+def _to_utc_naive(value: datetime.datetime) -> datetime.datetime:
+    if value.tzinfo is None:
+        return value
+
+    return value.astimezone(datetime.UTC).replace(tzinfo=None)
+
+
+class ColumnarBuilder:
+    """
+    Collects rows batch by batch and turns them into one NumPy array per column.
+
+    Every batch is converted into typed arrays as soon as it is added,
+    so Python row objects can be freed while the cursor is still being read.
+
+    Type mapping:
+    - bool -> bool (object, if there are NULLs)
+    - int -> int64 (float64 with NaN, if there are NULLs)
+    - float, Decimal -> float64, NULLs become NaN
+    - datetime -> datetime64[us], timezone aware values are converted to UTC, NULLs become NaT
+    - date -> datetime64[D], NULLs become NaT
+    - timedelta -> timedelta64[us], NULLs become NaT
+    - everything else -> object
+    """
+
+    columns: list[str] | None
+    """ Column names, in the order they were returned by the cursor """
+
+    chunks: dict[str, list[Any]]
+    """ Converted chunks per column, an int marks a chunk with only NULL values """
+
+    def __init__(self, columns: Sequence[str] | None = None) -> None:
+        self.np = _import_numpy()
+        self.columns = None
+        self.chunks = {}
+        if columns is not None:
+            self.set_columns(columns)
+
+    def set_columns(self, columns: Sequence[str]) -> None:
+        """
+        Sets the column names, if they are not known yet.
+
+        Args:
+            columns (Sequence[str]): The column names.
+        """
+        if self.columns is not None:
+            return
+
+        self.columns = list(columns)
+        self.chunks = {name: [] for name in self.columns}
+
+    def add_rows(self, rows: Sequence[dict[str, Any]]) -> None:
+        """
+        Converts a batch of dict rows and adds it to the result.
+
+        Args:
+            rows (Sequence[dict[str, Any]]): The rows to add.
+        """
+        if not rows:
+            return
+
+        self.set_columns(list(rows[0].keys()))
+        assert self.columns is not None
+
+        for name in self.columns:
+            self.chunks[name].append(self._to_array([row[name] for row in rows]))
+
+    def build(self) -> dict[str, "NDArray[Any]"]:
+        """
+        Merges the collected chunks into one array per column.
+
+        Returns:
+            dict[str, NDArray[Any]]: Column name to values.
+        """
+        return {name: self._merge(self.chunks[name]) for name in self.columns or []}
+
+    ######################
+    ### Helper methods ###
+    ######################
+
+    def _to_array(self, values: list[Any]) -> Any:
+        np = self.np
+
+        non_null = [value for value in values if value is not None]
+        if not non_null:
+            return len(values)
+
+        has_null = len(non_null) != len(values)
+        types = {type(value) for value in non_null}
+
+        if types == {bool}:
+            if has_null:
+                return np.array(values, dtype=object)
+            return np.array(values, dtype=np.bool_)
+
+        if types == {int} and not has_null:
+            try:
+                return np.array(values, dtype=np.int64)
+            except OverflowError:
+                return np.array(values, dtype=object)
+
+        if types <= {int, float, Decimal}:
+            return np.array(
+                [np.nan if value is None else float(value) for value in values],
+                dtype=np.float64,
+            )
+
+        if all(issubclass(t, datetime.datetime) for t in types):
+            return np.array(
+                [None if value is None else _to_utc_naive(value) for value in values],
+                dtype="datetime64[us]",
+            )
+
+        if types == {datetime.date}:
+            return np.array(values, dtype="datetime64[D]")
+
+        if all(issubclass(t, datetime.timedelta) for t in types):
+            return np.array(values, dtype="timedelta64[us]")
+
+        # Assign one by one, so that list values are not broadcast into a second dimension
+        array = np.empty(len(values), dtype=object)
+        for index, value in enumerate(values):
+            array[index] = value
+        return array
+
+    def _merge(self, chunks: list[Any]) -> "NDArray[Any]":
+        np = self.np
+
+        arrays = [chunk for chunk in chunks if not isinstance(chunk, int)]
+        total = sum(chunk if isinstance(chunk, int) else len(chunk) for chunk in chunks)
+        if not arrays:
+            return np.full(total, None, dtype=object)
+
+        try:
+            dtype = reduce(np.result_type, (array.dtype for array in arrays))
+        except TypeError:
+            dtype = np.dtype(object)
+
+        # Time values mixed with anything else can not be merged into a typed array
+        kinds = {array.dtype.kind for array in arrays}
+        if len(kinds) > 1 and kinds & {"m", "M"}:
+            dtype = np.dtype(object)
+
+        # NULL only chunks need a dtype that can represent missing values
+        if len(arrays) != len(chunks):
+            if dtype.kind in "iu":
+                dtype = np.dtype(np.float64)
+            elif dtype.kind == "b":
+                dtype = np.dtype(object)
+
+        merged = []
+        for chunk in chunks:
+            if isinstance(chunk, int):
+                # None becomes NaT for time values
+                merged.append(np.full(chunk, np.nan if dtype.kind == "f" else None, dtype=dtype))
+            elif chunk.dtype != dtype and dtype == np.dtype(object):
+                converted = np.empty(len(chunk), dtype=object)
+                converted[:] = chunk.tolist()
+                merged.append(converted)
+            else:
+                merged.append(chunk.astype(dtype, copy=False))
+
+        return np.concatenate(merged)
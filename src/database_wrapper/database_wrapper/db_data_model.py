@@ -1,11 +1,13 @@
+import copy
 import dataclasses
 import datetime
 import json
 import re
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 from dataclasses import asdict, dataclass, field
 from enum import Enum
-from typing import Any, ClassVar, Literal, NotRequired, TypedDict, TypeVar, cast
+from functools import partial
+from typing import Any, ClassVar, Literal, NotRequired, Self, TypedDict, TypeVar, cast
 
 from .serialization import (
     SerializeType,
@@ -16,18 +18,138 @@ from .serialization import (
 
 EnumType = TypeVar("EnumType", bound=Enum)
 
+# Column to select, either a column name or a (column, alias) pair.
+# PostgreSQL also accepts JSON sub-paths as the column, e.g. "settings->theme"
+ColumnItem = str | tuple[str, str]
+
 
 class MetadataDict(TypedDict):
     db_field: tuple[str, str]
     store: bool
     update: bool
     exclude: NotRequired[bool]
+    select: NotRequired[bool]
     serialize: NotRequired[Callable[[Any], Any] | SerializeType | None]
     deserialize: NotRequired[Callable[[Any], Any] | None]
     enum_class: NotRequired[type[Enum] | None]
     timezone: NotRequired[str | datetime.tzinfo | None]
 
 
+@dataclass(frozen=True)
+class RowPlan:
+    """
+    Compiled per-class plan for turning database rows into data models.
+
+    Attributes:
+    - field_names (frozenset[str]): Names of all dataclass fields.
+    - init_fields (frozenset[str]): Names of fields that can be passed to the constructor.
+    - non_init_fields (frozenset[str]): Names of `init=False` fields, set after construction.
+    - deserializers (tuple[tuple[str, Callable[[Any], Any]], ...]): Fields that need
+      deserialization, paired with the function that does it.
+    - select_columns (tuple[ColumnItem, ...]): Columns to select, derived from `db_field` metadata.
+    - select_fields (tuple[str, ...]): Names of the fields of `select_columns`, in the same order.
+    """
+
+    field_names: frozenset[str]
+    init_fields: frozenset[str]
+    non_init_fields: frozenset[str]
+    deserializers: tuple[tuple[str, Callable[[Any], Any]], ...]
+    select_columns: tuple[ColumnItem, ...]
+    select_fields: tuple[str, ...]
+
+    @classmethod
+    def compile(cls, model_class: type["DBDataModel"]) -> "RowPlan":
+        deserializers: list[tuple[str, Callable[[Any], Any]]] = []
+        select_columns: list[ColumnItem] = []
+        select_fields: list[str] = []
+        for field_obj in dataclasses.fields(model_class):
+            metadata = cast(MetadataDict, field_obj.metadata)
+
+            # Only fields that map to a column are selected
+            if "db_field" in metadata and model_class._should_select(field_obj.name, metadata):
+                column = metadata["db_field"][0]
+                select_columns.append(column if column == field_obj.name else (column, field_obj.name))
+                select_fields.append(field_obj.name)
+
+            # If serialize is set, and serialize is a SerializeType,
+            # we use our serialization function.
+            # Otherwise, we use the provided deserialize function, if any
+            serialize = metadata.get("serialize", None)
+            if serialize is not None and isinstance(serialize, SerializeType):
+                deserializers.append(
+                    (
+                        field_obj.name,
+                        partial(
+                            deserialize_value,
+                            s_type=serialize,
+                            enum_class=metadata.get("enum_class", None),
+                            timezone=metadata.get("timezone", None),
+                        ),
+                    )
+                )
+                continue
+
+            deserialize = metadata.get("deserialize", None)
+            if deserialize is not None:
+                deserializers.append((field_obj.name, deserialize))
+
+        fields = dataclasses.fields(model_class)
+        return cls(
+            field_names=frozenset(f.name for f in fields),
+            init_fields=frozenset(f.name for f in fields if f.init),
+            non_init_fields=frozenset(f.name for f in fields if not f.init),
+            deserializers=tuple(deserializers),
+            select_columns=tuple(select_columns),
+            select_fields=tuple(select_fields),
+        )
+
+
+class _LazyValue:
+    """
+    Raw column value waiting to be deserialized, see `DBDataModel._lazy_deserialize`.
+    """
+
+    __slots__ = ("raw", "deserialize")
+
+    def __init__(self, raw: Any, deserialize: Callable[[Any], Any]) -> None:
+        self.raw = raw
+        self.deserialize = deserialize
+
+    def __repr__(self) -> str:
+        return f"<lazy {self.raw!r}>"
+
+
+class _LazyField:
+    """
+    Data descriptor that deserializes a `_LazyValue` on first access and caches the result.
+    Values that are not lazy are passed through unchanged.
+    """
+
+    def __init__(self, name: str, default: Any) -> None:
+        self.name = name
+        self.default = default
+
+    def __get__(self, instance: Any, owner: type | None = None) -> Any:
+        if instance is None:
+            if self.default is dataclasses.MISSING:
+                return self
+            return self.default
+
+        try:
+            value = instance.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+
+        if isinstance(value, _LazyValue):
+            value = value.deserialize(value.raw)
+            instance.__dict__[self.name] = value
+
+        return value
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        instance.__dict__[self.name] = value
+
+
 @dataclass
 class DBDataModel:
     """
@@ -43,6 +165,8 @@ class DBDataModel:
 
     Methods:
     - __post_init__(): Initializes the instance after it has been created.
+    - from_db_row(db_data: dict[str, Any]): Creates an instance from a database row.
+    - row_maker(columns: Sequence[str]): Creates a function that turns tuple rows into instances.
     - __repr__(): Returns a string representation of the instance.
     - __str__(): Returns a JSON string representation of the instance.
     - to_dict(): Returns a dictionary representation of the instance.
@@ -54,16 +178,40 @@ class DBDataModel:
     - str_to_bool(value: Any): Converts a string to a boolean value.
     - str_to_int(value: Any): Converts a string to an integer value.
     - validate(): Validates the instance.
+    - select_columns(): Returns the columns to select, None for all columns.
 
     To enable storing and updating fields that by default are not stored or updated, use the following methods:
     - set_store(field_name: str, enable: bool = True): Enable/Disable storing a field.
     - set_update(field_name: str, enable: bool = True): Enable/Disable updating a field.
 
+    To deserialize fields on first access instead of when the instance is created, set `_lazy_deserialize`
+    to True on the subclass.
+
+    To update only the fields that changed since the instance was loaded, set `_track_changes` to True
+    on the subclass, see `changed_update_data()`. Related methods:
+    - mark_clean(): Takes the snapshot that changes are detected against.
+    - changed_update_data(): Returns the update data of the changed fields only.
+
     To exclude a field from the dictionary representation of the instance, set metadata key "exclude" to True.
     To change exclude status of a field, use the following method:
     - set_exclude(field_name: str, enable: bool = True): Exclude a field from dict representation.
     """
 
+    # Compiled row plan, see `_row_plan()`
+    _db_row_plan: ClassVar[RowPlan | None] = None
+
+    # Subclasses set this to True to select only the `db_field` columns instead of *,
+    # see `select_columns()`
+    _select_db_fields: ClassVar[bool] = False
+
+    # Subclasses set this to True to deserialize fields on first access instead of in `__post_init__`.
+    # Raw column values are kept as they are and the deserialized value is cached on the instance.
+    _lazy_deserialize: ClassVar[bool] = False
+
+    # Subclasses set this to True to snapshot the update values when an instance is loaded,
+    # so that `update` sends only the changed fields and skips records without changes.
+    _track_changes: ClassVar[bool] = False
+
     ######################
     ### Default fields ###
     ######################
@@ -105,6 +253,7 @@ class DBDataModel:
         metadata=MetadataDict(
             db_field=("raw_data", "jsonb"),
             exclude=True,
+            select=False,
             store=False,
             update=False,
         ),
@@ -115,8 +264,112 @@ class DBDataModel:
     ### Conversion methods ###
     ##########################
 
+    @classmethod
+    def _row_plan(cls) -> RowPlan:
+        """
+        Returns the compiled row plan for this class.
+        The plan is compiled on first use and cached on the class itself,
+        so subclasses always get their own plan.
+        """
+        plan = cls.__dict__.get("_db_row_plan")
+        if plan is None:
+            plan = RowPlan.compile(cls)
+            cls._db_row_plan = plan
+
+            # Lazy fields are read through descriptors, which replace the class level defaults
+            if cls._lazy_deserialize:
+                for field_name, _ in plan.deserializers:
+                    default = cls.__dataclass_fields__[field_name].default
+                    setattr(cls, field_name, _LazyField(field_name, default))
+
+        return plan
+
+    @classmethod
+    def from_db_row(cls, db_data: dict[str, Any]) -> Self:
+        """
+        Creates a new instance from the given database row.
+        Columns are passed straight to the constructor, so default factories
+        only run for missing columns and `__post_init__` runs once.
+
+        Args:
+            db_data (dict[str, Any]): The database row.
+
+        Returns:
+            Self: The data model filled with data.
+        """
+        plan = cls._row_plan()
+        init_fields = plan.init_fields
+        result = cls(**{key: value for key, value in db_data.items() if key in init_fields})
+        result.raw_data = db_data
+
+        # Fields that the constructor does not take are set from the row afterwards
+        if plan.non_init_fields:
+            non_init_values = {key: db_data[key] for key in plan.non_init_fields if key in db_data}
+            if non_init_values:
+                result._set_non_init_values(non_init_values)
+
+        # If the id key is not "id", we set it manually so that its filled correctly
+        if result.id_key != "id":
+            result.id = db_data.get(result.id_key, None)
+
+        if cls._track_changes:
+            result.mark_clean()
+
+        return result
+
+    @classmethod
+    def row_maker(cls, columns: Sequence[str]) -> Callable[[Sequence[Any]], Self]:
+        """
+        Creates a function that turns tuple rows with the given columns into instances.
+        Used by driver row factories, so that no dict is created per row.
+        As there is no row dict, `raw_data` is left empty.
+
+        Args:
+            columns (Sequence[str]): The column names, in row order (from `cursor.description`).
+
+        Returns:
+            Callable[[Sequence[Any]], Self]: The row maker.
+        """
+        plan = cls._row_plan()
+        indexes = [(index, name) for (index, name) in enumerate(columns) if name in plan.init_fields]
+        non_init_indexes = [(index, name) for (index, name) in enumerate(columns) if name in plan.non_init_fields]
+        positions = {name: index for (index, name) in enumerate(columns)}
+
+        def make(values: Sequence[Any]) -> Self:
+            result = cls(**{name: values[index] for (index, name) in indexes})
+
+            # Fields that the constructor does not take are set from the row afterwards
+            if non_init_indexes:
+                result._set_non_init_values({name: values[index] for (index, name) in non_init_indexes})
+
+            # If the id key is not "id", we set it manually so that its filled correctly
+            if result.id_key != "id":
+                id_index = positions.get(result.id_key)
+                result.id = values[id_index] if id_index is not None else None
+
+            if cls._track_changes:
+                result.mark_clean()
+
+            return result
+
+        return make
+
+    def _set_non_init_values(self, values: dict[str, Any]) -> None:
+        """
+        Sets row values of `init=False` fields, deserialized like `__post_init__` does for the others.
+        """
+        deserializers = dict(self._row_plan().deserializers)
+        for field_name, value in values.items():
+            deserialize = deserializers.get(field_name)
+            if value is None or deserialize is None:
+                setattr(self, field_name, value)
+            elif self._lazy_deserialize:
+                self.__dict__[field_name] = _LazyValue(value, deserialize)
+            else:
+                setattr(self, field_name, deserialize(value))
+
     def fill_data_from_dict(self, kwargs: dict[str, Any]) -> None:
-        field_names = set([f.name for f in dataclasses.fields(self)])
+        field_names = self._row_plan().field_names
         for key in kwargs:
             if key in field_names:
                 setattr(self, key, kwargs[key])
@@ -125,33 +378,31 @@ class DBDataModel:
 
     # Init data
     def __post_init__(self) -> None:
-        for field_name, field_obj in self.__dataclass_fields__.items():
-            metadata = cast(MetadataDict, field_obj.metadata)
+        plan = self._row_plan()
+        if self._lazy_deserialize:
+            for field_name, deserialize in plan.deserializers:
+                value = self.__dict__.get(field_name)
+
+                # If value is not set or is already waiting to be deserialized, we skip it
+                if value is None or isinstance(value, _LazyValue):
+                    continue
+
+                self.__dict__[field_name] = _LazyValue(value, deserialize)
+            return
+
+        for field_name, deserialize in plan.deserializers:
             value = getattr(self, field_name)
 
             # If value is not set, we skip it
             if value is None:
                 continue
 
-            # If serialize is set, and serialize is a SerializeType,
-            # we use our serialization function
-            # Here we actually need to deserialize the value to correct class type
-            serialize = metadata.get("serialize", None)
-            enum_class = metadata.get("enum_class", None)
-            timezone = metadata.get("timezone", None)
-            if serialize is not None and isinstance(serialize, SerializeType):
-                value = deserialize_value(value, serialize, enum_class, timezone)
-                setattr(self, field_name, value)
-
-            else:
-                deserialize = metadata.get("deserialize", None)
-                if deserialize is not None:
-                    value = deserialize(value)
-                    setattr(self, field_name, value)
+            setattr(self, field_name, deserialize(value))
 
     # String - representation
     def __repr__(self) -> str:
-        return f"<{self.__class__.__name__} {self.__dict__}>"
+        values = {key: value for key, value in self.__dict__.items() if key != "_db_snapshot"}
+        return f"<{self.__class__.__name__} {values}>"
 
     def __str__(self) -> str:
         return self.to_json_string()
@@ -292,6 +543,15 @@ class DBDataModel:
     def _should_exclude(cls, field_name: str, metadata: MetadataDict) -> bool:
         return bool(metadata.get("exclude", False))
 
+    @classmethod
+    def _should_select(cls, field_name: str, metadata: MetadataDict) -> bool:
+        """
+        Decide whether the column of this field should be selected, see `select_columns()`.
+        Base behavior: rely on field metadata.
+        Subclasses can override.
+        """
+        return bool(metadata.get("select", True))
+
     ########################
     ### Database methods ###
     ########################
@@ -302,6 +562,35 @@ class DBDataModel:
         """
         return None
 
+    def select_columns(self) -> list[ColumnItem] | None:
+        """
+        Columns to select when no custom query or query base is used, None selects all columns.
+        Fields whose column is not selected keep their default values.
+
+        By default all columns are selected. If `_select_db_fields` is True, the columns are derived
+        from `db_field` metadata, fields with metadata "select" set to False are skipped.
+        The key column is always selected, it is the `id_key` column, the `id` field is only
+        selected when it is the key.
+        A `db_field` column can be a JSON sub-path (PostgreSQL only), e.g. ("settings->theme", "text").
+
+        Returns:
+            list[ColumnItem] | None: The columns to select.
+        """
+        if not self._select_db_fields:
+            return None
+
+        plan = self._row_plan()
+        id_key = self.id_key
+        columns = [
+            column
+            for (field_name, column) in zip(plan.select_fields, plan.select_columns, strict=True)
+            if field_name != "id" or id_key == "id"
+        ]
+        if id_key not in plan.select_fields:
+            columns.insert(0, id_key)
+
+        return columns
+
     def store_data(self) -> dict[str, Any] | None:
         """
         Store data to database
@@ -310,20 +599,7 @@ class DBDataModel:
         for field_name, field_obj in self.__dataclass_fields__.items():
             metadata = cast(MetadataDict, field_obj.metadata)
             if self.__class__._should_store(field_name, metadata):
-                value = getattr(self, field_name)
-
-                # If serialize is set, and serialize is a SerializeType,
-                # we use our serialization function.
-                # Otherwise, we use the provided serialize function
-                # and we assume that it is callable
-                serialize = metadata.get("serialize", None)
-                if serialize is not None:
-                    if isinstance(serialize, SerializeType):
-                        value = serialize_value(value, serialize)
-                    else:
-                        value = serialize(value)
-
-                store_data[field_name] = value
+                store_data[field_name] = self._serialize_field(getattr(self, field_name), metadata)
         return store_data
 
     def update_data(self) -> dict[str, Any] | None:
@@ -335,22 +611,94 @@ class DBDataModel:
         for field_name, field_obj in self.__dataclass_fields__.items():
             metadata = cast(MetadataDict, field_obj.metadata)
             if self.__class__._should_update(field_name, metadata):
-                value = getattr(self, field_name)
-
-                # If serialize is set, and serialize is a SerializeType,
-                # we use our serialization function.
-                # Otherwise, we use the provided serialize function
-                # and we assume that it is callable
-                serialize = metadata.get("serialize", None)
-                if serialize is not None:
-                    if isinstance(serialize, SerializeType):
-                        value = serialize_value(value, serialize)
-                    else:
-                        value = serialize(value)
-
-                update_data[field_name] = value
+                update_data[field_name] = self._serialize_field(getattr(self, field_name), metadata)
         return update_data
 
+    def mark_clean(self) -> None:
+        """
+        Takes a snapshot of the update values, `changed_update_data()` compares against it.
+        Called when an instance of a class with `_track_changes` is loaded, inserted or updated.
+        """
+        self.__dict__["_db_snapshot"] = self._tracked_values()
+
+    def changed_update_data(self) -> dict[str, Any] | None:
+        """
+        Update data of the fields that changed since `mark_clean()`.
+        Without a snapshot, all update data is returned.
+
+        Returns:
+            dict[str, Any] | None: The changed update data, empty if nothing changed.
+        """
+        snapshot: dict[str, Any] | None = self.__dict__.get("_db_snapshot")
+        if snapshot is None:
+            return self.update_data()
+
+        # Changes are detected before `update_data()`, which reads lazy fields
+        changed = {
+            name
+            for name, value in self._tracked_values().items()
+            if name not in snapshot or not _same_value(snapshot[name], value)
+        }
+        if not changed:
+            return {}
+
+        # Fields that `update_data()` sets itself (like updated_at) are sent too
+        update_data = self.update_data() or {}
+        return {
+            name: value
+            for name, value in update_data.items()
+            if name in changed
+            or (
+                name in snapshot
+                and not isinstance(snapshot[name], _LazyValue)
+                and not _same_value(snapshot[name], value)
+            )
+        }
+
+    def _tracked_values(self) -> dict[str, Any]:
+        """
+        Serialized update values to detect changes with, see `mark_clean()`.
+        Lazy fields that were not read are kept as they are, so the snapshot does not deserialize them.
+        """
+        values: dict[str, Any] = {}
+        for field_name, field_obj in self.__dataclass_fields__.items():
+            metadata = cast(MetadataDict, field_obj.metadata)
+            if not self.__class__._should_update(field_name, metadata):
+                continue
+
+            value = self.__dict__.get(field_name)
+            if not isinstance(value, _LazyValue):
+                value = self._serialize_field(getattr(self, field_name), metadata)
+
+                # Mutable values can be changed in place, so the snapshot keeps a copy
+                if isinstance(value, (dict, list, set, bytearray)):
+                    value = copy.deepcopy(value)
+
+            values[field_name] = value
+        return values
+
+    @staticmethod
+    def _serialize_field(value: Any, metadata: MetadataDict) -> Any:
+        # If serialize is set, and serialize is a SerializeType,
+        # we use our serialization function.
+        # Otherwise, we use the provided serialize function
+        # and we assume that it is callable
+        serialize = metadata.get("serialize", None)
+        if serialize is not None:
+            if isinstance(serialize, SerializeType):
+                return serialize_value(value, serialize)
+            return serialize(value)
+
+        return value
+
+
+def _same_value(snapshot_value: Any, value: Any) -> bool:
+    # Unread lazy values are compared by identity, a read lazy field counts as changed
+    if isinstance(snapshot_value, _LazyValue) or isinstance(value, _LazyValue):
+        return snapshot_value is value
+
+    return bool(snapshot_value == value)
+
 
 @dataclass
 class DBDefaultsDataModel(DBDataModel):
@@ -421,6 +769,7 @@ class DBDefaultsDataModel(DBDataModel):
         default=True,
         metadata=MetadataDict(
             db_field=("enabled", "boolean"),
+            select=False,
             store=False,
             update=False,
         ),
@@ -431,6 +780,7 @@ class DBDefaultsDataModel(DBDataModel):
         default=False,
         metadata=MetadataDict(
             db_field=("deleted", "boolean"),
+            select=False,
             store=False,
             update=False,
         ),
@@ -456,6 +806,13 @@ class DBDefaultsDataModel(DBDataModel):
             return field_name in cls._defaults_config
         return super()._should_update(field_name, metadata)
 
+    @classmethod
+    def _should_select(cls, field_name: str, metadata: MetadataDict) -> bool:
+        # Columns of the defaults that are not active do not exist in the table
+        if field_name in ("created_at", "updated_at", "disabled_at", "deleted_at"):
+            return field_name in cls._defaults_config
+        return super()._should_select(field_name, metadata)
+
     def update_data(self) -> dict[str, Any] | None:
         # Always refresh updated_at if present in this model
         if "updated_at" in self.__dataclass_fields__ and "updated_at" in self._defaults_config:
@@ -1,9 +1,17 @@
-from collections.abc import Generator
-from typing import Any, overload
+from collections import Counter, deque
+from collections.abc import Generator, Iterable, Sequence
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any, Literal, cast, overload
 
+from .columnar import ColumnarBuilder
 from .common import DataModelType, OrderByItem
-from .db_data_model import DBDataModel
-from .db_wrapper_mixin import DBWrapperMixin
+from .db_data_model import ColumnItem, DBDataModel
+from .db_wrapper_mixin import DBWrapperMixin, _build_models
+from .materialized import MaterializedResult
+from .pagination import KeysetPage, decode_page_token, encode_page_token
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
 
 
 class DBWrapper(DBWrapperMixin):
@@ -20,6 +28,7 @@ class DBWrapper(DBWrapperMixin):
         self,
         empty_data_class: DataModelType,
         custom_query: Any = None,
+        columns: Sequence[ColumnItem] | None = None,
     ) -> DataModelType | None:
         """
         Retrieves a single record from the database by class defined id.
@@ -27,6 +36,8 @@ class DBWrapper(DBWrapperMixin):
         Args:
             empty_data_class (DataModelType): The data model to use for the query.
             custom_query (Any, optional): The custom query to use for the query. Defaults to None.
+            columns (Sequence[ColumnItem] | None, optional): The columns to select, see `DBDataModel.select_columns`.
+                Defaults to None.
 
         Returns:
             DataModelType | None: The result of the query.
@@ -46,6 +57,7 @@ class DBWrapper(DBWrapperMixin):
             id_value,
             limit=1,
             custom_query=custom_query,
+            columns=columns,
         )
         for row in res:
             return row
@@ -58,6 +70,7 @@ class DBWrapper(DBWrapperMixin):
         id_key: str,
         id_value: Any,
         custom_query: Any = None,
+        columns: Sequence[ColumnItem] | None = None,
     ) -> DataModelType | None:
         """
         Retrieves a single record from the database using the given key.
@@ -67,6 +80,8 @@ class DBWrapper(DBWrapperMixin):
             id_key (str): The name of the key to use for the query.
             id_value (Any): The value of the key to use for the query.
             custom_query (Any, optional): The custom query to use for the query. Defaults to None.
+            columns (Sequence[ColumnItem] | None, optional): The columns to select, see `DBDataModel.select_columns`.
+                Defaults to None.
 
         Returns:
             DataModelType | None: The result of the query.
@@ -78,12 +93,92 @@ class DBWrapper(DBWrapperMixin):
             id_value,
             limit=1,
             custom_query=custom_query,
+            columns=columns,
         )
         for row in res:
             return row
         else:
             return None
 
+    @overload
+    def get_many(
+        self,
+        empty_data_class: DataModelType,
+        ids: Iterable[Any],
+        id_key: str | None = None,
+        as_list: Literal[False] = False,
+        chunk_size: int | None = None,
+        columns: Sequence[ColumnItem] | None = None,
+    ) -> dict[Any, DataModelType]: ...
+
+    @overload
+    def get_many(
+        self,
+        empty_data_class: DataModelType,
+        ids: Iterable[Any],
+        id_key: str | None = None,
+        *,
+        as_list: Literal[True],
+        chunk_size: int | None = None,
+        columns: Sequence[ColumnItem] | None = None,
+    ) -> list[DataModelType]: ...
+
+    def get_many(
+        self,
+        empty_data_class: DataModelType,
+        ids: Iterable[Any],
+        id_key: str | None = None,
+        as_list: bool = False,
+        chunk_size: int | None = None,
+        columns: Sequence[ColumnItem] | None = None,
+    ) -> dict[Any, DataModelType] | list[DataModelType]:
+        """
+        Retrieves the records with the given ids, using as few queries as possible.
+        Ids are selected in chunks of up to `chunk_size` with IN (...), or with a temporary table
+        when there are more than `many_temp_table_threshold` of them.
+
+        Ids are matched by value, so they need to be of the same type the database returns.
+
+        Args:
+            empty_data_class (DataModelType): The data model to use for the query.
+            ids (Iterable[Any]): The ids of the records to retrieve.
+            id_key (str | None, optional): The name of the key to match the ids against,
+                the id key of the data model if not set. Defaults to None.
+            as_list (bool, optional): Return a list in input order instead of a dict keyed by id. Defaults to False.
+            chunk_size (int | None, optional): The number of ids per query, `max_query_params` if not set.
+                Defaults to None.
+            columns (Sequence[ColumnItem] | None, optional): The columns to select, must include the id key.
+                Defaults to None.
+
+        Returns:
+            dict[Any, DataModelType] | list[DataModelType]: The found records by id, in input order.
+                Ids that were not found are left out.
+        """
+        id_key = id_key or empty_data_class.id_key
+        ids = list(ids)
+        unique_ids = list(dict.fromkeys(ids))
+        model_class = empty_data_class.__class__
+        records: dict[Any, DataModelType] = {}
+
+        if self.many_temp_table_threshold and len(unique_ids) > self.many_temp_table_threshold:
+            for batch in self._iter_many_temp_table(empty_data_class, unique_ids, id_key, columns):
+                for record in batch:
+                    records[self._record_value(record, id_key)] = record
+        else:
+            chunk_size = self._many_chunk_size(chunk_size)
+            for start in range(0, len(unique_ids), chunk_size):
+                (query_sql, _params) = self._format_many_query(
+                    empty_data_class,
+                    unique_ids[start : start + chunk_size],
+                    id_key,
+                    columns,
+                )
+                for batch in self._iter_query_batches(model_class, query_sql, _params, chunk_size):
+                    for record in batch:
+                        records[self._record_value(record, id_key)] = record
+
+        return self._order_many(ids, records, as_list)
+
     def get_all(
         self,
         empty_data_class: DataModelType,
@@ -93,6 +188,8 @@ class DBWrapper(DBWrapperMixin):
         offset: int = 0,
         limit: int = 100,
         custom_query: Any = None,
+        batch_size: int = 100,
+        columns: Sequence[ColumnItem] | None = None,
     ) -> Generator[DataModelType, None, None]:
         """
         Retrieves all records from the database.
@@ -105,32 +202,156 @@ class DBWrapper(DBWrapperMixin):
             offset (int, optional): The number of results to skip. Defaults to 0.
             limit (int, optional): The maximum number of results to return. Defaults to 100.
             custom_query (Any, optional): The custom query to use for the query. Defaults to None.
+            batch_size (int, optional): The number of rows to fetch from the cursor at once. Defaults to 100.
+            columns (Sequence[ColumnItem] | None, optional): The columns to select, see `DBDataModel.select_columns`.
+                Defaults to None.
 
         Returns:
             Generator[DataModelType, None, None]: The result of the query.
         """
-        # Query and filter
-        _query = (
-            custom_query
-            or empty_data_class.query_base()
-            or self.filter_query(
-                empty_data_class.schema_name,
-                empty_data_class.table_name,
-            )
+        _filter = {id_key: id_value} if id_key and id_value else None
+        for batch in self.iter_batches(
+            empty_data_class,
+            _filter,
+            order_by,
+            offset,
+            limit,
+            custom_query,
+            batch_size,
+            columns,
+        ):
+            yield from batch
+
+    def get_filtered(
+        self,
+        empty_data_class: DataModelType,
+        filter: dict[str, Any],
+        order_by: OrderByItem | None = None,
+        offset: int = 0,
+        limit: int = 100,
+        custom_query: Any = None,
+        batch_size: int = 100,
+        columns: Sequence[ColumnItem] | None = None,
+    ) -> Generator[DataModelType, None, None]:
+        """
+        Retrieves all records matching the given filter from the database.
+
+        Args:
+            empty_data_class (DataModelType): The data model to use for the query.
+            filter (dict[str, Any]): The filter to apply.
+            order_by (OrderByItem | None, optional): The order by item to use for sorting. Defaults to None.
+            offset (int, optional): The number of results to skip. Defaults to 0.
+            limit (int, optional): The maximum number of results to return. Defaults to 100.
+            custom_query (Any, optional): The custom query to use for the query. Defaults to None.
+            batch_size (int, optional): The number of rows to fetch from the cursor at once. Defaults to 100.
+            columns (Sequence[ColumnItem] | None, optional): The columns to select, see `DBDataModel.select_columns`.
+                Defaults to None.
+
+        Returns:
+            Generator[DataModelType, None, None]: The result of the query.
+        """
+        for batch in self.iter_batches(
+            empty_data_class,
+            filter,
+            order_by,
+            offset,
+            limit,
+            custom_query,
+            batch_size,
+            columns,
+        ):
+            yield from batch
+
+    def iter_batches(
+        self,
+        empty_data_class: DataModelType,
+        filter: dict[str, Any] | None = None,
+        order_by: OrderByItem | None = None,
+        offset: int = 0,
+        limit: int = 100,
+        custom_query: Any = None,
+        batch_size: int = 100,
+        columns: Sequence[ColumnItem] | None = None,
+    ) -> Generator[list[DataModelType], None, None]:
+        """
+        Retrieves records from the database in lists of up to `batch_size` models.
+        Each list is filled with a single `fetchmany` call on the cursor.
+
+        Args:
+            empty_data_class (DataModelType): The data model to use for the query.
+            filter (dict[str, Any] | None, optional): The filter to apply. Defaults to None.
+            order_by (OrderByItem | None, optional): The order by item to use for sorting. Defaults to None.
+            offset (int, optional): The number of results to skip. Defaults to 0.
+            limit (int, optional): The maximum number of results to return. Defaults to 100.
+            custom_query (Any, optional): The custom query to use for the query. Defaults to None.
+            batch_size (int, optional): The number of rows to fetch from the cursor at once. Defaults to 100.
+            columns (Sequence[ColumnItem] | None, optional): The columns to select, see `DBDataModel.select_columns`.
+                Defaults to None.
+
+        Returns:
+            Generator[list[DataModelType], None, None]: Batches of the query result.
+        """
+        (query_sql, _params) = self._format_select_query(
+            empty_data_class,
+            filter,
+            order_by,
+            offset,
+            limit,
+            custom_query,
+            columns=columns,
         )
-        _params: tuple[Any, ...] = ()
-        _filter = None
 
-        # TODO: Rewrite this so that filter method with loop is not used here
-        if id_key and id_value:
-            (_filter, _params) = self.create_filter({id_key: id_value})
+        yield from self._iter_query_batches(empty_data_class.__class__, query_sql, _params, batch_size)
 
-        # Order and limit
-        _order = self.order_query(order_by)
-        _limit = self.limit_query(offset, limit)
+    def get_page(
+        self,
+        empty_data_class: DataModelType,
+        filter: dict[str, Any] | None = None,
+        order_by: OrderByItem | None = None,
+        page_size: int = 100,
+        page_token: str | None = None,
+        custom_query: Any = None,
+    ) -> KeysetPage[DataModelType]:
+        """
+        Retrieves one page of records using keyset (seek) pagination.
+        Instead of skipping `offset` rows, the last seen sort key from `page_token`
+        is turned into a `WHERE (key) > (last)` condition,
+        so every page costs the same regardless of how deep it is.
+
+        The sort columns must end with a unique, not null column (for example the id),
+        otherwise records with equal sort keys can be skipped.
+
+        Args:
+            empty_data_class (DataModelType): The data model to use for the query.
+            filter (dict[str, Any] | None, optional): The filter to apply. Defaults to None.
+            order_by (OrderByItem | None, optional): The sort columns. Defaults to the id key, ascending.
+            page_size (int, optional): The maximum number of records on a page. Defaults to 100.
+            page_token (str | None, optional): The `next_token` of the previous page. Defaults to None.
+            custom_query (Any, optional): The custom query to use for the query. Defaults to None.
+
+        Returns:
+            KeysetPage[DataModelType]: The records and the token for the next page.
+        """
+        if page_size < 1:
+            raise ValueError("Page size must be greater than 0")
+
+        keyset_order = self.keyset_order(order_by or [(empty_data_class.id_key, "ASC")])
+        columns = [column for (column, _) in keyset_order]
+
+        condition = None
+        if page_token is not None:
+            last_values = decode_page_token(page_token, columns)
+            condition = self._format_keyset_condition(keyset_order, last_values)
 
-        # Create a SQL object for the query and format it
-        query_sql = self._format_filter_query(_query, _filter, _order, _limit)
+        (query_sql, _params) = self._format_select_query(
+            empty_data_class,
+            filter,
+            cast(OrderByItem, keyset_order),
+            0,
+            page_size,
+            custom_query,
+            condition,
+        )
 
         # Log
         self.log_query(self.db_cursor, query_sql, _params)
@@ -138,54 +359,535 @@ class DBWrapper(DBWrapperMixin):
         # Execute the query
         self.db_cursor.execute(query_sql, _params)
 
-        # Instead of fetchall(), we'll use a generator to yield results one by one
+        model_class = empty_data_class.__class__
+        items = [self.turn_data_into_model(model_class, row) for row in self.db_cursor.fetchall()]
+
+        next_token = None
+        if len(items) == page_size:
+            next_token = encode_page_token(columns, self._keyset_values(items[-1], keyset_order))
+
+        return KeysetPage(items=items, next_token=next_token)
+
+    def iter_pages(
+        self,
+        empty_data_class: DataModelType,
+        filter: dict[str, Any] | None = None,
+        order_by: OrderByItem | None = None,
+        page_size: int = 100,
+        page_token: str | None = None,
+        custom_query: Any = None,
+    ) -> Generator[KeysetPage[DataModelType], None, None]:
+        """
+        Iterates over all pages of a keyset paginated result, see `get_page`.
+
+        Args:
+            empty_data_class (DataModelType): The data model to use for the query.
+            filter (dict[str, Any] | None, optional): The filter to apply. Defaults to None.
+            order_by (OrderByItem | None, optional): The sort columns. Defaults to the id key, ascending.
+            page_size (int, optional): The maximum number of records on a page. Defaults to 100.
+            page_token (str | None, optional): The token of the page to start from. Defaults to None.
+            custom_query (Any, optional): The custom query to use for the query. Defaults to None.
+
+        Returns:
+            Generator[KeysetPage[DataModelType], None, None]: The pages, the last one can be empty.
+        """
         while True:
-            row = self.db_cursor.fetchone()
-            if row is None:
+            page = self.get_page(
+                empty_data_class,
+                filter,
+                order_by,
+                page_size,
+                page_token,
+                custom_query,
+            )
+            yield page
+
+            if page.next_token is None:
                 break
 
-            yield self.turn_data_into_model(empty_data_class.__class__, row)
+            page_token = page.next_token
 
-    def get_filtered(
+    def get_filtered_columnar(
+        self,
+        empty_data_class: DBDataModel,
+        filter: dict[str, Any] | None = None,
+        order_by: OrderByItem | None = None,
+        offset: int = 0,
+        limit: int = 100,
+        custom_query: Any = None,
+        batch_size: int = 1000,
+        columns: Sequence[ColumnItem] | None = None,
+    ) -> dict[str, "NDArray[Any]"]:
+        """
+        Retrieves records from the database as NumPy arrays, one per column,
+        without creating a data model per row. Requires NumPy.
+        See `ColumnarBuilder` for how column types are mapped.
+
+        Args:
+            empty_data_class (DBDataModel): The data model to use for the query.
+            filter (dict[str, Any] | None, optional): The filter to apply. Defaults to None.
+            order_by (OrderByItem | None, optional): The order by item to use for sorting. Defaults to None.
+            offset (int, optional): The number of results to skip. Defaults to 0.
+            limit (int, optional): The maximum number of results to return. Defaults to 100.
+            custom_query (Any, optional): The custom query to use for the query. Defaults to None.
+            batch_size (int, optional): The number of rows to fetch from the cursor at once. Defaults to 1000.
+            columns (Sequence[ColumnItem] | None, optional): The columns to select, see `DBDataModel.select_columns`.
+                Defaults to None.
+
+        Returns:
+            dict[str, NDArray[Any]]: Column name to column values.
+        """
+        builder = ColumnarBuilder()
+        (query_sql, _params) = self._format_select_query(
+            empty_data_class,
+            filter,
+            order_by,
+            offset,
+            limit,
+            custom_query,
+            columns=columns,
+        )
+
+        # Log
+        self.log_query(self.db_cursor, query_sql, _params)
+
+        # Execute the query
+        self.db_cursor.execute(query_sql, _params)
+
+        for rows in self._fetch_batches(self.db_cursor, batch_size):
+            builder.add_rows(rows)
+
+        # Keep the columns even if there are no rows
+        if self.db_cursor.description:
+            builder.set_columns([column[0] for column in self.db_cursor.description])
+
+        return builder.build()
+
+    def materialize(
         self,
         empty_data_class: DataModelType,
-        filter: dict[str, Any],
+        filter: dict[str, Any] | None = None,
         order_by: OrderByItem | None = None,
         offset: int = 0,
         limit: int = 100,
         custom_query: Any = None,
-    ) -> Generator[DataModelType, None, None]:
-        # Query and filter
-        _query = (
-            custom_query
-            or empty_data_class.query_base()
-            or self.filter_query(
-                empty_data_class.schema_name,
-                empty_data_class.table_name,
-            )
+        batch_size: int = 1000,
+        columns: Sequence[ColumnItem] | None = None,
+        memory_budget: int = 64 * 1024 * 1024,
+    ) -> MaterializedResult[DataModelType]:
+        """
+        Retrieves records from the database into a result that can be iterated many times
+        and accessed by index. Rows over the memory budget are spilled to a temporary file,
+        see `MaterializedResult`.
+
+        Args:
+            empty_data_class (DataModelType): The data model to use for the query.
+            filter (dict[str, Any] | None, optional): The filter to apply. Defaults to None.
+            order_by (OrderByItem | None, optional): The order by item to use for sorting. Defaults to None.
+            offset (int, optional): The number of results to skip. Defaults to 0.
+            limit (int, optional): The maximum number of results to return. Defaults to 100.
+            custom_query (Any, optional): The custom query to use for the query. Defaults to None.
+            batch_size (int, optional): The number of rows to fetch from the cursor at once. Defaults to 1000.
+            columns (Sequence[ColumnItem] | None, optional): The columns to select, see `DBDataModel.select_columns`.
+                Defaults to None.
+            memory_budget (int, optional): Maximum size of the rows kept in memory, in bytes. Defaults to 64 MiB.
+
+        Returns:
+            MaterializedResult[DataModelType]: The result, close it when done.
+        """
+        result = MaterializedResult(empty_data_class.__class__, memory_budget)
+        (query_sql, _params) = self._format_select_query(
+            empty_data_class,
+            filter,
+            order_by,
+            offset,
+            limit,
+            custom_query,
+            columns=columns,
+        )
+
+        try:
+            # Log
+            self.log_query(self.db_cursor, query_sql, _params)
+
+            # Execute the query
+            self.db_cursor.execute(query_sql, _params)
+
+            for rows in self._fetch_batches(self.db_cursor, batch_size):
+                result.add_rows(rows)
+        except BaseException:
+            result.close()
+            raise
+
+        return result
+
+    def get_all_raw(
+        self,
+        empty_data_class: DBDataModel,
+        id_key: str | None = None,
+        id_value: Any | None = None,
+        order_by: OrderByItem | None = None,
+        offset: int = 0,
+        limit: int = 100,
+        custom_query: Any = None,
+        batch_size: int = 100,
+        as_tuples: bool = False,
+        columns: Sequence[ColumnItem] | None = None,
+    ) -> Generator[dict[str, Any] | tuple[Any, ...], None, None]:
+        """
+        Retrieves all records from the database as plain rows, without creating data models.
+        Values are returned as the driver returns them, no deserialization is done.
+
+        Args:
+            empty_data_class (DBDataModel): The data model to use for the query.
+            id_key (str | None, optional): The name of the key to use for filtering. Defaults to None.
+            id_value (Any | None, optional): The value of the key to use for filtering. Defaults to None.
+            order_by (OrderByItem | None, optional): The order by item to use for sorting. Defaults to None.
+            offset (int, optional): The number of results to skip. Defaults to 0.
+            limit (int, optional): The maximum number of results to return. Defaults to 100.
+            custom_query (Any, optional): The custom query to use for the query. Defaults to None.
+            batch_size (int, optional): The number of rows to fetch from the cursor at once. Defaults to 100.
+            as_tuples (bool, optional): Return rows as tuples instead of dicts. Defaults to False.
+            columns (Sequence[ColumnItem] | None, optional): The columns to select, see `DBDataModel.select_columns`.
+                Defaults to None.
+
+        Returns:
+            Generator[dict[str, Any] | tuple[Any, ...], None, None]: The rows of the query result.
+        """
+        _filter = {id_key: id_value} if id_key and id_value else None
+        yield from self.get_filtered_raw(
+            empty_data_class,
+            _filter,
+            order_by,
+            offset,
+            limit,
+            custom_query,
+            batch_size,
+            as_tuples,
+            columns,
+        )
+
+    def get_filtered_raw(
+        self,
+        empty_data_class: DBDataModel,
+        filter: dict[str, Any] | None = None,
+        order_by: OrderByItem | None = None,
+        offset: int = 0,
+        limit: int = 100,
+        custom_query: Any = None,
+        batch_size: int = 100,
+        as_tuples: bool = False,
+        columns: Sequence[ColumnItem] | None = None,
+    ) -> Generator[dict[str, Any] | tuple[Any, ...], None, None]:
+        """
+        Retrieves all records matching the given filter from the database as plain rows,
+        without creating data models. Values are returned as the driver returns them,
+        no deserialization is done.
+
+        Args:
+            empty_data_class (DBDataModel): The data model to use for the query.
+            filter (dict[str, Any] | None, optional): The filter to apply. Defaults to None.
+            order_by (OrderByItem | None, optional): The order by item to use for sorting. Defaults to None.
+            offset (int, optional): The number of results to skip. Defaults to 0.
+            limit (int, optional): The maximum number of results to return. Defaults to 100.
+            custom_query (Any, optional): The custom query to use for the query. Defaults to None.
+            batch_size (int, optional): The number of rows to fetch from the cursor at once. Defaults to 100.
+            as_tuples (bool, optional): Return rows as tuples instead of dicts. Defaults to False.
+            columns (Sequence[ColumnItem] | None, optional): The columns to select, see `DBDataModel.select_columns`.
+                Defaults to None.
+
+        Returns:
+            Generator[dict[str, Any] | tuple[Any, ...], None, None]: The rows of the query result.
+        """
+        (query_sql, _params) = self._format_select_query(
+            empty_data_class,
+            filter,
+            order_by,
+            offset,
+            limit,
+            custom_query,
+            columns=columns,
+        )
+
+        # Tuple rows need their own cursor, the wrapper cursor returns dicts
+        cursor = self._new_tuple_cursor() if as_tuples else self.db_cursor
+        try:
+            # Log
+            self.log_query(cursor, query_sql, _params)
+
+            # Execute the query
+            cursor.execute(query_sql, _params)
+
+            for rows in self._fetch_batches(cursor, batch_size):
+                yield from rows
+        finally:
+            if as_tuples:
+                cursor.close()
+
+    def count(
+        self,
+        empty_data_class: DBDataModel,
+        filter: dict[str, Any] | None = None,
+        custom_query: Any = None,
+    ) -> int:
+        """
+        Counts the records matching the given filter, without fetching them.
+
+        Args:
+            empty_data_class (DBDataModel): The data model to use for the query.
+            filter (dict[str, Any] | None, optional): The filter to apply. Defaults to None.
+            custom_query (Any, optional): The custom query to use for the query. Defaults to None.
+
+        Returns:
+            int: The number of matching records.
+        """
+        (query_sql, _params) = self._format_select_query(
+            empty_data_class,
+            filter,
+            limit=0,
+            custom_query=custom_query,
         )
-        (_filter, _params) = self.create_filter(filter)
+        query_sql = self.count_query(query_sql)
+
+        # Log
+        self.log_query(self.db_cursor, query_sql, _params)
+
+        # Execute the query
+        self.db_cursor.execute(query_sql, _params)
+
+        row = self.db_cursor.fetchone()
+        return int(row["count"]) if row else 0
+
+    def exists(
+        self,
+        empty_data_class: DBDataModel,
+        filter: dict[str, Any] | None = None,
+        custom_query: Any = None,
+    ) -> bool:
+        """
+        Checks if any record matches the given filter, without fetching it.
+
+        Args:
+            empty_data_class (DBDataModel): The data model to use for the query.
+            filter (dict[str, Any] | None, optional): The filter to apply. Defaults to None.
+            custom_query (Any, optional): The custom query to use for the query. Defaults to None.
+
+        Returns:
+            bool: True if at least one record matches.
+        """
+        (query_sql, _params) = self._format_select_query(
+            empty_data_class,
+            filter,
+            limit=0,
+            custom_query=custom_query,
+        )
+        query_sql = self.exists_query(query_sql)
+
+        # Log
+        self.log_query(self.db_cursor, query_sql, _params)
+
+        # Execute the query
+        self.db_cursor.execute(query_sql, _params)
+
+        row = self.db_cursor.fetchone()
+        return bool(row["result"]) if row else False
+
+    def _iter_query_batches(
+        self,
+        model_class: type[DataModelType],
+        query_sql: Any,
+        params: tuple[Any, ...],
+        batch_size: int,
+    ) -> Generator[list[DataModelType], None, None]:
+        """
+        Executes a SELECT query and turns the result into data models, in batches of up to `batch_size`.
+
+        Args:
+            model_class (type[DataModelType]): The data model class to create.
+            query_sql (Any): The query to execute.
+            params (tuple[Any, ...]): The query parameters.
+            batch_size (int): The number of rows to fetch at once.
+
+        Returns:
+            Generator[list[DataModelType], None, None]: Batches of the query result.
+        """
+        if self.model_executor is not None:
+            yield from self._iter_executor_batches(model_class, query_sql, params, batch_size)
+            return
+
+        if self.use_model_row_factory:
+            yield from self._iter_row_factory_batches(model_class, query_sql, params, batch_size)
+            return
+
+        # Log
+        self.log_query(self.db_cursor, query_sql, params)
+
+        # Execute the query
+        self.db_cursor.execute(query_sql, params)
+
+        for rows in self._fetch_batches(self.db_cursor, batch_size):
+            yield [self.turn_data_into_model(model_class, row) for row in rows]
+
+    def _iter_many_temp_table(
+        self,
+        empty_data_class: DataModelType,
+        ids: list[Any],
+        id_key: str,
+        columns: Sequence[ColumnItem] | None = None,
+    ) -> Generator[list[DataModelType], None, None]:
+        """
+        Loads the ids into a temporary table and selects the matching records, see `get_many`.
+        Database specific wrappers implement this and enable it with `many_temp_table_threshold`.
+
+        Args:
+            empty_data_class (DataModelType): The data model to use for the query.
+            ids (list[Any]): The ids to select.
+            id_key (str): The name of the key to match the ids against.
+            columns (Sequence[ColumnItem] | None, optional): The columns to select. Defaults to None.
+
+        Returns:
+            Generator[list[DataModelType], None, None]: Batches of the query result.
+        """
+        raise NotImplementedError("Temporary tables are not supported by this wrapper")
+
+    def _iter_executor_batches(
+        self,
+        model_class: type[DataModelType],
+        query_sql: Any,
+        params: tuple[Any, ...],
+        batch_size: int,
+    ) -> Generator[list[DataModelType], None, None]:
+        """
+        Executes the query and builds the data models in `model_executor`,
+        while the next batches are fetched, see `model_executor`.
+
+        Args:
+            model_class (type[DataModelType]): The data model class to create.
+            query_sql (Any): The query to execute.
+            params (tuple[Any, ...]): The query parameters.
+            batch_size (int): The number of rows to fetch at once.
+
+        Returns:
+            Generator[list[DataModelType], None, None]: Batches of the query result, in query order.
+        """
+        assert self.model_executor is not None, "Model executor is not set"
+        if self.model_executor_window < 1:
+            raise ValueError("Model executor window must be greater than 0")
+
+        # Log
+        self.log_query(self.db_cursor, query_sql, params)
+
+        # Execute the query
+        self.db_cursor.execute(query_sql, params)
+
+        pending: deque[tuple[Future[list[DataModelType]], list[Any]]] = deque()
+        try:
+            for rows in self._fetch_batches(self.db_cursor, batch_size):
+                pending.append((self.model_executor.submit(_build_models, model_class, rows), rows))
+
+                # Wait for the oldest batch, so that the window stays bounded
+                if len(pending) >= self.model_executor_window:
+                    (future, rows) = pending.popleft()
+                    yield self._attach_rows(future.result(), rows)
+
+            while pending:
+                (future, rows) = pending.popleft()
+                yield self._attach_rows(future.result(), rows)
+        finally:
+            for future, _ in pending:
+                future.cancel()
+
+    def _iter_row_factory_batches(
+        self,
+        model_class: type[DataModelType],
+        query_sql: Any,
+        params: tuple[Any, ...],
+        batch_size: int,
+    ) -> Generator[list[DataModelType], None, None]:
+        """
+        Executes the query on a new cursor that builds data models from tuple rows,
+        see `use_model_row_factory`.
+
+        Args:
+            model_class (type[DataModelType]): The data model class to create.
+            query_sql (Any): The query to execute.
+            params (tuple[Any, ...]): The query parameters.
+            batch_size (int): The number of rows to fetch at once.
+
+        Returns:
+            Generator[list[DataModelType], None, None]: Batches of the query result.
+        """
+        # Prefer a driver row factory, otherwise turn tuple rows into models here
+        cursor = self._new_model_cursor(model_class)
+        driver_factory = cursor is not None
+        if cursor is None:
+            cursor = self._new_tuple_cursor()
+
+        try:
+            # Log
+            self.log_query(cursor, query_sql, params)
+
+            # Execute the query
+            cursor.execute(query_sql, params)
+
+            if driver_factory:
+                yield from self._fetch_batches(cursor, batch_size)
+                return
+
+            make_model = model_class.row_maker([column[0] for column in cursor.description or []])
+            for rows in self._fetch_batches(cursor, batch_size):
+                yield [make_model(row) for row in rows]
+        finally:
+            cursor.close()
+
+    def _new_tuple_cursor(self) -> Any:
+        """
+        Creates a new cursor on the connection of the current cursor, that returns rows as tuples.
+        Database specific wrappers implement this.
 
-        # Order and limit
-        _order = self.order_query(order_by)
-        _limit = self.limit_query(offset, limit)
+        Returns:
+            Any: The new cursor, the caller is responsible for closing it.
+        """
+        raise NotImplementedError("Tuple cursors are not supported by this wrapper")
 
-        # Create SQL query
-        query_sql = self._format_filter_query(_query, _filter, _order, _limit)
+    def _new_model_cursor(self, model_class: type[DBDataModel]) -> Any | None:
+        """
+        Creates a new cursor on the connection of the current cursor, with a row factory
+        that returns rows as `model_class` instances.
+        Database specific wrappers implement this, if the driver supports row factories.
 
-        # Log
-        self.log_query(self.db_cursor, query_sql, _params)
+        Args:
+            model_class (type[DBDataModel]): The data model class to create.
 
-        # Execute the query
-        self.db_cursor.execute(query_sql, _params)
+        Returns:
+            Any | None: The new cursor, or None if the driver has no row factories.
+        """
+        return None
+
+    def _fetch_batches(
+        self,
+        cursor: Any,
+        batch_size: int,
+    ) -> Generator[list[Any], None, None]:
+        """
+        Fetches rows from the given cursor using `fetchmany`.
+
+        Args:
+            cursor (Any): The cursor to fetch the rows from.
+            batch_size (int): The number of rows to fetch at once.
+
+        Returns:
+            Generator[list[Any], None, None]: Lists of rows, until the cursor is exhausted.
+        """
+        if batch_size < 1:
+            raise ValueError("Batch size must be greater than 0")
 
-        # Instead of fetchall(), we'll use a generator to yield results one by one
         while True:
-            row = self.db_cursor.fetchone()
-            if row is None:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
                 break
 
-            yield self.turn_data_into_model(empty_data_class.__class__, row)
+            yield list(rows)
 
     def _insert(
         self,
@@ -230,34 +932,109 @@ class DBWrapper(DBWrapperMixin):
             affected_rows,
         )
 
+    def _insert_many(
+        self,
+        empty_data_class: DBDataModel,
+        schema_name: str | None,
+        table_name: str,
+        store_data: list[dict[str, Any]],
+        id_key: str,
+    ) -> list[tuple[int, int]]:
+        """
+        Stores records with the same columns in the database with a single multi-row INSERT.
+
+        The order of the rows returned by the INSERT is not defined, so the ids are matched to the records
+        by their value when the ids are stored, or otherwise by sorting them: the rows are inserted in
+        the order of the records, so the generated integer ids ascend in that order. Records with ids
+        of other types are stored one by one.
+
+        Args:
+            empty_data_class (DBDataModel): The data model to use for the query.
+            schema_name (str | None): The name of the schema to store the records in.
+            table_name (str): The name of the table to store the records in.
+            store_data (list[dict[str, Any]]): The data to store, all with the same keys in the same order.
+            id_key (str): The name of the key to use for the query.
+
+        Returns:
+            list[tuple[int, int]]: The id and the number of affected rows of each record, in input order.
+        """
+        columns = list(store_data[0].keys())
+        if id_key not in columns and not self._has_integer_ids(empty_data_class, id_key):
+            return [self._insert(empty_data_class, schema_name, table_name, data, id_key) for data in store_data]
+
+        values = tuple(value for data in store_data for value in data.values())
+        table_identifier = self.make_identifier(schema_name, table_name)
+        return_key = self.make_identifier(empty_data_class.table_alias, id_key)
+        if id_key in columns:
+            insert_query = self._format_insert_many_query(table_identifier, columns, len(store_data), return_key)
+        else:
+            insert_query = self._format_insert_many_ordered_query(
+                empty_data_class,
+                table_identifier,
+                columns,
+                len(store_data),
+                return_key,
+            )
+
+        # Log
+        self.log_query(self.db_cursor, insert_query, values)
+
+        # Insert
+        self.db_cursor.execute(insert_query, values)
+        ids = [result[id_key] for result in self.db_cursor.fetchall() if id_key in result]
+
+        if id_key in columns:
+            stored = set(ids)
+            return [(data[id_key], 1) if data[id_key] in stored else (0, 0) for data in store_data]
+
+        ids.sort()
+        return [(ids[index], 1) if index < len(ids) else (0, 0) for index in range(len(store_data))]
+
     @overload
-    def insert(self, records: DataModelType) -> tuple[int, int]: ...
+    def insert(self, records: DataModelType, bulk: bool = True, batch_size: int | None = None) -> tuple[int, int]: ...
 
     @overload
-    def insert(self, records: list[DataModelType]) -> list[tuple[int, int]]: ...
+    def insert(
+        self,
+        records: list[DataModelType],
+        bulk: bool = True,
+        batch_size: int | None = None,
+    ) -> list[tuple[int, int]]: ...
 
     def insert(
         self,
         records: DataModelType | list[DataModelType],
+        bulk: bool = True,
+        batch_size: int | None = None,
     ) -> tuple[int, int] | list[tuple[int, int]]:
         """
         Stores a record or a list of records in the database.
+        The ids of the new rows are set on the records.
+
+        In bulk mode, records of the same table with the same store columns are grouped,
+        and each group is stored in batches of `batch_size` with multi-row INSERTs.
 
         Args:
             records (DataModelType | list[DataModelType]): The record or records to store.
+            bulk (bool, optional): Store a list of records with multi-row INSERTs,
+                otherwise with one INSERT per record. Defaults to True.
+            batch_size (int | None, optional): Maximum number of records in a single bulk INSERT.
+                Defaults to `insert_batch_size`.
 
         Returns:
             tuple[int, int] | list[tuple[int, int]]: The id of the record and
                 the number of affected rows for a single record or a list of
                 ids and the number of affected rows for a list of records.
         """
-        status: list[tuple[int, int]] = []
-
         one_record = False
         if not isinstance(records, list):
             one_record = True
             records = [records]
 
+        if bulk and not one_record:
+            return self._insert_bulk(records, batch_size)
+
+        status: list[tuple[int, int]] = []
         for row in records:
             store_id_key = row.id_key
             store_data = row.store_data()
@@ -273,6 +1050,8 @@ class DBWrapper(DBWrapperMixin):
             )
             if res:
                 setattr(row, store_id_key, res[0])  # update the id of the row
+                if row._track_changes:
+                    row.mark_clean()
 
             status.append(res)
 
@@ -281,6 +1060,31 @@ class DBWrapper(DBWrapperMixin):
 
         return status
 
+    def _insert_bulk(self, records: list[DataModelType], batch_size: int | None) -> list[tuple[int, int]]:
+        status: list[tuple[int, int] | None] = [None] * len(records)
+        chunks = self._record_chunks(
+            records,
+            lambda record: record.store_data(),
+            self.insert_batch_size if batch_size is None else batch_size,
+            max_params=self.max_query_params,
+        )
+        for chunk in chunks:
+            (_, row, _) = chunk[0]
+            results = self._insert_many(
+                row,
+                row.schema_name,
+                row.table_name,
+                [item[2] for item in chunk],
+                row.id_key,
+            )
+            for (position, record, _), res in zip(chunk, results, strict=True):
+                setattr(record, record.id_key, res[0])  # update the id of the row
+                if record._track_changes:
+                    record.mark_clean()
+                status[position] = res
+
+        return [res for res in status if res is not None]
+
     def insert_data(
         self,
         record: DBDataModel,
@@ -296,6 +1100,153 @@ class DBWrapper(DBWrapperMixin):
 
         return status
 
+    def _upsert_many(
+        self,
+        empty_data_class: DBDataModel,
+        schema_name: str | None,
+        table_name: str,
+        store_data: list[dict[str, Any]],
+        id_key: str,
+        conflict_keys: Sequence[str],
+        update_columns: list[str],
+    ) -> list[tuple[int, int]]:
+        """
+        Stores records with the same columns in the database with a single multi-row INSERT,
+        records that conflict with an existing row update it instead.
+
+        Args:
+            empty_data_class (DBDataModel): The data model to use for the query.
+            schema_name (str | None): The name of the schema to store the records in.
+            table_name (str): The name of the table to store the records in.
+            store_data (list[dict[str, Any]]): The data to store, all with the same keys in the same order.
+            id_key (str): The name of the key to use for the query.
+            conflict_keys (Sequence[str]): The columns of the unique key to detect conflicts on.
+            update_columns (list[str]): The columns to update on conflict.
+
+        Returns:
+            list[tuple[int, int]]: The id and the number of affected rows of each record, in input order.
+        """
+        columns = list(store_data[0].keys())
+        values = tuple(value for data in store_data for value in data.values())
+        table_identifier = self.make_identifier(schema_name, table_name)
+        return_key = self.make_identifier(empty_data_class.table_alias, id_key)
+        upsert_query = self._format_upsert_query(
+            table_identifier,
+            columns,
+            len(store_data),
+            conflict_keys,
+            update_columns,
+            return_key,
+        )
+
+        # Log
+        self.log_query(self.db_cursor, upsert_query, values)
+
+        # Upsert, the order of the returned rows is not defined, so they are matched to the records
+        # by the row position when the query returns it, otherwise by the conflict keys
+        self.db_cursor.execute(upsert_query, values)
+        positions = {tuple(data[key] for key in conflict_keys): index for index, data in enumerate(store_data)}
+        ids = [0] * len(store_data)
+        for result in self.db_cursor.fetchall():
+            if "dbw_row" in result:
+                position = result["dbw_row"]
+            else:
+                position = positions.get(tuple(result.get(key) for key in conflict_keys))
+            if position is not None and position < len(ids) and id_key in result:
+                ids[position] = result[id_key]
+
+        return [(id_value, 1) if id_value else (0, 0) for id_value in ids]
+
+    @overload
+    def upsert(
+        self,
+        records: DataModelType,
+        conflict_keys: Sequence[str],
+        batch_size: int | None = None,
+    ) -> tuple[int, int]: ...
+
+    @overload
+    def upsert(
+        self,
+        records: list[DataModelType],
+        conflict_keys: Sequence[str],
+        batch_size: int | None = None,
+    ) -> list[tuple[int, int]]: ...
+
+    def upsert(
+        self,
+        records: DataModelType | list[DataModelType],
+        conflict_keys: Sequence[str],
+        batch_size: int | None = None,
+    ) -> tuple[int, int] | list[tuple[int, int]]:
+        """
+        Stores a record or a list of records in the database, updating the rows that already exist.
+
+        Records that conflict with an existing row on `conflict_keys` update the columns from
+        `update_data()` instead, with the values from `store_data()`. Records are grouped like
+        in `insert` and stored with multi-row statements. The ids of the rows are set on the records.
+        A batch must not contain the same conflict key twice.
+
+        Args:
+            records (DataModelType | list[DataModelType]): The record or records to store.
+            conflict_keys (Sequence[str]): The columns of the unique key to detect conflicts on,
+                they need to be stored columns. MySQL detects conflicts on any unique key.
+            batch_size (int | None, optional): Maximum number of records in a single statement.
+                Defaults to `insert_batch_size`.
+
+        Returns:
+            tuple[int, int] | list[tuple[int, int]]: The id of the record and
+                the number of affected rows for a single record or a list of
+                ids and the number of affected rows for a list of records.
+        """
+        if not conflict_keys:
+            raise ValueError("Conflict keys are not set")
+
+        one_record = False
+        if not isinstance(records, list):
+            one_record = True
+            records = [records]
+
+        chunks = self._record_chunks(
+            records,
+            lambda record: record.store_data(),
+            self.insert_batch_size if batch_size is None else batch_size,
+            max_params=self.max_query_params,
+        )
+
+        status: list[tuple[int, int] | None] = [None] * len(records)
+        for chunk in chunks:
+            (_, row, store_data) = chunk[0]
+            for key in conflict_keys:
+                if key not in store_data:
+                    raise ValueError(f"Conflict key {key} is not a stored column")
+
+            # Without columns to update, a conflict key is set to itself so that the id is still returned
+            update_columns = [
+                column for column in (row.update_data() or {}) if column in store_data and column not in conflict_keys
+            ] or [conflict_keys[0]]
+
+            results = self._upsert_many(
+                row,
+                row.schema_name,
+                row.table_name,
+                [item[2] for item in chunk],
+                row.id_key,
+                conflict_keys,
+                update_columns,
+            )
+            for (position, record, _), res in zip(chunk, results, strict=True):
+                setattr(record, record.id_key, res[0])  # update the id of the row
+                if record._track_changes:
+                    record.mark_clean()
+                status[position] = res
+
+        stored = [res for res in status if res is not None]
+        if one_record:
+            return stored[0] if stored else (0, 0)
+
+        return stored
+
     def _update(
         self,
         empty_data_class: DBDataModel,
@@ -334,55 +1285,153 @@ class DBWrapper(DBWrapperMixin):
 
         return affected_rows
 
+    def _update_many(
+        self,
+        empty_data_class: DBDataModel,
+        schema_name: str | None,
+        table_name: str,
+        update_data: list[dict[str, Any]],
+        ids: list[Any],
+        id_key: str,
+    ) -> list[int]:
+        """
+        Updates records with the same columns in the database with a single statement.
+
+        Args:
+            empty_data_class (DBDataModel): The data model to use for the query.
+            schema_name (str | None): The name of the schema to update the records in.
+            table_name (str): The name of the table to update the records in.
+            update_data (list[dict[str, Any]]): The data to update, all with the same keys in the same order.
+            ids (list[Any]): The ids of the records to update.
+            id_key (str): The name of the key to match the records by.
+
+        Returns:
+            list[int]: The number of affected rows for every id, in input order.
+        """
+        columns = list(update_data[0].keys())
+        values = tuple(
+            value for id_value, data in zip(ids, update_data, strict=True) for value in (id_value, *data.values())
+        )
+        table_identifier = self.make_identifier(schema_name, table_name)
+        update_query = self._format_update_many_query(
+            empty_data_class,
+            table_identifier,
+            id_key,
+            columns,
+            len(update_data),
+        )
+
+        # Log
+        self.log_query(self.db_cursor, update_query, values)
+
+        # Update
+        self.db_cursor.execute(update_query, values)
+        updated = Counter(result[id_key] for result in self.db_cursor.fetchall())
+
+        return [updated[id_value] for id_value in ids]
+
     @overload
-    def update(self, records: DataModelType) -> int: ...
+    def update(self, records: DataModelType, bulk: bool = False, batch_size: int | None = None) -> int: ...
 
     @overload
-    def update(self, records: list[DataModelType]) -> list[int]: ...
+    def update(
+        self,
+        records: list[DataModelType],
+        bulk: bool = False,
+        batch_size: int | None = None,
+    ) -> list[int]: ...
 
-    def update(self, records: DataModelType | list[DataModelType]) -> int | list[int]:
+    def update(
+        self,
+        records: DataModelType | list[DataModelType],
+        bulk: bool = False,
+        batch_size: int | None = None,
+    ) -> int | list[int]:
         """
         Updates a record or a list of records in the database.
 
+        In bulk mode, records of the same table with the same update columns are grouped,
+        and each group is updated in batches of `batch_size` with a single statement.
+
+        Models with `_track_changes` send only the fields that changed since they were loaded,
+        records without changes are skipped.
+
         Args:
             records (DataModelType | list[DataModelType]): The record or records to update.
+            bulk (bool, optional): Update a list of records with set-based statements. Defaults to False.
+            batch_size (int | None, optional): Maximum number of records in a single bulk statement.
+                Defaults to `insert_batch_size`.
 
         Returns:
             int | list[int]: The number of affected rows for a single record or a list of
-                affected rows for a list of records.
+                affected rows for a list of records. In bulk mode a record counts 1 if a row
+                with its id was matched, even if no value changed. On MySQL, which has no RETURNING,
+                the matching ids are selected right before the update. Without bulk mode, the count
+                is what the driver reports, which on MySQL counts only rows whose values changed.
         """
-        status: list[int] = []
-
         one_record = False
         if not isinstance(records, list):
             one_record = True
             records = [records]
 
+        if bulk and not one_record:
+            return self._update_bulk(records, batch_size)
+
+        status: list[int] = []
         for row in records:
-            update_data = row.update_data()
+            update_data = row.changed_update_data()
             update_id_key = row.id_key
             update_id_value = row.id_value
             if not update_data or not update_id_key or not update_id_value:
                 continue
 
-            status.append(
-                self._update(
-                    row,
-                    row.schema_name,
-                    row.table_name,
-                    update_data,
-                    (
-                        update_id_key,
-                        update_id_value,
-                    ),
-                )
+            affected_rows = self._update(
+                row,
+                row.schema_name,
+                row.table_name,
+                update_data,
+                (
+                    update_id_key,
+                    update_id_value,
+                ),
             )
+            if row._track_changes:
+                row.mark_clean()
+
+            status.append(affected_rows)
 
         if one_record:
             return status[0] if status else 0
 
         return status
 
+    def _update_bulk(self, records: list[DataModelType], batch_size: int | None) -> list[int]:
+        chunks = self._record_chunks(
+            records,
+            lambda record: record.changed_update_data(),
+            self.insert_batch_size if batch_size is None else batch_size,
+            max_params=self.max_query_params,
+            require_id_value=True,
+        )
+
+        status: list[int | None] = [None] * len(records)
+        for chunk in chunks:
+            (_, row, _) = chunk[0]
+            results = self._update_many(
+                row,
+                row.schema_name,
+                row.table_name,
+                [item[2] for item in chunk],
+                [item[1].id_value for item in chunk],
+                row.id_key,
+            )
+            for (position, record, _), affected_rows in zip(chunk, results, strict=True):
+                if record._track_changes:
+                    record.mark_clean()
+                status[position] = affected_rows
+
+        return [affected_rows for affected_rows in status if affected_rows is not None]
+
     def update_data(
         self,
         record: DBDataModel,
@@ -439,49 +1488,236 @@ class DBWrapper(DBWrapperMixin):
 
         return affected_rows
 
+    def _delete_many(
+        self,
+        empty_data_class: DBDataModel,
+        schema_name: str | None,
+        table_name: str,
+        ids: list[Any],
+        id_key: str,
+    ) -> list[int]:
+        """
+        Deletes the records with the given ids from the database with a single query.
+
+        Args:
+            empty_data_class (DBDataModel): The data model to use for the query.
+            schema_name (str | None): The name of the schema to delete the records from.
+            table_name (str): The name of the table to delete the records from.
+            ids (list[Any]): The ids of the records to delete.
+            id_key (str): The name of the key to match the records by.
+
+        Returns:
+            list[int]: The number of affected rows for every id, in input order.
+        """
+        table_identifier = self.make_identifier(schema_name, table_name)
+        (delete_query, params) = self._format_delete_many_query(table_identifier, id_key, ids)
+
+        # Log
+        self.log_query(self.db_cursor, delete_query, params)
+
+        # Delete
+        self.db_cursor.execute(delete_query, params)
+        deleted = Counter(result[id_key] for result in self.db_cursor.fetchall())
+
+        # A repeated id is only deleted once
+        status: list[int] = []
+        for id_value in ids:
+            status.append(deleted[id_value])
+            deleted[id_value] = 0
+
+        return status
+
     @overload
-    def delete(self, records: DataModelType) -> int: ...
+    def delete(self, records: DataModelType, batch_size: int | None = None) -> int: ...
 
     @overload
-    def delete(self, records: list[DataModelType]) -> list[int]: ...
+    def delete(self, records: list[DataModelType], batch_size: int | None = None) -> list[int]: ...
 
-    def delete(self, records: DataModelType | list[DataModelType]) -> int | list[int]:
+    def delete(
+        self,
+        records: DataModelType | list[DataModelType],
+        batch_size: int | None = None,
+    ) -> int | list[int]:
         """
         Deletes a record or a list of records from the database.
 
+        A list is deleted by id: records of the same table are grouped, and each group
+        is deleted in chunks of `batch_size` ids with a single query.
+
         Args:
             records (DataModelType | list[DataModelType]): The record or records to delete.
+            batch_size (int | None, optional): Maximum number of ids in a single query.
+                Defaults to the number of ids that fit in a query.
 
         Returns:
             int | list[int]: The number of affected rows for a single record or a list of
                 affected rows for a list of records.
         """
+        if isinstance(records, list):
+            return self._delete_bulk(records, batch_size)
+
+        delete_id_key = records.id_key
+        delete_id_value = records.id_value
+        if not delete_id_key or not delete_id_value:
+            return 0
+
+        return self._delete(
+            records,
+            records.schema_name,
+            records.table_name,
+            (
+                delete_id_key,
+                delete_id_value,
+            ),
+        )
+
+    def _delete_bulk(self, records: list[DataModelType], batch_size: int | None) -> list[int]:
+        chunks = self._record_chunks(
+            records,
+            lambda record: {record.id_key: record.id_value},
+            self._many_chunk_size(batch_size),
+            require_id_value=True,
+        )
+
+        status: list[int | None] = [None] * len(records)
+        for chunk in chunks:
+            (_, row, _) = chunk[0]
+            results = self._delete_many(
+                row,
+                row.schema_name,
+                row.table_name,
+                [item[1].id_value for item in chunk],
+                row.id_key,
+            )
+            for (position, _, _), affected_rows in zip(chunk, results, strict=True):
+                status[position] = affected_rows
+
+        return [affected_rows for affected_rows in status if affected_rows is not None]
+
+    def _execute_batch(
+        self,
+        query: Any,
+        params: list[tuple[Any, ...]],
+    ) -> int:
+        """
+        Executes a query once for every set of parameters with a single `executemany` call.
+
+        Args:
+            query (Any): The query to execute.
+            params (list[tuple[Any, ...]]): The parameters for every execution.
+
+        Returns:
+            int: The number of affected rows as the driver reports it for `executemany`.
+                Most drivers report the total of all executions, but not all of them do,
+                pymssql for example may report a single execution.
+        """
+        if not params:
+            return 0
+
+        # Log, the first parameter set stands for all of them
+        self.log_query(self.db_cursor, query, params[0])
+
+        # Execute
+        self.db_cursor.executemany(query, params)
+        return self.db_cursor.rowcount
+
+    def insert_batch(self, records: list[DataModelType], batch_size: int | None = None) -> list[int]:
+        """
+        Stores a list of records in the database with `executemany`.
+
+        Records of the same table with the same store columns are grouped and sent in chunks
+        of `batch_size`. Drivers that rewrite `executemany` INSERTs into multi-row VALUES
+        (like mysqlclient) store every chunk with a single statement. Ids of the new rows
+        are not returned, use `insert` when they are needed.
+
+        Args:
+            records (list[DataModelType]): The records to store.
+            batch_size (int | None, optional): Maximum number of records in a single `executemany` call.
+                Defaults to `executemany_batch_size`.
+
+        Returns:
+            list[int]: The number of affected rows of each chunk, as the driver reports it, see `_execute_batch`.
+        """
+        chunks = self._record_chunks(
+            records,
+            lambda record: record.store_data(),
+            self.executemany_batch_size if batch_size is None else batch_size,
+        )
+
         status: list[int] = []
+        for chunk in chunks:
+            (_, row, store_data) = chunk[0]
+            table_identifier = self.make_identifier(row.schema_name, row.table_name)
+            insert_query = self._format_insert_many_query(table_identifier, list(store_data.keys()), 1)
+            status.append(self._execute_batch(insert_query, [tuple(item[2].values()) for item in chunk]))
 
-        one_record = False
-        if not isinstance(records, list):
-            one_record = True
-            records = [records]
+        return status
 
-        for row in records:
-            delete_id_key = row.id_key
-            delete_id_value = row.id_value
-            if not delete_id_key or not delete_id_value:
-                continue
+    def update_batch(self, records: list[DataModelType], batch_size: int | None = None) -> list[int]:
+        """
+        Updates a list of records in the database with `executemany`.
 
-            status.append(
-                self._delete(
-                    row,
-                    row.schema_name,
-                    row.table_name,
-                    (
-                        delete_id_key,
-                        delete_id_value,
-                    ),
-                )
-            )
+        Records of the same table with the same update columns are grouped and sent in chunks
+        of `batch_size`. Records without an id value or, for models with `_track_changes`,
+        without changes are left out.
 
-        if one_record:
-            return status[0] if status else 0
+        Args:
+            records (list[DataModelType]): The records to update.
+            batch_size (int | None, optional): Maximum number of records in a single `executemany` call.
+                Defaults to `executemany_batch_size`.
+
+        Returns:
+            list[int]: The number of affected rows of each chunk, as the driver reports it, see `_execute_batch`.
+        """
+        chunks = self._record_chunks(
+            records,
+            lambda record: record.changed_update_data(),
+            self.executemany_batch_size if batch_size is None else batch_size,
+            require_id_value=True,
+        )
+
+        status: list[int] = []
+        for chunk in chunks:
+            (_, row, update_data) = chunk[0]
+            table_identifier = self.make_identifier(row.schema_name, row.table_name)
+            update_key = self.make_identifier(row.table_alias, row.id_key)
+            update_query = self._format_update_query(table_identifier, update_key, update_data)
+            params = [(*item[2].values(), item[1].id_value) for item in chunk]
+            status.append(self._execute_batch(update_query, params))
+            for _, record, _ in chunk:
+                if record._track_changes:
+                    record.mark_clean()
+
+        return status
+
+    def delete_batch(self, records: list[DataModelType], batch_size: int | None = None) -> list[int]:
+        """
+        Deletes a list of records from the database with `executemany`.
+
+        Records of the same table are grouped and sent in chunks of `batch_size`.
+        Records without an id value are left out.
+
+        Args:
+            records (list[DataModelType]): The records to delete.
+            batch_size (int | None, optional): Maximum number of records in a single `executemany` call.
+                Defaults to `executemany_batch_size`.
+
+        Returns:
+            list[int]: The number of affected rows of each chunk, as the driver reports it, see `_execute_batch`.
+        """
+        chunks = self._record_chunks(
+            records,
+            lambda record: {record.id_key: record.id_value},
+            self.executemany_batch_size if batch_size is None else batch_size,
+            require_id_value=True,
+        )
+
+        status: list[int] = []
+        for chunk in chunks:
+            (_, row, _) = chunk[0]
+            table_identifier = self.make_identifier(row.schema_name, row.table_name)
+            delete_key = self.make_identifier(row.table_alias, row.id_key)
+            delete_query = self._format_delete_query(table_identifier, delete_key)
+            status.append(self._execute_batch(delete_query, [(item[1].id_value,) for item in chunk]))
 
         return status
@@ -1,7 +1,28 @@
 import logging
+from collections.abc import Callable, Sequence
+from concurrent.futures import Executor
 from typing import Any, cast
 
 from .common import DataModelType, NoParam, OrderByItem
+from .db_data_model import ColumnItem, DBDataModel, MetadataDict
+
+# Column types of generated ids that ascend in insert order
+INTEGER_TYPES = frozenset(
+    ("smallint", "integer", "int", "bigint", "int2", "int4", "int8", "tinyint", "mediumint")
+    + ("smallserial", "serial", "bigserial", "serial2", "serial4", "serial8")
+)
+
+
+def _build_models(model_class: type[DataModelType], rows: list[dict[str, Any]]) -> list[DataModelType]:
+    """
+    Turns a batch of rows into data models. Module level, so that it can be sent to a process pool.
+    `raw_data` is left empty, the caller still has the rows and sets it, so they are not sent back.
+    """
+    records = [model_class.from_db_row(row) for row in rows]
+    for record in records:
+        record.raw_data = {}
+
+    return records
 
 
 class DBWrapperMixin:
@@ -11,6 +32,13 @@ class DBWrapperMixin:
 
     :property db_cursor: Database cursor object.
     :property logger: Logger object
+    :property use_model_row_factory: Build data models straight from tuple rows
+    :property max_query_params: Maximum number of parameters in a single query
+    :property many_temp_table_threshold: Number of ids from which `get_many` uses a temporary table
+    :property insert_batch_size: Maximum number of records in a single multi-row INSERT
+    :property executemany_batch_size: Maximum number of records in a single executemany call
+    :property model_executor: Executor to build data models in
+    :property model_executor_window: Maximum number of batches in the executor at once
     """
 
     ###########################
@@ -26,6 +54,53 @@ class DBWrapperMixin:
     logger: Any
     """Logger object"""
 
+    use_model_row_factory: bool = False
+    """
+    Build data models straight from tuple rows using a row factory built from `cursor.description`,
+    instead of creating a dict per row. Models created this way have an empty `raw_data`.
+    """
+
+    param_placeholder: str = "%s"
+    """
+    Parameter placeholder used in the generated queries, in the paramstyle of the driver.
+    """
+
+    max_query_params: int = 1000
+    """
+    Maximum number of parameters in a single query, queries with many values are chunked to fit.
+    """
+
+    many_temp_table_threshold: int = 0
+    """
+    Number of ids from which `get_many` loads the ids into a temporary table and joins it,
+    instead of chunked queries. 0 disables it, database specific wrappers set it where supported.
+    """
+
+    insert_batch_size: int = 1000
+    """
+    Maximum number of records that `insert` stores with a single multi-row INSERT,
+    the batches are made smaller if they would exceed `max_query_params`.
+    """
+
+    executemany_batch_size: int = 1000
+    """
+    Maximum number of records that `insert_batch`, `update_batch` and `delete_batch`
+    send with a single `executemany` call.
+    """
+
+    model_executor: Executor | None = None
+    """
+    Executor to build data models in, instead of the calling thread. Use a `ProcessPoolExecutor`
+    to spread deserialization of large results over all cores. Row batches and the resulting models
+    are pickled, so data model classes need to be importable (defined at module level).
+    Results keep their order. Takes precedence over `use_model_row_factory`.
+    """
+
+    model_executor_window: int = 4
+    """
+    Maximum number of batches submitted to `model_executor` and not yet returned to the caller.
+    """
+
     #######################
     ### Class lifecycle ###
     #######################
@@ -118,7 +193,7 @@ class DBWrapperMixin:
         """
         Turns the given data into a data model.
         By default we are pretty sure that there is no factory in the cursor,
-        So we need to create a new instance of the data model and fill it with data
+        so we build the data model from the row using its compiled row plan.
 
         Args:
             empty_data_class (DataModelType): The data model to use.
@@ -127,34 +202,97 @@ class DBWrapperMixin:
         Returns:
             DataModelType: The data model filled with data.
         """
-
-        result = empty_data_class()
-        result.fill_data_from_dict(db_data)
-        result.raw_data = db_data
-
-        # If the id key is not "id", we set it manually so that its filled correctly
-        if result.id_key != "id":
-            result.id = db_data.get(result.id_key, None)
-
-        return result
+        return empty_data_class.from_db_row(db_data)
 
     #####################
     ### Query methods ###
     #####################
 
-    def filter_query(self, schema_name: str | None, table_name: str) -> Any:
+    def filter_query(
+        self,
+        schema_name: str | None,
+        table_name: str,
+        columns: Sequence[ColumnItem] | None = None,
+    ) -> Any:
         """
         Creates a SQL query to filter data from the given table.
 
         Args:
             schema_name (str | None): The name of the schema to filter data from.
             table_name (str): The name of the table to filter data from.
+            columns (Sequence[ColumnItem] | None, optional): The columns to select, all if not set. Defaults to None.
 
         Returns:
             Any: The created SQL query object.
         """
         full_table_name = self.make_identifier(schema_name, table_name)
-        return f"SELECT * FROM {full_table_name}"
+        return f"SELECT {self.columns_query(columns)} FROM {full_table_name}"
+
+    def columns_query(self, columns: Sequence[ColumnItem] | None = None) -> Any:
+        """
+        Creates the select list for the given columns.
+
+        Args:
+            columns (Sequence[ColumnItem] | None, optional): The columns to select, all if not set. Defaults to None.
+
+        Returns:
+            Any: The created select list.
+
+        Raises:
+            ValueError: If a column is a JSON sub-path, those are only supported by PostgreSQL.
+        """
+        if not columns:
+            return "*"
+
+        select_list: list[str] = []
+        for item in columns:
+            (column, alias) = self.split_column_item(item)
+            if "->" in column:
+                raise ValueError(f"JSON sub-path columns are not supported by this database: {column}")
+
+            select_list.append(column if column == alias else f"{column} AS {alias}")
+
+        return ", ".join(select_list)
+
+    def split_column_item(self, item: ColumnItem) -> tuple[str, str]:
+        """
+        Splits a column item into the column and the name it is returned as.
+        JSON sub-paths without an alias are returned as their last key.
+
+        Args:
+            item (ColumnItem): The column item.
+
+        Returns:
+            tuple[str, str]: The column and its alias.
+        """
+        if isinstance(item, tuple):
+            return item
+
+        return (item, item.split("->")[-1].strip())
+
+    def count_query(self, query: Any) -> Any:
+        """
+        Wraps the given SELECT query into a query that counts its rows.
+
+        Args:
+            query (Any): The SELECT query.
+
+        Returns:
+            Any: The created SQL query object, returns the row count as "count".
+        """
+        return f"SELECT count(*) AS count FROM ({query}) AS dbw_count"
+
+    def exists_query(self, query: Any) -> Any:
+        """
+        Wraps the given SELECT query into a query that checks if it returns any rows.
+
+        Args:
+            query (Any): The SELECT query.
+
+        Returns:
+            Any: The created SQL query object, returns the result as "result".
+        """
+        return f"SELECT EXISTS({query}) AS result"
 
     def order_query(self, order_by: OrderByItem | None = None) -> Any | None:
         """
@@ -189,39 +327,40 @@ class DBWrapperMixin:
         return f"LIMIT {limit} OFFSET {offset}"
 
     def format_filter(self, key: str, filter: Any) -> tuple[Any, ...]:
+        placeholder = self.param_placeholder
         if type(filter) is dict:
             if "$contains" in filter:
                 return (
-                    f"{key} LIKE %s",
+                    f"{key} LIKE {placeholder}",
                     f"%{filter['$contains']}%",
                 )
             elif "$starts_with" in filter:
-                return (f"{key} LIKE %s", f"{filter['$starts_with']}%")
+                return (f"{key} LIKE {placeholder}", f"{filter['$starts_with']}%")
             elif "$ends_with" in filter:
-                return (f"{key} LIKE %s", f"%{filter['$ends_with']}")
+                return (f"{key} LIKE {placeholder}", f"%{filter['$ends_with']}")
             elif "$min" in filter and "$max" not in filter:
-                return (f"{key} >= %s", filter["$min"])
+                return (f"{key} >= {placeholder}", filter["$min"])
             elif "$max" in filter and "$min" not in filter:
-                return (f"{key} <= %s", filter["$max"])
+                return (f"{key} <= {placeholder}", filter["$max"])
             elif "$min" in filter and "$max" in filter:
-                return (f"{key} BETWEEN %s AND %s", filter["$min"], filter["$max"])
+                return (f"{key} BETWEEN {placeholder} AND {placeholder}", filter["$min"], filter["$max"])
             elif "$in" in filter:
                 in_filter_1: list[Any] = cast(list[Any], filter["$in"])
-                return (f"{key} IN (%s)" % ",".join(["%s"] * len(in_filter_1)),) + tuple(in_filter_1)
+                return (f"{key} IN ({','.join([placeholder] * len(in_filter_1))})",) + tuple(in_filter_1)
             elif "$not_in" in filter:
                 in_filter_2: list[Any] = cast(list[Any], filter["$not_in"])
-                return (f"{key} NOT IN (%s)" % ",".join(["%s"] * len(in_filter_2)),) + tuple(in_filter_2)
+                return (f"{key} NOT IN ({','.join([placeholder] * len(in_filter_2))})",) + tuple(in_filter_2)
             elif "$not" in filter:
-                return (f"{key} != %s", filter["$not"])
+                return (f"{key} != {placeholder}", filter["$not"])
 
             elif "$gt" in filter:
-                return (f"{key} > %s", filter["$gt"])
+                return (f"{key} > {placeholder}", filter["$gt"])
             elif "$gte" in filter:
-                return (f"{key} >= %s", filter["$gte"])
+                return (f"{key} >= {placeholder}", filter["$gte"])
             elif "$lt" in filter:
-                return (f"{key} < %s", filter["$lt"])
+                return (f"{key} < {placeholder}", filter["$lt"])
             elif "$lte" in filter:
-                return (f"{key} <= %s", filter["$lte"])
+                return (f"{key} <= {placeholder}", filter["$lte"])
             elif "$is_null" in filter:
                 return (f"{key} IS NULL",)
             elif "$is_not_null" in filter:
@@ -229,7 +368,7 @@ class DBWrapperMixin:
 
             raise NotImplementedError("Filter type not supported")
         elif isinstance(filter, (bool, str, int, float)):
-            return (f"{key} = %s", filter)
+            return (f"{key} = {placeholder}", filter)
         else:
             raise NotImplementedError(f"Filter type not supported: {key} = {type(filter)}")
 
@@ -244,6 +383,285 @@ class DBWrapperMixin:
 
         return (_query, _params)
 
+    def _format_select_query(
+        self,
+        empty_data_class: DBDataModel,
+        filter: dict[str, Any] | None = None,
+        order_by: OrderByItem | None = None,
+        offset: int = 0,
+        limit: int = 100,
+        custom_query: Any = None,
+        condition: tuple[Any, tuple[Any, ...]] | None = None,
+        columns: Sequence[ColumnItem] | None = None,
+    ) -> tuple[Any, tuple[Any, ...]]:
+        """
+        Creates a full SELECT query for the given data model.
+
+        Args:
+            empty_data_class (DBDataModel): The data model to use for the query.
+            filter (dict[str, Any] | None, optional): The filter to apply. Defaults to None.
+            order_by (OrderByItem | None, optional): The order by item to use for sorting. Defaults to None.
+            offset (int, optional): The number of results to skip. Defaults to 0.
+            limit (int, optional): The maximum number of results to return. Defaults to 100.
+            custom_query (Any, optional): The custom query to use for the query. Defaults to None.
+            condition (tuple[Any, tuple[Any, ...]] | None, optional): Additional condition and its
+                parameters, joined to the filter with AND. Defaults to None.
+            columns (Sequence[ColumnItem] | None, optional): The columns to select, the ones from
+                `select_columns()` of the data model if not set. Defaults to None.
+
+        Returns:
+            tuple[Any, tuple[Any, ...]]: The query and its parameters.
+        """
+        _query = (
+            custom_query
+            or empty_data_class.query_base()
+            or self.filter_query(
+                empty_data_class.schema_name,
+                empty_data_class.table_name,
+                columns if columns is not None else empty_data_class.select_columns(),
+            )
+        )
+        (_filter, _params) = self.create_filter(filter)
+        if condition is not None:
+            (_filter, _params) = self._append_filter(_filter, _params, condition[0], condition[1])
+
+        # Order and limit
+        _order = self.order_query(order_by)
+        _limit = self.limit_query(offset, limit)
+
+        return (self._format_filter_query(_query, _filter, _order, _limit), _params)
+
+    def _append_filter(
+        self,
+        q_filter: Any,
+        params: tuple[Any, ...],
+        condition: Any,
+        condition_params: tuple[Any, ...],
+    ) -> tuple[Any, tuple[Any, ...]]:
+        """
+        Adds a condition to a filter created by `create_filter`.
+
+        Args:
+            q_filter (Any): The filter, empty if there is none.
+            params (tuple[Any, ...]): The parameters of the filter.
+            condition (Any): The condition to add.
+            condition_params (tuple[Any, ...]): The parameters of the condition.
+
+        Returns:
+            tuple[Any, tuple[Any, ...]]: The new filter and its parameters.
+        """
+        if not q_filter:
+            return (f"WHERE {condition}", condition_params)
+
+        return (f"{q_filter} AND ({condition})", params + condition_params)
+
+    def keyset_order(self, order_by: OrderByItem) -> list[tuple[str, str]]:
+        """
+        Validates the sort order for keyset pagination.
+
+        Args:
+            order_by (OrderByItem): The sort order, the last column must be unique and not null.
+
+        Returns:
+            list[tuple[str, str]]: The sort columns with their direction, ASC or DESC.
+        """
+        if not order_by:
+            raise ValueError("Keyset pagination needs at least one sort column")
+
+        result: list[tuple[str, str]] = []
+        for item in order_by:
+            direction = (item[1] if len(item) > 1 and item[1] is not None else "ASC").upper()
+            if direction not in ("ASC", "DESC"):
+                raise ValueError(f"Unsupported sort direction for keyset pagination: {direction}")
+            result.append((item[0], direction))
+
+        return result
+
+    def _format_keyset_condition(
+        self,
+        order_by: list[tuple[str, str]],
+        values: list[Any],
+    ) -> tuple[Any, tuple[Any, ...]]:
+        """
+        Creates a condition that matches the records after the given sort key.
+        Uses the expanded form `(a > x) OR (a = x AND b > y)`, which works on all databases.
+
+        Args:
+            order_by (list[tuple[str, str]]): The sort columns, see `keyset_order`.
+            values (list[Any]): The values of the sort columns of the last seen record.
+
+        Returns:
+            tuple[Any, tuple[Any, ...]]: The condition and its parameters.
+        """
+        parts: list[str] = []
+        params: list[Any] = []
+        for index, (column, direction) in enumerate(order_by):
+            operator = ">" if direction == "ASC" else "<"
+            part = [f"{prev_column} = {self.param_placeholder}" for (prev_column, _) in order_by[:index]]
+            part.append(f"{column} {operator} {self.param_placeholder}")
+            parts.append("({})".format(" AND ".join(part)))
+            params.extend(values[: index + 1])
+
+        return (" OR ".join(parts), tuple(params))
+
+    def _keyset_values(self, record: DBDataModel, order_by: list[tuple[str, str]]) -> list[Any]:
+        """
+        Reads the sort key of the given record, preferring the raw database values.
+
+        Args:
+            record (DBDataModel): The record.
+            order_by (list[tuple[str, str]]): The sort columns, see `keyset_order`.
+
+        Returns:
+            list[Any]: The values of the sort columns.
+        """
+        return [self._record_value(record, column) for (column, _) in order_by]
+
+    def _attach_rows(self, records: list[DataModelType], rows: list[dict[str, Any]]) -> list[DataModelType]:
+        """
+        Sets `raw_data` of the records built by `_build_models` to their rows.
+
+        Args:
+            records (list[DataModelType]): The records.
+            rows (list[dict[str, Any]]): The rows, in the same order.
+
+        Returns:
+            list[DataModelType]: The records.
+        """
+        for record, row in zip(records, rows, strict=True):
+            record.raw_data = row
+
+        return records
+
+    def _record_value(self, record: DBDataModel, column: str) -> Any:
+        """
+        Reads the value of the given column from a record, preferring the raw database value.
+
+        Args:
+            record (DBDataModel): The record.
+            column (str): The column name, can be qualified with a table alias.
+
+        Returns:
+            Any: The value of the column.
+        """
+        # Columns can be qualified with a table alias in custom queries
+        name = column.rsplit(".", 1)[-1]
+        if name in record.raw_data:
+            return record.raw_data[name]
+
+        return getattr(record, name)
+
+    def _format_many_query(
+        self,
+        empty_data_class: DBDataModel,
+        ids: list[Any],
+        id_key: str,
+        columns: Sequence[ColumnItem] | None = None,
+    ) -> tuple[Any, tuple[Any, ...]]:
+        """
+        Creates a SELECT query for the records with the given ids, see `get_many`.
+
+        Args:
+            empty_data_class (DBDataModel): The data model to use for the query.
+            ids (list[Any]): The ids to select.
+            id_key (str): The name of the key to match the ids against.
+            columns (Sequence[ColumnItem] | None, optional): The columns to select. Defaults to None.
+
+        Returns:
+            tuple[Any, tuple[Any, ...]]: The query and its parameters.
+        """
+        return self._format_select_query(
+            empty_data_class,
+            {id_key: {"$in": ids}},
+            limit=0,
+            columns=columns,
+        )
+
+    def _many_chunk_size(self, chunk_size: int | None) -> int:
+        """
+        Number of ids to select or delete with a single query, see `get_many` and `delete`.
+
+        Args:
+            chunk_size (int | None): The requested chunk size, `max_query_params` if not set.
+
+        Returns:
+            int: The chunk size.
+        """
+        if chunk_size is None:
+            return self.max_query_params
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be at least 1")
+
+        return chunk_size
+
+    def _order_many(
+        self,
+        ids: list[Any],
+        records: dict[Any, DataModelType],
+        as_list: bool,
+    ) -> dict[Any, DataModelType] | list[DataModelType]:
+        """
+        Orders the records found by `get_many` by the requested ids.
+
+        Args:
+            ids (list[Any]): The requested ids, in input order.
+            records (dict[Any, DataModelType]): The found records by id.
+            as_list (bool): Return a list instead of a dict.
+
+        Returns:
+            dict[Any, DataModelType] | list[DataModelType]: The records in input order,
+                ids that were not found are left out.
+        """
+        if as_list:
+            return [records[id_value] for id_value in ids if id_value in records]
+
+        return {id_value: records[id_value] for id_value in dict.fromkeys(ids) if id_value in records}
+
+    def _record_chunks(
+        self,
+        records: list[DataModelType],
+        record_data: Callable[[DataModelType], dict[str, Any] | None],
+        batch_size: int,
+        max_params: int | None = None,
+        require_id_value: bool = False,
+    ) -> list[list[tuple[int, DataModelType, dict[str, Any]]]]:
+        """
+        Groups records that are written to the same table with the same columns into chunks,
+        each written with a single query, see `insert` and `insert_batch`.
+
+        Args:
+            records (list[DataModelType]): The records to write.
+            record_data (Callable[[DataModelType], dict[str, Any] | None]): Returns the data to write for a record.
+            batch_size (int): Maximum number of records in a chunk.
+            max_params (int | None, optional): Maximum number of parameters in a chunk. Defaults to None.
+            require_id_value (bool, optional): Leave out records without an id value. Defaults to False.
+
+        Returns:
+            list[list[tuple[int, DataModelType, dict[str, Any]]]]: Chunks of the position in `records`,
+                the record and its data. Records without an id key or data are left out.
+        """
+        if batch_size < 1:
+            raise ValueError("Batch size must be at least 1")
+
+        groups: dict[tuple[Any, ...], list[tuple[int, DataModelType, dict[str, Any]]]] = {}
+        for position, record in enumerate(records):
+            data = record_data(record)
+            if not record.id_key or not data or (require_id_value and not record.id_value):
+                continue
+
+            group_key = (record.schema_name, record.table_name, record.id_key, tuple(data.keys()))
+            groups.setdefault(group_key, []).append((position, record, data))
+
+        chunks: list[list[tuple[int, DataModelType, dict[str, Any]]]] = []
+        for group_key, group in groups.items():
+            chunk_size = batch_size
+            if max_params is not None:
+                chunk_size = max(1, min(batch_size, max_params // len(group_key[3])))
+
+            chunks.extend(group[start : start + chunk_size] for start in range(0, len(group), chunk_size))
+
+        return chunks
+
     def _format_filter_query(
         self,
         query: Any,
@@ -269,9 +687,145 @@ class DBWrapperMixin:
         values = list(store_data.values())
 
         columns = ", ".join(keys)
-        values_placeholder = ", ".join(["%s"] * len(values))
+        values_placeholder = ", ".join([self.param_placeholder] * len(values))
         return f"INSERT INTO {table_identifier} ({columns}) VALUES ({values_placeholder}) RETURNING {return_key}"
 
+    def _format_insert_many_query(
+        self,
+        table_identifier: Any,
+        columns: list[str],
+        rows_count: int,
+        return_key: Any = None,
+    ) -> Any:
+        columns_list = ", ".join(columns)
+        row_placeholder = "(" + ", ".join([self.param_placeholder] * len(columns)) + ")"
+        values_placeholder = ", ".join([row_placeholder] * rows_count)
+        insert_query = f"INSERT INTO {table_identifier} ({columns_list}) VALUES {values_placeholder}"
+        if return_key is None:
+            return insert_query
+
+        return f"{insert_query} RETURNING {return_key}"
+
+    def _format_insert_many_ordered_query(
+        self,
+        empty_data_class: DBDataModel,
+        table_identifier: Any,
+        columns: list[str],
+        rows_count: int,
+        return_key: Any,
+    ) -> Any:
+        """
+        Creates a multi-row INSERT that stores the rows in the order of the records, see `_insert_many`.
+        Every row carries its position, and the rows are inserted ordered by it,
+        so the generated ids ascend in the order of the records.
+
+        Args:
+            empty_data_class (DBDataModel): The data model to use for the query.
+            table_identifier (Any): The table to store the records in.
+            columns (list[str]): The columns to insert.
+            rows_count (int): The number of records.
+            return_key (Any): The id column to return.
+
+        Returns:
+            Any: The insert query.
+        """
+        columns_list = ", ".join(columns)
+        row_placeholder = ", ".join([self.param_placeholder] * len(columns))
+        values_placeholder = ", ".join(f"({index}, {row_placeholder})" for index in range(rows_count))
+        return (
+            f"WITH dbw_values (dbw_row, {columns_list}) AS (VALUES {values_placeholder}) "
+            f"INSERT INTO {table_identifier} ({columns_list}) "
+            f"SELECT {columns_list} FROM dbw_values ORDER BY dbw_row RETURNING {return_key}"
+        )
+
+    def _has_integer_ids(self, empty_data_class: DBDataModel, id_key: str) -> bool:
+        """
+        Checks if the id column is of an integer type, from the `db_field` metadata of the id field,
+        or from its annotation if it has no `db_field`. Generated integer ids ascend in insert order.
+
+        Args:
+            empty_data_class (DBDataModel): The data model.
+            id_key (str): The name of the id key.
+
+        Returns:
+            bool: True if the ids are integers.
+        """
+        field_obj = empty_data_class.__dataclass_fields__.get(id_key)
+        if field_obj is None:
+            return False
+
+        metadata = cast(MetadataDict, field_obj.metadata)
+        if "db_field" not in metadata:
+            return field_obj.type in (int, "int")
+
+        type_name = metadata["db_field"][1].lower().split("(")[0].split()
+        return bool(type_name) and type_name[0] in INTEGER_TYPES
+
+    def _format_upsert_query(
+        self,
+        table_identifier: Any,
+        columns: list[str],
+        rows_count: int,
+        conflict_keys: Sequence[str],
+        update_columns: list[str],
+        return_key: Any,
+    ) -> Any:
+        """
+        Creates a multi-row INSERT that updates the rows that conflict on `conflict_keys`, see `upsert`.
+        The query returns the id and the conflict keys of every inserted or updated row,
+        or the position of the record as `dbw_row`, to match the rows to the records.
+
+        Args:
+            table_identifier (Any): The table to store the records in.
+            columns (list[str]): The columns to insert.
+            rows_count (int): The number of records.
+            conflict_keys (Sequence[str]): The columns of the unique key to detect conflicts on.
+            update_columns (list[str]): The columns to update on conflict.
+            return_key (Any): The id column to return.
+
+        Returns:
+            Any: The upsert query.
+        """
+        insert_query = self._format_insert_many_query(table_identifier, columns, rows_count)
+        conflict_list = ", ".join(conflict_keys)
+        set_clause = ", ".join(f"{column} = excluded.{column}" for column in update_columns)
+        return (
+            f"{insert_query} ON CONFLICT ({conflict_list}) DO UPDATE SET {set_clause} "
+            f"RETURNING {return_key}, {conflict_list}"
+        )
+
+    def _format_update_many_query(
+        self,
+        empty_data_class: DBDataModel,
+        table_identifier: Any,
+        id_key: str,
+        columns: list[str],
+        rows_count: int,
+    ) -> Any:
+        """
+        Creates a query that updates many records with a single statement, see `update`.
+        The parameters are the id followed by the column values, for every record.
+        The query returns the id of every updated row.
+
+        Args:
+            empty_data_class (DBDataModel): The data model to use for the query.
+            table_identifier (Any): The table to update.
+            id_key (str): The name of the key to match the records by.
+            columns (list[str]): The columns to update.
+            rows_count (int): The number of records.
+
+        Returns:
+            Any: The update query.
+        """
+        # VALUES columns are named column1, column2, ... by both PostgreSQL and SQLite
+        row_placeholder = "(" + ", ".join([self.param_placeholder] * (len(columns) + 1)) + ")"
+        values_placeholder = ", ".join([row_placeholder] * rows_count)
+        set_clause = ", ".join(f"{column} = dbw_values.column{index}" for index, column in enumerate(columns, 2))
+        return (
+            f"UPDATE {table_identifier} SET {set_clause} FROM (VALUES {values_placeholder}) AS dbw_values "
+            f"WHERE {table_identifier}.{id_key} = dbw_values.column1 RETURNING {table_identifier}.{id_key}"
+        )
+
     def _format_update_query(
         self,
         table_identifier: Any,
@@ -279,12 +833,36 @@ class DBWrapperMixin:
         update_data: dict[str, Any],
     ) -> Any:
         keys = update_data.keys()
-        set_clause = ", ".join(f"{key} = %s" for key in keys)
-        return f"UPDATE {table_identifier} SET {set_clause} WHERE {update_key} = %s"
+        set_clause = ", ".join(f"{key} = {self.param_placeholder}" for key in keys)
+        return f"UPDATE {table_identifier} SET {set_clause} WHERE {update_key} = {self.param_placeholder}"
+
+    def _format_delete_many_query(
+        self,
+        table_identifier: Any,
+        id_key: str,
+        ids: list[Any],
+    ) -> tuple[Any, tuple[Any, ...]]:
+        """
+        Creates a query that deletes the records with the given ids, see `delete`.
+        The query returns the id of every deleted row.
+
+        Args:
+            table_identifier (Any): The table to delete from.
+            id_key (str): The name of the key to match the records by.
+            ids (list[Any]): The ids to delete.
+
+        Returns:
+            tuple[Any, tuple[Any, ...]]: The query and its parameters.
+        """
+        ids_placeholder = ", ".join([self.param_placeholder] * len(ids))
+        return (
+            f"DELETE FROM {table_identifier} WHERE {id_key} IN ({ids_placeholder}) RETURNING {id_key}",
+            tuple(ids),
+        )
 
     def _format_delete_query(
         self,
         table_identifier: Any,
         delete_key: Any,
     ) -> Any:
-        return f"DELETE FROM {table_identifier} WHERE {delete_key} = %s"
+        return f"DELETE FROM {table_identifier} WHERE {delete_key} = {self.param_placeholder}"
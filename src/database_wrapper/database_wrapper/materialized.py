@@ -0,0 +1,183 @@
+import bisect
+import mmap
+import pickle
+import tempfile
+from collections.abc import Iterator, Sequence
+from typing import IO, Any, Generic
+
+from .common import DataModelType
+
+
+class MaterializedResult(Generic[DataModelType]):
+    """
+    Query result that can be iterated many times and accessed by index, within a memory budget.
+
+    Rows are stored as pickled batches of tuples, the column names are kept only once,
+    and data models are created when they are accessed. When the stored batches exceed
+    `memory_budget` bytes, they are moved to a temporary file and read back through a memory map,
+    so only the batch being read is held in memory.
+
+    Use it as a context manager or call `close()` to remove the temporary file.
+    """
+
+    model_class: type[DataModelType]
+    """ The data model class to create """
+
+    memory_budget: int
+    """ Maximum size of the batches kept in memory, in bytes """
+
+    columns: list[str] | None
+    """ Column names, in the order they were returned by the cursor """
+
+    def __init__(self, model_class: type[DataModelType], memory_budget: int = 64 * 1024 * 1024) -> None:
+        self.model_class = model_class
+        self.memory_budget = memory_budget
+        self.columns = None
+
+        # Batches in memory, until the budget is exceeded
+        self._batches: list[bytes] = []
+        self._memory_size = 0
+
+        # Batch positions in the temporary file, once spilled
+        self._file: IO[bytes] | None = None
+        self._file_size = 0
+        self._offsets: list[tuple[int, int]] = []
+        self._mmap: mmap.mmap | None = None
+
+        # Number of rows up to and including each batch, for access by index
+        self._ends: list[int] = []
+
+        # Last read batch, so that sequential access by index unpickles every batch once
+        self._cached: tuple[int, list[tuple[Any, ...]]] | None = None
+
+    def __enter__(self) -> "MaterializedResult[DataModelType]":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._ends[-1] if self._ends else 0
+
+    def __iter__(self) -> Iterator[DataModelType]:
+        for batch in self.iter_batches():
+            yield from batch
+
+    def __getitem__(self, index: int) -> DataModelType:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Result index out of range")
+
+        batch_index = bisect.bisect_right(self._ends, index)
+        start = self._ends[batch_index - 1] if batch_index else 0
+        return self._make_model(self._read_batch(batch_index)[index - start])
+
+    @property
+    def spilled(self) -> bool:
+        """
+        True if the batches were moved to a temporary file.
+        """
+        return self._file is not None
+
+    def add_rows(self, rows: Sequence[dict[str, Any]]) -> None:
+        """
+        Adds a batch of dict rows to the result.
+
+        Args:
+            rows (Sequence[dict[str, Any]]): The rows to add.
+        """
+        if not rows:
+            return
+
+        if self.columns is None:
+            self.columns = list(rows[0].keys())
+
+        columns = self.columns
+        data = pickle.dumps([tuple(row[name] for name in columns) for row in rows], protocol=pickle.HIGHEST_PROTOCOL)
+        self._ends.append(len(self) + len(rows))
+
+        if self._file is None and self._memory_size + len(data) <= self.memory_budget:
+            self._batches.append(data)
+            self._memory_size += len(data)
+            return
+
+        if self._file is None:
+            self._spill()
+        self._write(data)
+
+    def iter_batches(self) -> Iterator[list[DataModelType]]:
+        """
+        Iterates over the result in the batches it was added in.
+
+        Returns:
+            Iterator[list[DataModelType]]: Batches of data models.
+        """
+        for batch_index in range(len(self._ends)):
+            yield [self._make_model(values) for values in self._read_batch(batch_index)]
+
+    def close(self) -> None:
+        """
+        Releases the stored rows and removes the temporary file.
+        """
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+        self._batches = []
+        self._memory_size = 0
+        self._file_size = 0
+        self._offsets = []
+        self._ends = []
+        self._cached = None
+
+    ######################
+    ### Helper methods ###
+    ######################
+
+    def _spill(self) -> None:
+        self._file = tempfile.TemporaryFile(prefix="dbw_result_")
+        for data in self._batches:
+            self._write(data)
+
+        self._batches = []
+        self._memory_size = 0
+
+    def _write(self, data: bytes) -> None:
+        assert self._file is not None, "Result is not spilled"
+
+        # The memory map only covers the file as it was when it was created
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+        self._file.seek(self._file_size)
+        self._file.write(data)
+        self._offsets.append((self._file_size, len(data)))
+        self._file_size += len(data)
+
+    def _read_batch(self, batch_index: int) -> list[tuple[Any, ...]]:
+        if self._cached is not None and self._cached[0] == batch_index:
+            return self._cached[1]
+
+        if self._file is None:
+            data = self._batches[batch_index]
+        else:
+            if self._mmap is None:
+                self._file.flush()
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+            (offset, length) = self._offsets[batch_index]
+            data = self._mmap[offset : offset + length]
+
+        rows: list[tuple[Any, ...]] = pickle.loads(data)
+        self._cached = (batch_index, rows)
+        return rows
+
+    def _make_model(self, values: tuple[Any, ...]) -> DataModelType:
+        assert self.columns is not None, "Columns are not set"
+        return self.model_class.from_db_row(dict(zip(self.columns, values, strict=True)))
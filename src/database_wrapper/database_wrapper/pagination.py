@@ -0,0 +1,109 @@
+import base64
+import binascii
+import datetime
+import json
+import uuid
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any, Generic
+
+from .common import DataModelType
+
+
+@dataclass
+class KeysetPage(Generic[DataModelType]):
+    """
+    One page of a keyset (seek) paginated result.
+
+    Attributes:
+    - items (list[DataModelType]): The records on this page.
+    - next_token (str | None): Opaque token to fetch the next page with, None if this is the last page.
+    """
+
+    items: list[DataModelType] = field(default_factory=list)
+    next_token: str | None = None
+
+
+def _encode_value(value: Any) -> Any:
+    # Types that JSON can not represent are tagged, so that they come back as the same type
+    if isinstance(value, datetime.datetime):
+        return {"$datetime": value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {"$date": value.isoformat()}
+    if isinstance(value, datetime.time):
+        return {"$time": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"$decimal": str(value)}
+    if isinstance(value, uuid.UUID):
+        return {"$uuid": str(value)}
+
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if not isinstance(value, dict) or len(value) != 1:
+        return value
+
+    (tag, raw) = next(iter(value.items()))
+    if tag == "$datetime":
+        return datetime.datetime.fromisoformat(raw)
+    if tag == "$date":
+        return datetime.date.fromisoformat(raw)
+    if tag == "$time":
+        return datetime.time.fromisoformat(raw)
+    if tag == "$decimal":
+        return Decimal(raw)
+    if tag == "$uuid":
+        return uuid.UUID(raw)
+
+    return value
+
+
+def encode_page_token(columns: Sequence[str], values: Sequence[Any]) -> str:
+    """
+    Encodes the last seen sort key into an opaque, URL safe page token.
+
+    The token is not signed. Its values are only ever used as query parameters,
+    but a client can still change them to seek to a different position.
+
+    Args:
+        columns (Sequence[str]): The sort columns.
+        values (Sequence[Any]): The values of the sort columns of the last seen record.
+
+    Returns:
+        str: The page token.
+    """
+    payload = json.dumps(
+        {"c": list(columns), "v": [_encode_value(value) for value in values]},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_page_token(token: str, columns: Sequence[str]) -> list[Any]:
+    """
+    Decodes a page token created by `encode_page_token`.
+
+    Args:
+        token (str): The page token.
+        columns (Sequence[str]): The sort columns the token is expected to be for.
+
+    Returns:
+        list[Any]: The values of the sort columns of the last seen record.
+
+    Raises:
+        ValueError: If the token is invalid or was created for a different sort order.
+    """
+    try:
+        padding = "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(token + padding))
+        token_columns = payload["c"]
+        values = payload["v"]
+    except (binascii.Error, ValueError, TypeError, KeyError) as e:
+        raise ValueError("Invalid page token") from e
+
+    if token_columns != list(columns) or not isinstance(values, list) or len(values) != len(columns):
+        raise ValueError("Page token does not match the sort order")
+
+    return [_decode_value(value) for value in values]
@@ -1,3 +1,4 @@
+import dataclasses
 from collections.abc import Callable
 from typing import Any, TypeVar
 
@@ -11,11 +12,13 @@ def ignore_unknown_kwargs() -> Callable[[AnyDataType], AnyDataType]:
 
     def decorator(cls: AnyDataType) -> AnyDataType:
         original_init = cls.__init__
+        field_names = {f.name for f in dataclasses.fields(cls)} if dataclasses.is_dataclass(cls) else set()
 
         # @wraps(original_init)
         def new_init(self: Any, *args: Any, **kwargs: Any) -> None:
-            # Filter out kwargs that are not properties of the class
-            valid_kwargs = {k: v for k, v in kwargs.items() if hasattr(self, k)}
+            # Filter out kwargs that are not properties of the class.
+            # Fields with a default_factory have no class attribute, so check the fields as well
+            valid_kwargs = {k: v for k, v in kwargs.items() if k in field_names or hasattr(self, k)}
             original_init(self, *args, **valid_kwargs)
 
         cls.__init__ = new_init
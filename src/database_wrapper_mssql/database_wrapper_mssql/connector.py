@@ -22,6 +22,9 @@ class MssqlTypedDictCursor(MssqlCursor):
     def fetchone(self) -> dict[str, Any] | None:
         return super().fetchone()  # type: ignore
 
+    def fetchmany(self, size: int | None = None) -> list[dict[str, Any]]:
+        return super().fetchmany(size)  # type: ignore
+
     def fetchall(self) -> list[dict[str, Any]]:
         return super().fetchall()  # type: ignore
 
@@ -1,9 +1,10 @@
 import logging
+from collections.abc import Sequence
 from typing import Any
 
-from database_wrapper import DataModelType, DBWrapper
+from database_wrapper import ColumnItem, DataModelType, DBDataModel, DBWrapper
 
-from .connector import MssqlTypedDictCursor
+from .connector import MssqlCursor, MssqlTypedDictCursor
 
 
 class DBWrapperMssql(DBWrapper):
@@ -12,6 +13,9 @@ class DBWrapperMssql(DBWrapper):
     db_cursor: MssqlTypedDictCursor | None
     """ MsSQL cursor object """
 
+    max_query_params: int = 2000
+    """ SQL Server allows 2100 parameters per query, some are left for other parameters """
+
     #######################
     ### Class lifecycle ###
     #######################
@@ -45,6 +49,46 @@ class DBWrapperMssql(DBWrapper):
         """
         super().set_db_cursor(db_cursor)
 
+    ######################
+    ### Helper methods ###
+    ######################
+
+    def _new_tuple_cursor(self) -> MssqlCursor:
+        assert self.db_cursor, "Cursor is not initialized"
+        return self.db_cursor.connection.cursor(as_dict=False)
+
+    def _insert_many(
+        self,
+        empty_data_class: DBDataModel,
+        schema_name: str | None,
+        table_name: str,
+        store_data: list[dict[str, Any]],
+        id_key: str,
+    ) -> list[tuple[int, int]]:
+        assert self.db_cursor, "Cursor is not initialized"
+
+        columns = list(store_data[0].keys())
+        values = tuple(value for data in store_data for value in data.values())
+        table_identifier = self.make_identifier(schema_name, table_name)
+        insert_query = self._format_insert_many_ordered_query(
+            empty_data_class,
+            table_identifier,
+            columns,
+            len(store_data),
+            id_key,
+        )
+
+        # Log
+        self.log_query(self.db_cursor, insert_query, values)
+
+        # Insert, the output rows carry the position of their record
+        self.db_cursor.execute(insert_query, values)
+        ids: list[Any] = [0] * len(store_data)
+        for result in self.db_cursor.fetchall():
+            ids[result["dbw_row"]] = result[id_key]
+
+        return [(id_value, 1) if id_value else (0, 0) for id_value in ids]
+
     #####################
     ### Query methods ###
     #####################
@@ -55,6 +99,7 @@ class DBWrapperMssql(DBWrapper):
         id_key: str,
         id_value: Any,
         custom_query: Any = None,
+        columns: Sequence[ColumnItem] | None = None,
     ) -> DataModelType | None:
         """
         Retrieves a single record from the database using the given key.
@@ -64,6 +109,8 @@ class DBWrapperMssql(DBWrapper):
             id_key (str): The name of the key to use for the query.
             id_value (Any): The value of the key to use for the query.
             custom_query (Any, optional): The custom query to use for the query. Defaults to None.
+            columns (Sequence[ColumnItem] | None, optional): The columns to select, see `DBDataModel.select_columns`.
+                Defaults to None.
 
         Returns:
             DataModelType | None: The result of the query.
@@ -77,12 +124,94 @@ class DBWrapperMssql(DBWrapper):
             order_by=[(id_key, "ASC")],
             limit=1,
             custom_query=custom_query,
+            columns=columns,
         )
         for row in res:
             return row
         else:
             return None
 
+    def exists_query(self, query: Any) -> str:
+        # SQL Server has no boolean type, so EXISTS can only be used in a condition
+        return f"SELECT CASE WHEN EXISTS({query}) THEN 1 ELSE 0 END AS result"
+
+    def _format_insert_many_ordered_query(
+        self,
+        empty_data_class: DBDataModel,
+        table_identifier: Any,
+        columns: list[str],
+        rows_count: int,
+        return_key: Any,
+    ) -> str:
+        # SQL Server has no RETURNING and INSERT ... OUTPUT can not reference the source rows,
+        # so a MERGE that never matches inserts every row and outputs its position
+        row_placeholder = ", ".join(["%s"] * len(columns))
+        values_placeholder = ", ".join(f"({index}, {row_placeholder})" for index in range(rows_count))
+        columns_list = ", ".join(columns)
+        source_columns = ", ".join(f"dbw_source.{column}" for column in columns)
+        return (
+            f"MERGE INTO {table_identifier} AS dbw_target "
+            f"USING (VALUES {values_placeholder}) AS dbw_source (dbw_row, {columns_list}) "
+            "ON 1 = 0 "
+            f"WHEN NOT MATCHED THEN INSERT ({columns_list}) VALUES ({source_columns}) "
+            f"OUTPUT dbw_source.dbw_row AS dbw_row, inserted.{return_key} AS {return_key};"
+        )
+
+    def _format_upsert_query(
+        self,
+        table_identifier: Any,
+        columns: list[str],
+        rows_count: int,
+        conflict_keys: Sequence[str],
+        update_columns: list[str],
+        return_key: Any,
+    ) -> str:
+        # MERGE outputs rows in no particular order, so every source row carries its position
+        row_placeholder = ", ".join(["%s"] * len(columns))
+        values_placeholder = ", ".join(f"({index}, {row_placeholder})" for index in range(rows_count))
+        columns_list = ", ".join(columns)
+        match_condition = " AND ".join(f"dbw_target.{key} = dbw_source.{key}" for key in conflict_keys)
+        set_clause = ", ".join(f"dbw_target.{column} = dbw_source.{column}" for column in update_columns)
+        source_columns = ", ".join(f"dbw_source.{column}" for column in columns)
+        return (
+            f"MERGE INTO {table_identifier} WITH (HOLDLOCK) AS dbw_target "
+            f"USING (VALUES {values_placeholder}) AS dbw_source (dbw_row, {columns_list}) "
+            f"ON {match_condition} "
+            f"WHEN MATCHED THEN UPDATE SET {set_clause} "
+            f"WHEN NOT MATCHED THEN INSERT ({columns_list}) VALUES ({source_columns}) "
+            f"OUTPUT dbw_source.dbw_row AS dbw_row, inserted.{return_key} AS {return_key};"
+        )
+
+    def _format_update_many_query(
+        self,
+        empty_data_class: DBDataModel,
+        table_identifier: Any,
+        id_key: str,
+        columns: list[str],
+        rows_count: int,
+    ) -> str:
+        row_placeholder = "(" + ", ".join(["%s"] * (len(columns) + 1)) + ")"
+        values_placeholder = ", ".join([row_placeholder] * rows_count)
+        set_clause = ", ".join(f"dbw_target.{column} = dbw_values.{column}" for column in columns)
+        return (
+            f"UPDATE dbw_target SET {set_clause} OUTPUT inserted.{id_key} "
+            f"FROM {table_identifier} AS dbw_target "
+            f"JOIN (VALUES {values_placeholder}) AS dbw_values (dbw_id, {', '.join(columns)}) "
+            f"ON dbw_target.{id_key} = dbw_values.dbw_id"
+        )
+
+    def _format_delete_many_query(
+        self,
+        table_identifier: Any,
+        id_key: str,
+        ids: list[Any],
+    ) -> tuple[str, tuple[Any, ...]]:
+        ids_placeholder = ", ".join(["%s"] * len(ids))
+        return (
+            f"DELETE FROM {table_identifier} OUTPUT deleted.{id_key} WHERE {id_key} IN ({ids_placeholder})",
+            tuple(ids),
+        )
+
     def limit_query(self, offset: int = 0, limit: int = 100) -> str | None:
         if limit == 0:
             return None
@@ -21,6 +21,9 @@ class MysqlTypedDictCursor(MysqlDictCursor):
     def fetchone(self) -> dict[str, Any] | None:
         return super().fetchone()
 
+    def fetchmany(self, size: int | None = None) -> tuple[dict[str, Any], ...]:
+        return super().fetchmany(size)
+
     def fetchall(self) -> tuple[dict[str, Any], ...]:
         return super().fetchall()
 
@@ -1,10 +1,61 @@
+import datetime
+import json
 import logging
+import tempfile
+from collections.abc import Iterable, Sequence
+from enum import Enum
 from typing import Any
 
-from database_wrapper import DBWrapper
+from MySQLdb.cursors import Cursor as MysqlCursor
+
+from database_wrapper import DataModelType, DBDataModel, DBWrapper
 
 from .connector import MysqlTypedDictCursor
 
+# Escapes of the default LOAD DATA format, where fields are separated by tabs and lines by newlines
+LOAD_DATA_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r", "\0": "\\0"})
+
+
+def load_data_value(value: Any) -> bytes:
+    """
+    Formats a value as a field of the default LOAD DATA format.
+    NULL is written as \\N, datetimes like mysqlclient formats them, so without the time zone,
+    dicts and lists as JSON, bytes are written as they are.
+    """
+    if value is None:
+        return b"\\N"
+
+    if isinstance(value, (bytes, bytearray)):
+        return (
+            bytes(value)
+            .replace(b"\\", b"\\\\")
+            .replace(b"\t", b"\\t")
+            .replace(b"\n", b"\\n")
+            .replace(b"\r", b"\\r")
+            .replace(b"\0", b"\\0")
+        )
+
+    if isinstance(value, bool):
+        text = "1" if value else "0"
+    elif isinstance(value, datetime.datetime):
+        text = value.replace(tzinfo=None).isoformat(sep=" ")
+    elif isinstance(value, datetime.time):
+        text = value.replace(tzinfo=None).isoformat()
+    elif isinstance(value, datetime.timedelta):
+        # TIME values can be longer than a day, as hours
+        sign = "-" if value < datetime.timedelta(0) else ""
+        (minutes, seconds) = divmod(abs(value).total_seconds(), 60)
+        (hours, minutes) = divmod(int(minutes), 60)
+        text = f"{sign}{hours}:{minutes:02}:{seconds:09.6f}"
+    elif isinstance(value, (dict, list)):
+        text = json.dumps(value, default=str)
+    elif isinstance(value, Enum):
+        return load_data_value(value.value)
+    else:
+        text = str(value)
+
+    return text.translate(LOAD_DATA_ESCAPES).encode()
+
 
 class DBWrapperMysql(DBWrapper):
     """Wrapper for MySQL database"""
@@ -12,6 +63,9 @@ class DBWrapperMysql(DBWrapper):
     db_cursor: MysqlTypedDictCursor | None
     """ MySQL cursor object """
 
+    max_query_params: int = 65535
+    """ MySQL allows 65535 parameters per prepared statement """
+
     #######################
     ### Class lifecycle ###
     #######################
@@ -66,11 +120,275 @@ class DBWrapperMysql(DBWrapper):
         query_string = cursor.mogrify(query, params)
         logging.getLogger().debug(f"Query: {query_string}")
 
+    def _new_tuple_cursor(self) -> MysqlCursor:
+        assert self.db_cursor, "Cursor is not initialized"
+        return self.db_cursor.connection.cursor(MysqlCursor)
+
+    def _insert_many(
+        self,
+        empty_data_class: DBDataModel,
+        schema_name: str | None,
+        table_name: str,
+        store_data: list[dict[str, Any]],
+        id_key: str,
+    ) -> list[tuple[int, int]]:
+        assert self.db_cursor, "Cursor is not initialized"
+
+        columns = list(store_data[0].keys())
+        if id_key not in columns and not self._has_integer_ids(empty_data_class, id_key):
+            return [self._insert(empty_data_class, schema_name, table_name, data, id_key) for data in store_data]
+
+        values = tuple(value for data in store_data for value in data.values())
+        table_identifier = self.make_identifier(schema_name, table_name)
+        insert_query = self._format_insert_many_query(table_identifier, columns, len(store_data))
+
+        # Log
+        self.log_query(self.db_cursor, insert_query, values)
+
+        # Insert
+        self.db_cursor.execute(insert_query, values)
+        affected_rows = self.db_cursor.rowcount
+        if id_key in columns:
+            return [(data[id_key], 1) for data in store_data]
+
+        # MySQL has no RETURNING, a multi-row INSERT with VALUES gets consecutive auto-increment ids,
+        # LAST_INSERT_ID() is the id of the first row
+        id_query = "SELECT LAST_INSERT_ID() AS first_id, @@auto_increment_increment AS step"
+        self.log_query(self.db_cursor, id_query, tuple())
+        self.db_cursor.execute(id_query)
+        row = self.db_cursor.fetchone()
+        if not row or not row["first_id"]:
+            return [(0, 0)] * len(store_data)
+
+        (first_id, step) = (int(row["first_id"]), int(row["step"]))
+        return [(first_id + index * step, 1) if index < affected_rows else (0, 0) for index in range(len(store_data))]
+
+    def _upsert_many(
+        self,
+        empty_data_class: DBDataModel,
+        schema_name: str | None,
+        table_name: str,
+        store_data: list[dict[str, Any]],
+        id_key: str,
+        conflict_keys: Sequence[str],
+        update_columns: list[str],
+    ) -> list[tuple[int, int]]:
+        assert self.db_cursor, "Cursor is not initialized"
+
+        columns = list(store_data[0].keys())
+        values = tuple(value for data in store_data for value in data.values())
+        table_identifier = self.make_identifier(schema_name, table_name)
+        upsert_query = self._format_upsert_query(
+            table_identifier,
+            columns,
+            len(store_data),
+            conflict_keys,
+            update_columns,
+            id_key,
+        )
+
+        # Log
+        self.log_query(self.db_cursor, upsert_query, values)
+
+        # Upsert
+        self.db_cursor.execute(upsert_query, values)
+
+        # MySQL has no RETURNING, so the ids are selected by the conflict keys after the upsert
+        keys = [tuple(data[key] for key in conflict_keys) for data in store_data]
+        key_columns = ", ".join(conflict_keys)
+        key_placeholder = "(" + ", ".join(["%s"] * len(conflict_keys)) + ")"
+        select_query = (
+            f"SELECT {id_key}, {key_columns} FROM {table_identifier} "
+            f"WHERE ({key_columns}) IN ({', '.join([key_placeholder] * len(keys))})"
+        )
+        select_params = tuple(value for key in keys for value in key)
+        self.log_query(self.db_cursor, select_query, select_params)
+        self.db_cursor.execute(select_query, select_params)
+        found = {tuple(row[key] for key in conflict_keys): row[id_key] for row in self.db_cursor.fetchall()}
+
+        return [(found[key], 1) if key in found else (0, 0) for key in keys]
+
+    def _update_many(
+        self,
+        empty_data_class: DBDataModel,
+        schema_name: str | None,
+        table_name: str,
+        update_data: list[dict[str, Any]],
+        ids: list[Any],
+        id_key: str,
+    ) -> list[int]:
+        """
+        Updates records with a single UPDATE ... JOIN, see `DBWrapper._update_many`.
+
+        The affected rows of a record are 1 if its id was matched, like with RETURNING on other databases.
+        MySQL reports only the rows whose values changed, so the ids are selected before the update instead.
+
+        Returns:
+            list[int]: 1 for every id that was found, 0 otherwise, in input order.
+        """
+        assert self.db_cursor, "Cursor is not initialized"
+
+        # MySQL has no RETURNING, so the matching ids are selected before the update
+        (select_query, select_params) = self._format_many_query(empty_data_class, ids, id_key, columns=[id_key])
+        self.log_query(self.db_cursor, select_query, select_params)
+        self.db_cursor.execute(select_query, select_params)
+        found = {row[id_key] for row in self.db_cursor.fetchall()}
+
+        columns = list(update_data[0].keys())
+        values = tuple(
+            value for id_value, data in zip(ids, update_data, strict=True) for value in (id_value, *data.values())
+        )
+        table_identifier = self.make_identifier(schema_name, table_name)
+        update_query = self._format_update_many_query(
+            empty_data_class,
+            table_identifier,
+            id_key,
+            columns,
+            len(update_data),
+        )
+
+        # Log
+        self.log_query(self.db_cursor, update_query, values)
+
+        # Update
+        self.db_cursor.execute(update_query, values)
+
+        return [1 if id_value in found else 0 for id_value in ids]
+
+    def _delete_many(
+        self,
+        empty_data_class: DBDataModel,
+        schema_name: str | None,
+        table_name: str,
+        ids: list[Any],
+        id_key: str,
+    ) -> list[int]:
+        assert self.db_cursor, "Cursor is not initialized"
+
+        # MySQL has no RETURNING, so the matching ids are selected before the delete
+        (select_query, select_params) = self._format_many_query(empty_data_class, ids, id_key, columns=[id_key])
+        self.log_query(self.db_cursor, select_query, select_params)
+        self.db_cursor.execute(select_query, select_params)
+        found = {row[id_key] for row in self.db_cursor.fetchall()}
+
+        table_identifier = self.make_identifier(schema_name, table_name)
+        ids_placeholder = ", ".join(["%s"] * len(ids))
+        delete_query = f"DELETE FROM {table_identifier} WHERE {id_key} IN ({ids_placeholder})"
+
+        # Log
+        self.log_query(self.db_cursor, delete_query, tuple(ids))
+
+        # Delete
+        self.db_cursor.execute(delete_query, tuple(ids))
+
+        # A repeated id is only deleted once
+        status: list[int] = []
+        for id_value in ids:
+            status.append(1 if id_value in found else 0)
+            found.discard(id_value)
+
+        return status
+
     #####################
     ### Query methods ###
     #####################
 
+    def bulk_load(self, records: Iterable[DataModelType]) -> int:
+        """
+        Stores records in the database with LOAD DATA LOCAL INFILE, the fastest way to load many rows.
+
+        Records are written to a temporary file in the default LOAD DATA format, which the client
+        then sends to the server, so a generator is loaded with bounded memory.
+        All records are stored in the table of the first record and must have the same store columns.
+        Ids of the new rows are not returned.
+
+        LOCAL needs `local_infile` enabled on the server and on the connection,
+        with `"kwargs": {"local_infile": True}` in `MysqlConfig`. With LOCAL, rows with duplicate keys
+        or values that can not be converted are skipped or adjusted with warnings instead of errors,
+        the warnings are logged.
+
+        Args:
+            records (Iterable[DataModelType]): The records to store.
+
+        Returns:
+            int: The number of stored rows.
+        """
+        assert self.db_cursor, "Cursor is not initialized"
+
+        iterator = iter(records)
+        first = next(iterator, None)
+        if first is None:
+            return 0
+
+        store_data = first.store_data()
+        if not store_data:
+            raise ValueError("Record has no data to store")
+
+        columns = tuple(store_data.keys())
+        load_query = (
+            f"LOAD DATA LOCAL INFILE %s INTO TABLE {self.make_identifier(first.schema_name, first.table_name)} "
+            f"CHARACTER SET utf8mb4 ({', '.join(columns)})"
+        )
+
+        with tempfile.NamedTemporaryFile(prefix="dbw_load_", suffix=".tsv") as load_file:
+            load_file.write(self._load_data_row(store_data.values()))
+            for record in iterator:
+                record_data = record.store_data() or {}
+                if tuple(record_data.keys()) != columns:
+                    raise ValueError("All records must have the same store columns")
+
+                load_file.write(self._load_data_row(record_data.values()))
+
+            load_file.flush()
+
+            # Log
+            self.log_query(self.db_cursor, load_query, (load_file.name,))
+
+            # Load
+            self.db_cursor.execute(load_query, (load_file.name,))
+
+        warnings = self.db_cursor.connection.warning_count()
+        if warnings:
+            self.logger.warning(f"LOAD DATA stored {self.db_cursor.rowcount} rows with {warnings} warnings")
+
+        return self.db_cursor.rowcount
+
+    def _load_data_row(self, values: Iterable[Any]) -> bytes:
+        return b"\t".join(map(load_data_value, values)) + b"\n"
+
     def limit_query(self, offset: int = 0, limit: int = 100) -> str | None:
         if limit == 0:
             return None
         return f"LIMIT {offset},{limit}"
+
+    def _format_upsert_query(
+        self,
+        table_identifier: Any,
+        columns: list[str],
+        rows_count: int,
+        conflict_keys: Sequence[str],
+        update_columns: list[str],
+        return_key: Any,
+    ) -> str:
+        # MySQL detects conflicts on any unique key, VALUES() is used as MariaDB has no row alias
+        insert_query = self._format_insert_many_query(table_identifier, columns, rows_count)
+        set_clause = ", ".join(f"{column} = VALUES({column})" for column in update_columns)
+        return f"{insert_query} ON DUPLICATE KEY UPDATE {set_clause}"
+
+    def _format_update_many_query(
+        self,
+        empty_data_class: DBDataModel,
+        table_identifier: Any,
+        id_key: str,
+        columns: list[str],
+        rows_count: int,
+    ) -> str:
+        # Derived table of SELECTs, as VALUES ROW() needs MySQL 8.0.19
+        first_row = "SELECT " + ", ".join(f"%s AS {column}" for column in ("dbw_id", *columns))
+        row = "SELECT " + ", ".join(["%s"] * (len(columns) + 1))
+        rows = " UNION ALL ".join([first_row, *([row] * (rows_count - 1))])
+        set_clause = ", ".join(f"{table_identifier}.{column} = dbw_values.{column}" for column in columns)
+        return (
+            f"UPDATE {table_identifier} JOIN ({rows}) AS dbw_values "
+            f"ON {table_identifier}.{id_key} = dbw_values.dbw_id SET {set_clause}"
+        )
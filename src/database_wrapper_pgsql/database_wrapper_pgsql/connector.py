@@ -8,11 +8,12 @@ from psycopg import AsyncCursor as PgCursorAsync
 from psycopg import AsyncTransaction, Transaction
 from psycopg import Connection as PgConnection  # Sync
 from psycopg import Cursor as PgCursor
+from psycopg.rows import BaseRowFactory, RowMaker, no_result
 from psycopg.rows import DictRow as PgDictRow
 from psycopg.rows import dict_row as PgDictRowFactory
 from psycopg_pool import AsyncConnectionPool, ConnectionPool
 
-from database_wrapper import DatabaseBackend
+from database_wrapper import DatabaseBackend, DataModelType
 
 PgConnectionType = PgConnection[PgDictRow]
 PgCursorType = PgCursor[PgDictRow]
@@ -21,6 +22,29 @@ PgConnectionTypeAsync = PgConnectionAsync[PgDictRow]
 PgCursorTypeAsync = PgCursorAsync[PgDictRow]
 
 
+def PgModelRowFactory(
+    model_class: type[DataModelType],
+) -> BaseRowFactory[DataModelType]:
+    """
+    Creates a row factory that returns rows as `model_class` instances.
+    The row maker is built once per result from `cursor.description`.
+
+    Args:
+        model_class (type[DataModelType]): The data model class to create.
+
+    Returns:
+        BaseRowFactory[DataModelType]: The row factory, usable with sync and async cursors.
+    """
+
+    def factory(cursor: Any) -> RowMaker[DataModelType]:
+        if not cursor.description:
+            return no_result
+
+        return model_class.row_maker([column.name for column in cursor.description])
+
+    return factory
+
+
 class PgsqlConfig(TypedDict):
     hostname: str
     port: NotRequired[int]
@@ -1,11 +1,13 @@
 import logging
+from collections.abc import Generator, Iterable, Sequence
 from typing import Any
 
 from psycopg import Cursor, sql
+from psycopg.rows import tuple_row as PgTupleRowFactory
 
-from database_wrapper import DBWrapper
+from database_wrapper import ColumnItem, DataModelType, DBWrapper, OrderByItem
 
-from .connector import PgCursorType
+from .connector import PgCursorType, PgDictRowFactory, PgModelRowFactory
 from .db_wrapper_pgsql_mixin import DBWrapperPgsqlMixin
 
 
@@ -68,3 +70,150 @@ class DBWrapperPgsql(DBWrapperPgsqlMixin, DBWrapper):
         """
         query_string = query.as_string(self.db_cursor)
         logging.getLogger().debug(f"Query: {query_string} with params: {params}")
+
+    def _new_tuple_cursor(self) -> Cursor[tuple[Any, ...]]:
+        assert self.db_cursor, "Cursor is not initialized"
+        return self.db_cursor.connection.cursor(row_factory=PgTupleRowFactory)
+
+    def _new_model_cursor(self, model_class: type[DataModelType]) -> Cursor[DataModelType]:
+        assert self.db_cursor, "Cursor is not initialized"
+        return self.db_cursor.connection.cursor(row_factory=PgModelRowFactory(model_class))
+
+    #####################
+    ### Query methods ###
+    #####################
+
+    def get_filtered_stream(
+        self,
+        empty_data_class: DataModelType,
+        filter: dict[str, Any] | None = None,
+        order_by: OrderByItem | None = None,
+        offset: int = 0,
+        limit: int = 0,
+        custom_query: Any = None,
+        itersize: int = 2000,
+        columns: Sequence[ColumnItem] | None = None,
+    ) -> Generator[DataModelType, None, None]:
+        """
+        Retrieves records through a server-side (named) cursor.
+        Rows are fetched from the server `itersize` rows at a time,
+        so memory use does not depend on the size of the result.
+
+        The cursor lives in a transaction (or a savepoint, if a transaction
+        is already open) on the connection of the current cursor,
+        so the connection can not be used for other queries while iterating.
+
+        Args:
+            empty_data_class (DataModelType): The data model to use for the query.
+            filter (dict[str, Any] | None, optional): The filter to apply. Defaults to None.
+            order_by (OrderByItem | None, optional): The order by item to use for sorting. Defaults to None.
+            offset (int, optional): The number of results to skip. Defaults to 0.
+            limit (int, optional): The maximum number of results to return, 0 for all. Defaults to 0.
+            custom_query (Any, optional): The custom query to use for the query. Defaults to None.
+            itersize (int, optional): The number of rows to fetch from the server at once. Defaults to 2000.
+            columns (Sequence[ColumnItem] | None, optional): The columns to select, see `DBDataModel.select_columns`.
+                Defaults to None.
+
+        Returns:
+            Generator[DataModelType, None, None]: The result of the query.
+        """
+        assert self.db_cursor, "Cursor is not initialized"
+
+        (query_sql, _params) = self._format_select_query(
+            empty_data_class,
+            filter,
+            order_by,
+            offset,
+            limit,
+            custom_query,
+            columns=columns,
+        )
+
+        # Named cursors only live inside a transaction
+        connection = self.db_cursor.connection
+        with connection.transaction():
+            with connection.cursor(name=self.server_cursor_name(), row_factory=PgDictRowFactory) as cursor:
+                cursor.itersize = itersize
+
+                # Log
+                self.log_query(cursor, query_sql, _params)
+
+                # Execute the query
+                cursor.execute(query_sql, _params)
+
+                model_class = empty_data_class.__class__
+                for rows in self._fetch_batches(cursor, itersize):
+                    for row in rows:
+                        yield self.turn_data_into_model(model_class, row)
+
+    def _iter_many_temp_table(
+        self,
+        empty_data_class: DataModelType,
+        ids: list[Any],
+        id_key: str,
+        columns: Sequence[ColumnItem] | None = None,
+    ) -> Generator[list[DataModelType], None, None]:
+        assert self.db_cursor, "Cursor is not initialized"
+        (create_query, copy_query, condition) = self._format_many_temp_table(empty_data_class, id_key)
+        (query_sql, _params) = self._format_select_query(
+            empty_data_class,
+            limit=0,
+            condition=condition,
+            columns=columns,
+        )
+
+        # Temporary table lives until the end of the transaction
+        with self.db_cursor.connection.transaction():
+            self.log_query(self.db_cursor, create_query, tuple())
+            self.db_cursor.execute(create_query)
+
+            with self.db_cursor.copy(copy_query) as copy:
+                for id_value in ids:
+                    copy.write_row((id_value,))
+
+            yield from self._iter_query_batches(empty_data_class.__class__, query_sql, _params, len(ids))
+
+    def bulk_load(self, records: Iterable[DataModelType], binary: bool | None = None) -> int:
+        """
+        Stores records in the database with COPY FROM STDIN, the fastest way to load many rows.
+
+        Records are streamed to the server, so a generator is loaded with bounded memory.
+        All records are stored in the table of the first record and must have the same store columns.
+        If `binary` is not set, the binary format is used when the `db_field` types of all columns allow it.
+        In the binary format every value is checked against the type of its column,
+        a value that does not fit raises a ValueError. Ids of the new rows are not returned.
+
+        Args:
+            records (Iterable[DataModelType]): The records to store.
+            binary (bool | None, optional): Use the binary COPY format. Defaults to None.
+
+        Returns:
+            int: The number of stored rows.
+        """
+        assert self.db_cursor, "Cursor is not initialized"
+
+        iterator = iter(records)
+        first = next(iterator, None)
+        if first is None:
+            return 0
+
+        store_data = first.store_data()
+        if not store_data:
+            raise ValueError("Record has no data to store")
+
+        columns = tuple(store_data.keys())
+        (copy_query, types) = self._format_copy_query(first, store_data, binary)
+
+        # Log
+        self.log_query(self.db_cursor, copy_query, tuple())
+
+        # Load
+        with self.db_cursor.copy(copy_query) as copy:
+            if types is not None:
+                copy.set_types(types)
+
+            copy.write_row(self._copy_row(first, columns, types))
+            for record in iterator:
+                copy.write_row(self._copy_row(record, columns, types))
+
+        return self.db_cursor.rowcount
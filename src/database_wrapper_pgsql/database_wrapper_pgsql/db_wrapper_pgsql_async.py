@@ -1,11 +1,15 @@
+import asyncio
 import logging
+from collections.abc import AsyncGenerator, AsyncIterable, Iterable, Sequence
+from contextlib import AsyncExitStack
 from typing import Any
 
-from psycopg import sql
+from psycopg import AsyncCursor, pq, sql
+from psycopg.rows import tuple_row as PgTupleRowFactory
 
-from database_wrapper import DBWrapperAsync
+from database_wrapper import ColumnItem, DataModelType, DBWrapperAsync, OrderByItem
 
-from .connector import PgCursorTypeAsync
+from .connector import PgCursorTypeAsync, PgDictRowFactory, PgModelRowFactory, PgsqlWithPoolingAsync
 from .db_wrapper_pgsql_mixin import DBWrapperPgsqlMixin
 
 
@@ -72,3 +76,387 @@ class DBWrapperPgsqlAsync(DBWrapperPgsqlMixin, DBWrapperAsync):
         """
         query_string = query.as_string(self.db_cursor)
         logging.getLogger().debug(f"Query: {query_string} with params: {params}")
+
+    def _new_tuple_cursor(self) -> AsyncCursor[tuple[Any, ...]]:
+        assert self.db_cursor, "Cursor is not initialized"
+        return self.db_cursor.connection.cursor(row_factory=PgTupleRowFactory)
+
+    def _new_model_cursor(self, model_class: type[DataModelType]) -> AsyncCursor[DataModelType]:
+        assert self.db_cursor, "Cursor is not initialized"
+        return self.db_cursor.connection.cursor(row_factory=PgModelRowFactory(model_class))
+
+    #####################
+    ### Query methods ###
+    #####################
+
+    async def get_filtered_stream(
+        self,
+        empty_data_class: DataModelType,
+        filter: dict[str, Any] | None = None,
+        order_by: OrderByItem | None = None,
+        offset: int = 0,
+        limit: int = 0,
+        custom_query: Any = None,
+        itersize: int = 2000,
+        columns: Sequence[ColumnItem] | None = None,
+        prefetch: int = 0,
+    ) -> AsyncGenerator[DataModelType, None]:
+        """
+        Retrieves records through a server-side (named) cursor.
+        Rows are fetched from the server `itersize` rows at a time,
+        so memory use does not depend on the size of the result.
+
+        The cursor lives in a transaction (or a savepoint, if a transaction
+        is already open) on the connection of the current cursor,
+        so the connection can not be used for other queries while iterating.
+
+        Args:
+            empty_data_class (DataModelType): The data model to use for the query.
+            filter (dict[str, Any] | None, optional): The filter to apply. Defaults to None.
+            order_by (OrderByItem | None, optional): The order by item to use for sorting. Defaults to None.
+            offset (int, optional): The number of results to skip. Defaults to 0.
+            limit (int, optional): The maximum number of results to return, 0 for all. Defaults to 0.
+            custom_query (Any, optional): The custom query to use for the query. Defaults to None.
+            itersize (int, optional): The number of rows to fetch from the server at once. Defaults to 2000.
+            columns (Sequence[ColumnItem] | None, optional): The columns to select, see `DBDataModel.select_columns`.
+                Defaults to None.
+            prefetch (int, optional): The number of batches to read ahead in the background,
+                while the caller processes the current one, see `DBWrapperAsync._prefetch_batches`.
+                0 disables it. Defaults to 0.
+
+        Returns:
+            AsyncGenerator[DataModelType, None]: The result of the query.
+        """
+        assert self.db_cursor, "Cursor is not initialized"
+
+        (query_sql, _params) = self._format_select_query(
+            empty_data_class,
+            filter,
+            order_by,
+            offset,
+            limit,
+            custom_query,
+            columns=columns,
+        )
+
+        # Named cursors only live inside a transaction
+        connection = self.db_cursor.connection
+        async with connection.transaction():
+            async with connection.cursor(name=self.server_cursor_name(), row_factory=PgDictRowFactory) as cursor:
+                cursor.itersize = itersize
+
+                # Log
+                self.log_query(cursor, query_sql, _params)
+
+                # Execute the query
+                await cursor.execute(query_sql, _params)
+
+                batches = self._fetch_batches(cursor, itersize)
+                if prefetch:
+                    batches = self._prefetch_batches(batches, prefetch)
+
+                model_class = empty_data_class.__class__
+                async for rows in batches:
+                    for row in rows:
+                        yield self.turn_data_into_model(model_class, row)
+
+    async def parallel_scan(
+        self,
+        empty_data_class: DataModelType,
+        db_pool: PgsqlWithPoolingAsync,
+        partitions: int = 4,
+        filter: dict[str, Any] | None = None,
+        partition_key: str = "ctid",
+        columns: Sequence[ColumnItem] | None = None,
+        itersize: int = 2000,
+        queue_size: int | None = None,
+    ) -> AsyncGenerator[DataModelType, None]:
+        """
+        Scans a table in parallel, split into ranges that are each streamed on their own pooled connection.
+        All ranges read from one snapshot, exported from the connection of this wrapper,
+        so the result is consistent as if it was read by a single query.
+
+        Records are returned in the order they arrive, not sorted.
+        The scan queries the table of the data model, so data models with a `query_base` are not supported.
+        If a transaction is already open on the connection of this wrapper, the snapshot
+        is exported from it, otherwise a REPEATABLE READ transaction is opened for the scan.
+
+        Args:
+            empty_data_class (DataModelType): The data model to use for the query.
+            db_pool (PgsqlWithPoolingAsync): The pool to take a connection per range from,
+                it needs room for `partitions` connections.
+            partitions (int, optional): The number of ranges to scan in parallel. Defaults to 4.
+            filter (dict[str, Any] | None, optional): The filter to apply. Defaults to None.
+            partition_key (str, optional): "ctid" splits the table into block ranges (fast on PostgreSQL 14+),
+                otherwise the name of an integer column, like the primary key, to split by value. Defaults to "ctid".
+            columns (Sequence[ColumnItem] | None, optional): The columns to select, see `DBDataModel.select_columns`.
+                Defaults to None.
+            itersize (int, optional): The number of rows to fetch at once per range. Defaults to 2000.
+            queue_size (int | None, optional): The maximum number of fetched batches waiting for the caller,
+                twice the number of partitions if not set. Defaults to None.
+
+        Returns:
+            AsyncGenerator[DataModelType, None]: The result of the scan.
+        """
+        assert self.db_cursor, "Cursor is not initialized"
+        if partitions < 1:
+            raise ValueError("Partitions must be greater than 0")
+        if empty_data_class.query_base() is not None:
+            raise ValueError("Parallel scan does not support data models with a query base")
+
+        model_class = empty_data_class.__class__
+        queue: asyncio.Queue[list[DataModelType] | BaseException | None] = asyncio.Queue(
+            maxsize=queue_size or partitions * 2
+        )
+
+        async def scan_range(snapshot: str, condition: tuple[Any, tuple[Any, ...]]) -> None:
+            res = await db_pool.new_connection()
+            if not res:
+                raise RuntimeError("Could not get a connection from the pool")
+
+            (connection, pool_cursor) = res
+            try:
+                # Snapshot can only be imported as the first statement of the transaction
+                async with connection.transaction():
+                    await pool_cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+                    await pool_cursor.execute(sql.SQL("SET TRANSACTION SNAPSHOT {}").format(sql.Literal(snapshot)))
+
+                    (query_sql, _params) = self._format_select_query(
+                        empty_data_class,
+                        filter,
+                        limit=0,
+                        condition=condition,
+                        columns=columns,
+                    )
+                    cursor_name = self.server_cursor_name()
+                    async with connection.cursor(name=cursor_name, row_factory=PgDictRowFactory) as cursor:
+                        cursor.itersize = itersize
+
+                        # Log
+                        self.log_query(cursor, query_sql, _params)
+
+                        # Execute the query
+                        await cursor.execute(query_sql, _params)
+
+                        async for rows in self._fetch_batches(cursor, itersize):
+                            await queue.put([self.turn_data_into_model(model_class, row) for row in rows])
+            finally:
+                await pool_cursor.close()
+                await db_pool.return_connection(connection)
+
+        async def run_range(snapshot: str, condition: tuple[Any, tuple[Any, ...]]) -> None:
+            try:
+                await scan_range(snapshot, condition)
+            except Exception as e:
+                await queue.put(e)
+                return
+
+            await queue.put(None)
+
+        # The exported snapshot stays valid while this transaction is open.
+        # Snapshots can not be exported from a savepoint, so an open transaction is used as is
+        connection = self.db_cursor.connection
+        async with AsyncExitStack() as transaction_stack:
+            if connection.info.transaction_status == pq.TransactionStatus.IDLE:
+                await transaction_stack.enter_async_context(connection.transaction())
+                await self.db_cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+            await self.db_cursor.execute("SELECT pg_export_snapshot() AS snapshot")
+            snapshot_row = await self.db_cursor.fetchone()
+            assert snapshot_row, "Snapshot was not exported"
+            snapshot = snapshot_row["snapshot"]
+
+            bounds_query = self._format_scan_bounds_query(empty_data_class, partition_key)
+            self.log_query(self.db_cursor, bounds_query, tuple())
+            await self.db_cursor.execute(bounds_query)
+            bounds = await self.db_cursor.fetchone()
+            assert bounds, "Scan bounds were not returned"
+            conditions = self._format_scan_ranges(partition_key, bounds["low"], bounds["high"], partitions)
+
+            tasks = [asyncio.create_task(run_range(snapshot, condition)) for condition in conditions]
+            try:
+                remaining = len(tasks)
+                while remaining:
+                    item = await queue.get()
+                    if item is None:
+                        remaining -= 1
+                        continue
+                    if isinstance(item, BaseException):
+                        raise item
+
+                    for record in item:
+                        yield record
+            finally:
+                # Stops the other ranges if one fails or the caller stops early
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def parallel_insert(
+        self,
+        records: list[DataModelType],
+        db_pool: PgsqlWithPoolingAsync,
+        concurrency: int | None = None,
+        batch_size: int | None = None,
+    ) -> list[tuple[int, int]]:
+        """
+        Stores a list of records with multi-row INSERTs that run in parallel on pooled connections.
+
+        Records are split into chunks like in `insert`, and up to `concurrency` workers each take
+        a connection from the pool and store chunks from the list until none are left.
+        Every chunk is stored in its own transaction, so when a chunk fails the other workers
+        are stopped and the error is raised, while the chunks that were already stored stay committed.
+        The ids of the new rows are set on the records.
+
+        Args:
+            records (list[DataModelType]): The records to store.
+            db_pool (PgsqlWithPoolingAsync): The pool to take a connection per worker from.
+            concurrency (int | None, optional): The maximum number of chunks stored at the same time,
+                `maxconnections` of the pool if not set. Defaults to None.
+            batch_size (int | None, optional): Maximum number of records in a single INSERT.
+                Defaults to `insert_batch_size`.
+
+        Returns:
+            list[tuple[int, int]]: The id and the number of affected rows of each record, in input order.
+        """
+        if concurrency is None:
+            concurrency = db_pool.config["maxconnections"]
+        if concurrency < 1:
+            raise ValueError("Concurrency must be greater than 0")
+
+        status: list[tuple[int, int] | None] = [None] * len(records)
+        chunks = self._record_chunks(
+            records,
+            lambda record: record.store_data(),
+            self.insert_batch_size if batch_size is None else batch_size,
+            max_params=self.max_query_params,
+        )
+
+        # Workers take the next chunk from the shared iterator, the event loop runs one at a time
+        pending = iter(chunks)
+
+        async def run_worker() -> None:
+            res = await db_pool.new_connection()
+            if not res:
+                raise RuntimeError("Could not get a connection from the pool")
+
+            (connection, pool_cursor) = res
+            try:
+                wrapper = self.__class__(pool_cursor, self.logger)
+                for chunk in pending:
+                    (_, row, _) = chunk[0]
+                    async with connection.transaction():
+                        results = await wrapper._insert_many(
+                            row,
+                            row.schema_name,
+                            row.table_name,
+                            [item[2] for item in chunk],
+                            row.id_key,
+                        )
+
+                    for (position, record, _), result in zip(chunk, results, strict=True):
+                        setattr(record, record.id_key, result[0])  # update the id of the row
+                        if record._track_changes:
+                            record.mark_clean()
+                        status[position] = result
+            finally:
+                await pool_cursor.close()
+                await db_pool.return_connection(connection)
+
+        tasks = [asyncio.create_task(run_worker()) for _ in range(min(concurrency, len(chunks)))]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # Stops the other workers if one fails or the caller is cancelled
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        return [res for res in status if res is not None]
+
+    async def _iter_many_temp_table(
+        self,
+        empty_data_class: DataModelType,
+        ids: list[Any],
+        id_key: str,
+        columns: Sequence[ColumnItem] | None = None,
+    ) -> AsyncGenerator[list[DataModelType], None]:
+        assert self.db_cursor, "Cursor is not initialized"
+        (create_query, copy_query, condition) = self._format_many_temp_table(empty_data_class, id_key)
+        (query_sql, _params) = self._format_select_query(
+            empty_data_class,
+            limit=0,
+            condition=condition,
+            columns=columns,
+        )
+
+        # Temporary table lives until the end of the transaction
+        async with self.db_cursor.connection.transaction():
+            self.log_query(self.db_cursor, create_query, tuple())
+            await self.db_cursor.execute(create_query)
+
+            async with self.db_cursor.copy(copy_query) as copy:
+                for id_value in ids:
+                    await copy.write_row((id_value,))
+
+            async for batch in self._iter_query_batches(empty_data_class.__class__, query_sql, _params, len(ids)):
+                yield batch
+
+    async def bulk_load(
+        self,
+        records: Iterable[DataModelType] | AsyncIterable[DataModelType],
+        binary: bool | None = None,
+    ) -> int:
+        """
+        Stores records in the database with COPY FROM STDIN, the fastest way to load many rows.
+
+        Records are streamed to the server, so a generator is loaded with bounded memory.
+        All records are stored in the table of the first record and must have the same store columns.
+        If `binary` is not set, the binary format is used when the `db_field` types of all columns allow it.
+        In the binary format every value is checked against the type of its column,
+        a value that does not fit raises a ValueError. Ids of the new rows are not returned.
+
+        Args:
+            records (Iterable[DataModelType] | AsyncIterable[DataModelType]): The records to store.
+            binary (bool | None, optional): Use the binary COPY format. Defaults to None.
+
+        Returns:
+            int: The number of stored rows.
+        """
+        assert self.db_cursor, "Cursor is not initialized"
+
+        iterator = self._aiter_records(records)
+        first = await anext(iterator, None)
+        if first is None:
+            return 0
+
+        store_data = first.store_data()
+        if not store_data:
+            raise ValueError("Record has no data to store")
+
+        columns = tuple(store_data.keys())
+        (copy_query, types) = self._format_copy_query(first, store_data, binary)
+
+        # Log
+        self.log_query(self.db_cursor, copy_query, tuple())
+
+        # Load
+        async with self.db_cursor.copy(copy_query) as copy:
+            if types is not None:
+                copy.set_types(types)
+
+            await copy.write_row(self._copy_row(first, columns, types))
+            async for record in iterator:
+                await copy.write_row(self._copy_row(record, columns, types))
+
+        return self.db_cursor.rowcount
+
+    async def _aiter_records(
+        self,
+        records: Iterable[DataModelType] | AsyncIterable[DataModelType],
+    ) -> AsyncGenerator[DataModelType, None]:
+        if isinstance(records, AsyncIterable):
+            async for record in records:
+                yield record
+        else:
+            for record in records:
+                yield record
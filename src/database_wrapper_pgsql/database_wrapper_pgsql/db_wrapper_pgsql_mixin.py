@@ -1,8 +1,50 @@
-from typing import Any
+import datetime
+import uuid
+from collections.abc import Sequence
+from decimal import Decimal
+from typing import Any, cast
 
 from psycopg import sql
 
-from database_wrapper import NoParam, OrderByItem
+from database_wrapper import ColumnItem, DBDataModel, MetadataDict, NoParam, OrderByItem
+
+# Column types that `bulk_load` can send in the binary COPY format, with the Python types they accept
+COPY_BINARY_TYPES: dict[str, tuple[type, ...]] = {
+    "smallint": (int,),
+    "int2": (int,),
+    "integer": (int,),
+    "int": (int,),
+    "int4": (int,),
+    "bigint": (int,),
+    "int8": (int,),
+    "real": (int, float),
+    "float4": (int, float),
+    "double precision": (int, float),
+    "float8": (int, float),
+    "numeric": (int, Decimal),
+    "boolean": (bool,),
+    "bool": (bool,),
+    "text": (str,),
+    "varchar": (str,),
+    "character varying": (str,),
+    "uuid": (uuid.UUID,),
+    "bytea": (bytes,),
+    "date": (datetime.date,),
+    "timestamp": (datetime.datetime,),
+    "timestamptz": (datetime.datetime,),
+    "timestamp with time zone": (datetime.datetime,),
+}
+
+# Bits of the integer column types, the binary COPY format does not check values for overflow
+COPY_BINARY_INT_BITS: dict[str, int] = {
+    "smallint": 16,
+    "int2": 16,
+    "integer": 32,
+    "int": 32,
+    "int4": 32,
+    "bigint": 64,
+    "int8": 64,
+}
 
 
 class DBWrapperPgsqlMixin:
@@ -10,6 +52,12 @@ class DBWrapperPgsqlMixin:
     Mixin for providing methods that can be used by both sync and async versions of the DBWrapperPgsql class.
     """
 
+    max_query_params: int = 65535
+    """ PostgreSQL allows 65535 parameters per query """
+
+    many_temp_table_threshold: int = 100_000
+    """ Number of ids from which `get_many` loads the ids into a temporary table with COPY """
+
     ######################
     ### Helper methods ###
     ######################
@@ -29,6 +77,15 @@ class DBWrapperPgsqlMixin:
 
         return sql.Identifier(name)
 
+    def server_cursor_name(self) -> str:
+        """
+        Creates a unique name for a server-side (named) cursor.
+
+        Returns:
+            str: The cursor name.
+        """
+        return f"dbw_cursor_{uuid.uuid4().hex}"
+
     #####################
     ### Query methods ###
     #####################
@@ -37,6 +94,7 @@ class DBWrapperPgsqlMixin:
         self,
         schema_name: str | None,
         table_name: str,
+        columns: Sequence[ColumnItem] | None = None,
     ) -> sql.SQL | sql.Composed | str:
         """
         Creates a SQL query to filter data from the given table.
@@ -44,14 +102,63 @@ class DBWrapperPgsqlMixin:
         Args:
             schema_name (str): The name of the schema to filter data from.
             table_name (str): The name of the table to filter data from.
+            columns (Sequence[ColumnItem] | None, optional): The columns to select, all if not set. Defaults to None.
 
         Returns:
             sql.SQL | sql.Composed: The created SQL query object.
         """
-        return sql.SQL("SELECT * FROM {table}").format(
+        return sql.SQL("SELECT {columns} FROM {table}").format(
+            columns=self.columns_query(columns),
             table=self.make_identifier(schema_name, table_name),
         )
 
+    def columns_query(self, columns: Sequence[ColumnItem] | None = None) -> sql.Composable:
+        """
+        Creates the select list for the given columns.
+        JSON sub-paths are selected with the -> operator, e.g. "settings->theme" becomes
+        "settings"->'theme' AS "theme", numeric keys index arrays.
+
+        Args:
+            columns (Sequence[ColumnItem] | None, optional): The columns to select, all if not set. Defaults to None.
+
+        Returns:
+            sql.Composable: The created select list.
+        """
+        if not columns:
+            return sql.SQL("*")
+
+        select_list: list[sql.Composable] = []
+        for item in columns:
+            (column, alias) = self.split_column_item(item)
+            (name, *path) = [part.strip() for part in column.split("->")]
+
+            expression: sql.Composable = sql.Identifier(name)
+            if path:
+                keys = [sql.Literal(int(key)) if key.isdigit() else sql.Literal(key) for key in path]
+                expression = sql.SQL("->").join([expression, *keys])
+
+            if path or name != alias:
+                expression = sql.SQL("{expression} AS {alias}").format(
+                    expression=expression,
+                    alias=sql.Identifier(alias),
+                )
+
+            select_list.append(expression)
+
+        return sql.SQL(", ").join(select_list)
+
+    def count_query(self, query: sql.SQL | sql.Composed | str) -> sql.Composed:
+        if isinstance(query, str):
+            query = sql.SQL(query)
+
+        return sql.SQL("SELECT count(*) AS count FROM ({query}) AS dbw_count").format(query=query)
+
+    def exists_query(self, query: sql.SQL | sql.Composed | str) -> sql.Composed:
+        if isinstance(query, str):
+            query = sql.SQL(query)
+
+        return sql.SQL("SELECT EXISTS({query}) AS result").format(query=query)
+
     def order_query(
         self,
         order_by: OrderByItem | None = None,
@@ -106,6 +213,200 @@ class DBWrapperPgsqlMixin:
 
         return (_query, _params)
 
+    def _append_filter(
+        self,
+        q_filter: sql.Composable | None,
+        params: tuple[Any, ...],
+        condition: sql.Composable,
+        condition_params: tuple[Any, ...],
+    ) -> tuple[sql.Composed, tuple[Any, ...]]:
+        if q_filter is None:
+            return (sql.SQL("WHERE {condition}").format(condition=condition), condition_params)
+
+        return (
+            sql.SQL("{q_filter} AND ({condition})").format(q_filter=q_filter, condition=condition),
+            params + condition_params,
+        )
+
+    def _format_keyset_condition(
+        self,
+        order_by: list[tuple[str, str]],
+        values: list[Any],
+    ) -> tuple[sql.Composed, tuple[Any, ...]]:
+        # With a single sort direction, a row comparison lets PostgreSQL seek on a multicolumn index
+        directions = {direction for (_, direction) in order_by}
+        if len(directions) == 1:
+            operator = sql.SQL(">" if "ASC" in directions else "<")
+            if len(order_by) == 1:
+                condition = sql.SQL("{column} {operator} %s").format(
+                    column=sql.Identifier(order_by[0][0]),
+                    operator=operator,
+                )
+            else:
+                condition = sql.SQL("({columns}) {operator} ({values})").format(
+                    columns=sql.SQL(", ").join(sql.Identifier(column) for (column, _) in order_by),
+                    operator=operator,
+                    values=sql.SQL(", ").join(sql.Placeholder() * len(order_by)),
+                )
+            return (condition, tuple(values))
+
+        parts: list[sql.Composable] = []
+        params: list[Any] = []
+        for index, (column, direction) in enumerate(order_by):
+            part = [sql.SQL("{} = %s").format(sql.Identifier(prev_column)) for (prev_column, _) in order_by[:index]]
+            part.append(
+                sql.SQL("{} {} %s").format(
+                    sql.Identifier(column),
+                    sql.SQL(">" if direction == "ASC" else "<"),
+                )
+            )
+            parts.append(sql.SQL("({})").format(sql.SQL(" AND ").join(part)))
+            params.extend(values[: index + 1])
+
+        return (sql.SQL(" OR ").join(parts), tuple(params))
+
+    def _format_many_query(
+        self,
+        empty_data_class: DBDataModel,
+        ids: list[Any],
+        id_key: str,
+        columns: Sequence[ColumnItem] | None = None,
+    ) -> tuple[Any, tuple[Any, ...]]:
+        # All ids are passed as a single array parameter
+        condition = sql.SQL("{key} = ANY(%s)").format(key=sql.Identifier(id_key))
+        return super()._format_select_query(
+            empty_data_class,
+            limit=0,
+            condition=(condition, (ids,)),
+            columns=columns,
+        )
+
+    def _many_chunk_size(self, chunk_size: int | None) -> int:
+        # A chunk is a single parameter, so without a chunk size all ids go into one query
+        if chunk_size is None:
+            return self.many_temp_table_threshold or self.max_query_params
+
+        return super()._many_chunk_size(chunk_size)
+
+    def _format_many_temp_table(
+        self,
+        empty_data_class: DBDataModel,
+        id_key: str,
+    ) -> tuple[sql.Composed, sql.Composed, tuple[sql.Composed, tuple[Any, ...]]]:
+        """
+        Creates the queries to load ids into a temporary table, see `get_many`.
+        The id column copies its type from the id key of the table, the table is dropped on commit.
+
+        Args:
+            empty_data_class (DBDataModel): The data model to use for the query.
+            id_key (str): The name of the key to match the ids against.
+
+        Returns:
+            tuple[sql.Composed, sql.Composed, tuple[sql.Composed, tuple[Any, ...]]]: The create table query,
+                the COPY query and the condition to select the matching records with.
+        """
+        temp_table = sql.Identifier(f"dbw_ids_{uuid.uuid4().hex}")
+        create_query = sql.SQL(
+            "CREATE TEMPORARY TABLE {temp_table} ON COMMIT DROP AS SELECT {key} AS id_value FROM {table} WITH NO DATA"
+        ).format(
+            temp_table=temp_table,
+            key=sql.Identifier(id_key),
+            table=self.make_identifier(empty_data_class.schema_name, empty_data_class.table_name),
+        )
+        copy_query = sql.SQL("COPY {temp_table} (id_value) FROM STDIN").format(temp_table=temp_table)
+        condition = sql.SQL("{key} IN (SELECT id_value FROM {temp_table})").format(
+            key=sql.Identifier(id_key),
+            temp_table=temp_table,
+        )
+
+        return (create_query, copy_query, (condition, tuple()))
+
+    def _format_scan_bounds_query(
+        self,
+        empty_data_class: DBDataModel,
+        partition_key: str,
+    ) -> sql.Composed:
+        """
+        Creates the query for the bounds to split a table scan into ranges, see `parallel_scan`.
+        For "ctid" it returns the number of blocks of the table, otherwise the min and max of the key.
+
+        Args:
+            empty_data_class (DBDataModel): The data model to use for the query.
+            partition_key (str): "ctid" or the name of an integer column.
+
+        Returns:
+            sql.Composed: The query, it returns "low" and "high".
+        """
+        table = self.make_identifier(empty_data_class.schema_name, empty_data_class.table_name)
+        if partition_key == "ctid":
+            table_name = sql.SQL("quote_ident({table})").format(table=sql.Literal(empty_data_class.table_name))
+            if empty_data_class.schema_name:
+                table_name = sql.SQL("quote_ident({schema}) || '.' || {table_name}").format(
+                    schema=sql.Literal(empty_data_class.schema_name),
+                    table_name=table_name,
+                )
+
+            return sql.SQL(
+                "SELECT 0 AS low, "
+                "pg_relation_size(({table_name})::regclass) / current_setting('block_size')::bigint AS high"
+            ).format(table_name=table_name)
+
+        return sql.SQL("SELECT min({key}) AS low, max({key}) + 1 AS high FROM {table}").format(
+            key=sql.Identifier(partition_key),
+            table=table,
+        )
+
+    def _format_scan_ranges(
+        self,
+        partition_key: str,
+        low: int | None,
+        high: int | None,
+        partitions: int,
+    ) -> list[tuple[sql.Composed, tuple[Any, ...]]]:
+        """
+        Splits [low, high) into up to `partitions` ranges and creates a condition for each of them.
+        The first range has no lower bound and the last one no upper bound, so that no rows are missed
+        when the bounds were read outside of the snapshot of the scan.
+
+        Args:
+            partition_key (str): "ctid" for block ranges or the name of an integer column.
+            low (int | None): The start of the range, None for an empty table.
+            high (int | None): The end of the range (exclusive), None for an empty table.
+            partitions (int): The number of ranges.
+
+        Returns:
+            list[tuple[sql.Composed, tuple[Any, ...]]]: The conditions and their parameters.
+        """
+        if low is None or high is None:
+            return [(sql.Composed([sql.SQL("TRUE")]), tuple())]
+
+        step = max(1, -(-(high - low) // partitions))
+        starts = list(range(low, max(high, low + 1), step))
+
+        if partition_key == "ctid":
+            # Block ranges are scanned with a TID range scan
+            column = sql.SQL("ctid")
+            cast = sql.SQL("::tid")
+        else:
+            column = sql.Identifier(partition_key)
+            cast = sql.SQL("")
+
+        conditions: list[tuple[sql.Composed, tuple[Any, ...]]] = []
+        for index, start in enumerate(starts):
+            parts: list[sql.Composed] = []
+            params: list[Any] = []
+            if index > 0:
+                parts.append(sql.SQL("{column} >= %s{cast}").format(column=column, cast=cast))
+                params.append(f"({start},0)" if partition_key == "ctid" else start)
+            if index < len(starts) - 1:
+                parts.append(sql.SQL("{column} < %s{cast}").format(column=column, cast=cast))
+                params.append(f"({start + step},0)" if partition_key == "ctid" else start + step)
+
+            condition = sql.SQL(" AND ").join(parts) if parts else sql.SQL("TRUE")
+            conditions.append((sql.Composed([condition]), tuple(params)))
+
+        return conditions
+
     def _format_filter_query(
         self,
         query: sql.SQL | sql.Composed | str,
@@ -144,6 +445,117 @@ class DBWrapperPgsqlMixin:
             id_key=return_key,
         )
 
+    def _format_insert_many_query(
+        self,
+        table_identifier: sql.Identifier | str,
+        columns: list[str],
+        rows_count: int,
+        return_key: sql.Identifier | str | None = None,
+    ) -> sql.Composed:
+        row_placeholder = "(" + ", ".join(["%s"] * len(columns)) + ")"
+        insert_query = sql.SQL("INSERT INTO {table} ({columns}) VALUES {rows}").format(
+            table=table_identifier,
+            columns=sql.SQL(", ").join(map(sql.Identifier, columns)),
+            rows=sql.SQL(", ".join([row_placeholder] * rows_count)),
+        )
+        if return_key is None:
+            return insert_query
+
+        return insert_query + sql.SQL(" RETURNING {id_key}").format(id_key=return_key)
+
+    def _format_insert_many_ordered_query(
+        self,
+        empty_data_class: DBDataModel,
+        table_identifier: sql.Identifier | str,
+        columns: list[str],
+        rows_count: int,
+        return_key: sql.Identifier | str,
+    ) -> sql.Composed:
+        # The first row is cast to the column types, otherwise string parameters make the VALUES columns text
+        first_row = sql.SQL(", ").join(
+            sql.SQL("CAST(%s AS {column_type})").format(column_type=sql.SQL(column_type))
+            if column_type
+            else sql.Placeholder()
+            for column_type in (self._column_type(empty_data_class, column) for column in columns)
+        )
+        # The other rows are a single SQL string, composing them one by one is slow for large batches
+        row = ", ".join(["%s"] * len(columns))
+        rows = [sql.SQL("(0, {row})").format(row=first_row)]
+        if rows_count > 1:
+            rows.append(sql.SQL(", ".join(f"({index}, {row})" for index in range(1, rows_count))))
+
+        columns_list = sql.SQL(", ").join(map(sql.Identifier, columns))
+        return sql.SQL(
+            "WITH dbw_values (dbw_row, {columns}) AS (VALUES {rows}) "
+            "INSERT INTO {table} ({columns}) SELECT {columns} FROM dbw_values ORDER BY dbw_row RETURNING {id_key}"
+        ).format(
+            table=table_identifier,
+            columns=columns_list,
+            rows=sql.SQL(", ").join(rows),
+            id_key=return_key,
+        )
+
+    def _format_upsert_query(
+        self,
+        table_identifier: sql.Identifier | str,
+        columns: list[str],
+        rows_count: int,
+        conflict_keys: Sequence[str],
+        update_columns: list[str],
+        return_key: sql.Identifier | str,
+    ) -> sql.Composed:
+        insert_query = self._format_insert_many_query(table_identifier, columns, rows_count)
+        set_clause = sql.SQL(", ").join(
+            sql.SQL("{column} = EXCLUDED.{column}").format(column=sql.Identifier(column)) for column in update_columns
+        )
+        return insert_query + sql.SQL(
+            " ON CONFLICT ({conflict_keys}) DO UPDATE SET {set_clause} RETURNING {id_key}, {conflict_keys}"
+        ).format(
+            conflict_keys=sql.SQL(", ").join(map(sql.Identifier, conflict_keys)),
+            set_clause=set_clause,
+            id_key=return_key,
+        )
+
+    def _format_update_many_query(
+        self,
+        empty_data_class: DBDataModel,
+        table_identifier: sql.Identifier | str,
+        id_key: str,
+        columns: list[str],
+        rows_count: int,
+    ) -> sql.Composed:
+        # The first row is cast to the column types, otherwise string parameters make the VALUES columns text
+        first_row = sql.SQL(", ").join(
+            sql.SQL("CAST(%s AS {column_type})").format(column_type=sql.SQL(column_type))
+            if column_type
+            else sql.Placeholder()
+            for column_type in (self._column_type(empty_data_class, column) for column in (id_key, *columns))
+        )
+        # The other rows are a single SQL string, composing them one by one is slow for large batches
+        row = "(" + ", ".join(["%s"] * (len(columns) + 1)) + ")"
+        rows = [sql.SQL("({row})").format(row=first_row)]
+        if rows_count > 1:
+            rows.append(sql.SQL(", ".join([row] * (rows_count - 1))))
+
+        set_clause = sql.SQL(", ").join(
+            sql.SQL("{column} = {value}").format(
+                column=sql.Identifier(column),
+                value=sql.Identifier("dbw_values", f"column{index}"),
+            )
+            for index, column in enumerate(columns, 2)
+        )
+        id_column = sql.SQL("{table}.{id_key}").format(table=table_identifier, id_key=sql.Identifier(id_key))
+
+        return sql.SQL(
+            "UPDATE {table} SET {set_clause} FROM (VALUES {rows}) AS dbw_values "
+            "WHERE {id_column} = dbw_values.column1 RETURNING {id_column}"
+        ).format(
+            table=table_identifier,
+            set_clause=set_clause,
+            rows=sql.SQL(", ").join(rows),
+            id_column=id_column,
+        )
+
     def _format_update_query(
         self,
         table_identifier: sql.Identifier | str,
@@ -158,6 +570,19 @@ class DBWrapperPgsqlMixin:
             id_key=update_key,
         )
 
+    def _format_delete_many_query(
+        self,
+        table_identifier: sql.Identifier | str,
+        id_key: str,
+        ids: list[Any],
+    ) -> tuple[sql.Composed, tuple[Any, ...]]:
+        # All ids are passed as a single array parameter
+        delete_query = sql.SQL("DELETE FROM {table} WHERE {id_key} = ANY(%s) RETURNING {id_key}").format(
+            table=table_identifier,
+            id_key=sql.Identifier(id_key),
+        )
+        return (delete_query, (ids,))
+
     def _format_delete_query(
         self,
         table_identifier: sql.Identifier | str,
@@ -167,3 +592,148 @@ class DBWrapperPgsqlMixin:
             table=table_identifier,
             id_key=delete_key,
         )
+
+    def _format_copy_query(
+        self,
+        record: DBDataModel,
+        store_data: dict[str, Any],
+        binary: bool | None = None,
+    ) -> tuple[sql.Composed, list[str] | None]:
+        """
+        Creates the COPY FROM STDIN query to load records like the given one, see `bulk_load`.
+
+        Args:
+            record (DBDataModel): The first record to load.
+            store_data (dict[str, Any]): The store data of the record.
+            binary (bool | None, optional): Use the binary format, decided from the `db_field` types
+                of the columns if not set. Defaults to None.
+
+        Returns:
+            tuple[sql.Composed, list[str] | None]: The COPY query and the column types to set on the copy
+                for the binary format, None for the text format.
+        """
+        types = self._copy_binary_types(record, tuple(store_data.keys()))
+        if binary and types is None:
+            raise ValueError("Binary COPY is not supported for the column types of the record")
+        if binary is False:
+            types = None
+
+        copy_query = sql.SQL("COPY {table} ({columns}) FROM STDIN").format(
+            table=self.make_identifier(record.schema_name, record.table_name),
+            columns=sql.SQL(", ").join(map(sql.Identifier, store_data.keys())),
+        )
+        if types is not None:
+            copy_query += sql.SQL(" (FORMAT BINARY)")
+
+        return (copy_query, types)
+
+    def _copy_binary_types(self, record: DBDataModel, columns: tuple[str, ...]) -> list[str] | None:
+        """
+        Column types to load the columns with in the binary COPY format, see `bulk_load`.
+        The types come from the `db_field` metadata of the fields, not from the values.
+
+        Args:
+            record (DBDataModel): The record.
+            columns (tuple[str, ...]): The columns of the COPY query.
+
+        Returns:
+            list[str] | None: The column types, None if a column has no supported type or is serialized.
+        """
+        fields = record.__dataclass_fields__
+        types: list[str] = []
+        for column in columns:
+            metadata = cast(MetadataDict, fields[column].metadata)
+            if metadata.get("serialize") is not None:
+                return None
+
+            column_type = (self._column_type(record, column) or "").lower()
+            if column_type not in COPY_BINARY_TYPES:
+                return None
+
+            types.append(column_type)
+
+        return types
+
+    def _copy_binary_value_fits(self, column_type: str, value: Any) -> bool:
+        """
+        Checks if a value can be sent as the given column type in the binary COPY format.
+        Unlike the text format, the binary dumpers do not reject some values that do not fit,
+        they store a wrong value, like a datetime in a date column or an overflowing integer.
+
+        Args:
+            column_type (str): The column type, a key of `COPY_BINARY_TYPES`.
+            value (Any): The value.
+
+        Returns:
+            bool: True if the value fits the column type.
+        """
+        if value is None:
+            return True
+
+        python_types = COPY_BINARY_TYPES[column_type]
+        if isinstance(value, bool) and bool not in python_types:
+            return False
+        if not isinstance(value, python_types):
+            return False
+
+        if column_type in COPY_BINARY_INT_BITS:
+            limit = 1 << (COPY_BINARY_INT_BITS[column_type] - 1)
+            return -limit <= value < limit
+        if column_type == "date":
+            return not isinstance(value, datetime.datetime)
+        if column_type == "timestamp":
+            return value.tzinfo is None
+        if column_type in ("timestamptz", "timestamp with time zone"):
+            return value.tzinfo is not None
+
+        return True
+
+    def _copy_row(
+        self,
+        record: DBDataModel,
+        columns: tuple[str, ...],
+        types: list[str] | None = None,
+    ) -> tuple[Any, ...]:
+        """
+        Store data of a record as a COPY row, see `bulk_load`.
+
+        Args:
+            record (DBDataModel): The record.
+            columns (tuple[str, ...]): The columns of the COPY query.
+            types (list[str] | None, optional): The column types of the binary format,
+                the values are checked against them. Defaults to None.
+
+        Returns:
+            tuple[Any, ...]: The values of the record.
+        """
+        store_data = record.store_data() or {}
+        if tuple(store_data.keys()) != columns:
+            raise ValueError("All records must have the same store columns")
+
+        row = tuple(store_data.values())
+        if types is not None:
+            for column, column_type, value in zip(columns, types, row, strict=True):
+                if not self._copy_binary_value_fits(column_type, value):
+                    raise ValueError(
+                        f"Value {value!r} of column {column} does not fit {column_type} in binary COPY, "
+                        "use binary=False"
+                    )
+
+        return row
+
+    def _column_type(self, record: DBDataModel, column: str) -> str | None:
+        """
+        Database type of a column, from the `db_field` metadata of the field with the same name.
+
+        Args:
+            record (DBDataModel): The record.
+            column (str): The column name.
+
+        Returns:
+            str | None: The type, None if the field or its `db_field` metadata is not found.
+        """
+        field_obj = record.__dataclass_fields__.get(column)
+        if field_obj is None or "db_field" not in field_obj.metadata:
+            return None
+
+        return cast(MetadataDict, field_obj.metadata)["db_field"][1]
@@ -1,7 +1,8 @@
 import sqlite3
-from typing import Any, NotRequired, TypedDict, cast
+from collections.abc import Callable
+from typing import Any, NotRequired, TypedDict
 
-from database_wrapper import DatabaseBackend
+from database_wrapper import DatabaseBackend, DataModelType
 
 
 def dict_factory(cursor: sqlite3.Cursor, row: tuple) -> dict[str, Any]:
@@ -9,6 +10,25 @@ def dict_factory(cursor: sqlite3.Cursor, row: tuple) -> dict[str, Any]:
     return dict(zip(fields, row, strict=False))
 
 
+def model_factory(model_class: type[DataModelType]) -> Callable[[sqlite3.Cursor, tuple], DataModelType]:
+    """
+    Creates a row factory that returns rows as `model_class` instances.
+    The row maker is rebuilt only when the cursor description changes, that is once per query.
+    """
+    description: Any = None
+    make_model: Callable[[tuple], DataModelType] | None = None
+
+    def factory(cursor: sqlite3.Cursor, row: tuple) -> DataModelType:
+        nonlocal description, make_model
+        if make_model is None or cursor.description is not description:
+            description = cursor.description
+            make_model = model_class.row_maker([col[0] for col in description])
+
+        return make_model(row)
+
+    return factory
+
+
 class SqliteConfig(TypedDict):
     database: str
     timeout: NotRequired[float]
@@ -18,13 +38,15 @@ class SqliteConfig(TypedDict):
 
 class SqliteTypedDictCursor(sqlite3.Cursor):
     """
-    Type hint wrapper only. At runtime, this is just a sqlite3.Cursor
-    that happens to produce dicts because of the row_factory.
+    sqlite3.Cursor that is typed to produce dicts because of the row_factory.
     """
 
     def fetchone(self) -> dict[str, Any] | None:
         return super().fetchone()  # type: ignore
 
+    def fetchmany(self, size: int | None = None) -> list[dict[str, Any]]:
+        return super().fetchmany(self.arraysize if size is None else size)  # type: ignore
+
     def fetchall(self) -> list[dict[str, Any]]:
         return super().fetchall()  # type: ignore
 
@@ -75,7 +97,7 @@ class Sqlite(DatabaseBackend):
         self.connection.row_factory = dict_factory
 
         # Create cursor
-        self.cursor = cast(SqliteTypedDictCursor, self.connection.cursor())
+        self.cursor = self.connection.cursor(SqliteTypedDictCursor)
 
     def ping(self) -> bool:
         try:
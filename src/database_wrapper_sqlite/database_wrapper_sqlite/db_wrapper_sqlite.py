@@ -1,9 +1,10 @@
 import logging
+import sqlite3
 from typing import Any
 
-from database_wrapper import DBWrapper
+from database_wrapper import DataModelType, DBWrapper
 
-from .connector import SqliteTypedDictCursor
+from .connector import SqliteTypedDictCursor, model_factory
 
 
 class DBWrapperSqlite(DBWrapper):
@@ -12,6 +13,12 @@ class DBWrapperSqlite(DBWrapper):
     db_cursor: SqliteTypedDictCursor | None
     """ SQLite cursor object """
 
+    param_placeholder: str = "?"
+    """ sqlite3 uses the qmark paramstyle """
+
+    max_query_params: int = 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
+    """ SQLite allows 32766 parameters per query since 3.32.0, 999 before """
+
     #######################
     ### Class lifecycle ###
     #######################
@@ -66,6 +73,18 @@ class DBWrapperSqlite(DBWrapper):
         # sqlite3 does not support mogrify, so we just log query and params
         logging.getLogger().debug(f"Query: {query} with params: {params}")
 
+    def _new_tuple_cursor(self) -> sqlite3.Cursor:
+        assert self.db_cursor, "Cursor is not initialized"
+        cursor = self.db_cursor.connection.cursor(SqliteTypedDictCursor)
+        cursor.row_factory = None
+        return cursor
+
+    def _new_model_cursor(self, model_class: type[DataModelType]) -> sqlite3.Cursor:
+        assert self.db_cursor, "Cursor is not initialized"
+        cursor = self.db_cursor.connection.cursor(SqliteTypedDictCursor)
+        cursor.row_factory = model_factory(model_class)
+        return cursor
+
     #####################
     ### Query methods ###
     #####################
@@ -1,6 +1,8 @@
 import os
 import unittest
+from dataclasses import dataclass, field
 
+from database_wrapper import BufferedWriter, DBDataModel, MetadataDict
 from database_wrapper_mssql import DBWrapperMssql, Mssql, MssqlConfig
 
 MSSQL_CONFIG: MssqlConfig = {
@@ -12,6 +14,22 @@ MSSQL_CONFIG: MssqlConfig = {
 }
 
 
+@dataclass
+class ItemModel(DBDataModel):
+    @property
+    def table_name(self) -> str:
+        return "dbw_test_items"
+
+    name: str = field(
+        default="",
+        metadata=MetadataDict(
+            db_field=("name", "nvarchar"),
+            store=True,
+            update=True,
+        ),
+    )
+
+
 class TestMssql(unittest.TestCase):
     def test_init(self):
         """Test basic initialization without connecting"""
@@ -42,3 +60,54 @@ class TestMssql(unittest.TestCase):
             db.close()
         except Exception as e:
             self.fail(f"MSSQL test failed with error: {e}")
+
+    @unittest.skipUnless(
+        os.environ.get("TEST_CONNECTIONS", "").lower() in ("1", "true", "yes"),
+        "Skipping connection test. Set TEST_CONNECTIONS=1 to run.",
+    )
+    def test_bulk_insert(self):
+        """Test multi-row inserts set the new ids in input order"""
+        db = Mssql(MSSQL_CONFIG)
+        db.open()
+
+        try:
+            db.cursor.execute("DROP TABLE IF EXISTS dbw_test_items")
+            db.cursor.execute("CREATE TABLE dbw_test_items (id INT IDENTITY PRIMARY KEY, name NVARCHAR(100))")
+            wrapper = DBWrapperMssql(db_cursor=db.cursor)
+
+            records = [ItemModel(name=f"item {i}") for i in range(5)]
+            results = wrapper.insert(records, batch_size=2)
+            self.assertEqual([result[1] for result in results], [1] * 5)
+            self.assertEqual([result[0] for result in results], [record.id for record in records])
+
+            db.cursor.execute("SELECT id, name FROM dbw_test_items")
+            stored = {row["id"]: row["name"] for row in db.cursor.fetchall()}
+            self.assertEqual(stored, {record.id: record.name for record in records})
+
+            db.cursor.execute("DROP TABLE dbw_test_items")
+        finally:
+            db.close()
+
+    @unittest.skipUnless(
+        os.environ.get("TEST_CONNECTIONS", "").lower() in ("1", "true", "yes"),
+        "Skipping connection test. Set TEST_CONNECTIONS=1 to run.",
+    )
+    def test_buffered_writer(self):
+        """Test buffered inserts are flushed with multi-row INSERTs"""
+        db = Mssql(MSSQL_CONFIG)
+        db.open()
+
+        try:
+            db.cursor.execute("DROP TABLE IF EXISTS dbw_test_items")
+            db.cursor.execute("CREATE TABLE dbw_test_items (id INT IDENTITY PRIMARY KEY, name NVARCHAR(100))")
+            wrapper = DBWrapperMssql(db_cursor=db.cursor)
+
+            failed: list[Exception] = []
+            with BufferedWriter(wrapper, max_records=2, on_error=lambda error, records: failed.append(error)) as writer:
+                writer.add_many(ItemModel(name=f"item {i}") for i in range(5))
+            self.assertEqual(failed, [])
+            self.assertEqual(wrapper.count(ItemModel()), 5)
+
+            db.cursor.execute("DROP TABLE dbw_test_items")
+        finally:
+            db.close()
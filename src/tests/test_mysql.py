@@ -1,6 +1,11 @@
+import datetime
 import os
 import unittest
+from dataclasses import dataclass, field
 
+from database_wrapper_mysql.db_wrapper_mysql import load_data_value
+
+from database_wrapper import BufferedWriter, DBDataModel, MetadataDict
 from database_wrapper_mysql import DBWrapperMysql, Mysql, MysqlConfig
 
 MYSQL_CONFIG: MysqlConfig = {
@@ -12,6 +17,22 @@ MYSQL_CONFIG: MysqlConfig = {
 }
 
 
+@dataclass
+class ItemModel(DBDataModel):
+    @property
+    def table_name(self) -> str:
+        return "dbw_test_items"
+
+    name: str = field(
+        default="",
+        metadata=MetadataDict(
+            db_field=("name", "text"),
+            store=True,
+            update=True,
+        ),
+    )
+
+
 class TestMysql(unittest.TestCase):
     def test_init(self):
         """Test basic initialization without connecting"""
@@ -19,6 +40,15 @@ class TestMysql(unittest.TestCase):
         self.assertIsInstance(db, Mysql)
         self.assertEqual(db.config["hostname"], "localhost")
 
+    def test_load_data_value(self):
+        """Test escaping of LOAD DATA fields"""
+        self.assertEqual(load_data_value(None), b"\\N")
+        self.assertEqual(load_data_value("\\N"), b"\\\\N")
+        self.assertEqual(load_data_value("a\tb\nc"), b"a\\tb\\nc")
+        self.assertEqual(load_data_value({"a": "\n"}), b'{"a": "\\\\n"}')
+        value = datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.UTC)
+        self.assertEqual(load_data_value(value), b"2024-01-02 03:04:05")
+
     @unittest.skipUnless(
         os.environ.get("TEST_CONNECTIONS", "").lower() in ("1", "true", "yes"),
         "Skipping connection test. Set TEST_CONNECTIONS=1 to run.",
@@ -42,3 +72,54 @@ class TestMysql(unittest.TestCase):
             db.close()
         except Exception as e:
             self.fail(f"MySQL test failed with error: {e}")
+
+    @unittest.skipUnless(
+        os.environ.get("TEST_CONNECTIONS", "").lower() in ("1", "true", "yes"),
+        "Skipping connection test. Set TEST_CONNECTIONS=1 to run.",
+    )
+    def test_bulk_insert(self):
+        """Test multi-row inserts set the new ids in input order"""
+        db = Mysql(MYSQL_CONFIG)
+        db.open()
+
+        try:
+            db.cursor.execute("DROP TABLE IF EXISTS dbw_test_items")
+            db.cursor.execute("CREATE TABLE dbw_test_items (id INT AUTO_INCREMENT PRIMARY KEY, name TEXT)")
+            wrapper = DBWrapperMysql(db_cursor=db.cursor)
+
+            records = [ItemModel(name=f"item {i}") for i in range(5)]
+            results = wrapper.insert(records, batch_size=2)
+            self.assertEqual([result[1] for result in results], [1] * 5)
+            self.assertEqual([result[0] for result in results], [record.id for record in records])
+
+            db.cursor.execute("SELECT id, name FROM dbw_test_items")
+            stored = {row["id"]: row["name"] for row in db.cursor.fetchall()}
+            self.assertEqual(stored, {record.id: record.name for record in records})
+
+            db.cursor.execute("DROP TABLE dbw_test_items")
+        finally:
+            db.close()
+
+    @unittest.skipUnless(
+        os.environ.get("TEST_CONNECTIONS", "").lower() in ("1", "true", "yes"),
+        "Skipping connection test. Set TEST_CONNECTIONS=1 to run.",
+    )
+    def test_buffered_writer(self):
+        """Test buffered inserts are flushed with multi-row INSERTs"""
+        db = Mysql(MYSQL_CONFIG)
+        db.open()
+
+        try:
+            db.cursor.execute("DROP TABLE IF EXISTS dbw_test_items")
+            db.cursor.execute("CREATE TABLE dbw_test_items (id INT AUTO_INCREMENT PRIMARY KEY, name TEXT)")
+            wrapper = DBWrapperMysql(db_cursor=db.cursor)
+
+            failed: list[Exception] = []
+            with BufferedWriter(wrapper, max_records=2, on_error=lambda error, records: failed.append(error)) as writer:
+                writer.add_many(ItemModel(name=f"item {i}") for i in range(5))
+            self.assertEqual(failed, [])
+            self.assertEqual(wrapper.count(ItemModel()), 5)
+
+            db.cursor.execute("DROP TABLE dbw_test_items")
+        finally:
+            db.close()
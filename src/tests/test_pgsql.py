@@ -1,9 +1,17 @@
+import datetime
 import os
 import unittest
+from dataclasses import dataclass, field
+from decimal import Decimal
 from unittest import IsolatedAsyncioTestCase
 
+import psycopg
+
+from database_wrapper import DBDataModel, MetadataDict
 from database_wrapper_pgsql import (
+    DBWrapperPgsql,
     DBWrapperPgsqlAsync,
+    Pgsql,
     PgsqlConfig,
     PgsqlWithPoolingAsync,
 )
@@ -19,6 +27,48 @@ POSTGRES_CONFIG: PgsqlConfig = {
 }
 
 
+@dataclass
+class ItemModel(DBDataModel):
+    @property
+    def table_name(self) -> str:
+        return "dbw_test_items"
+
+    name: str = field(
+        default="",
+        metadata=MetadataDict(
+            db_field=("name", "text"),
+            store=True,
+            update=True,
+        ),
+    )
+
+
+@dataclass
+class ItemViewModel(ItemModel):
+    def query_base(self) -> str:
+        return "SELECT * FROM dbw_test_items"
+
+
+@dataclass
+class LoadModel(DBDataModel):
+    @property
+    def table_name(self) -> str:
+        return "dbw_test_loads"
+
+    amount: Decimal | int | None = field(
+        default=None,
+        metadata=MetadataDict(db_field=("amount", "numeric"), store=True),
+    )
+    day: datetime.date | None = field(
+        default=None,
+        metadata=MetadataDict(db_field=("day", "date"), store=True),
+    )
+    count: int | None = field(
+        default=None,
+        metadata=MetadataDict(db_field=("count", "integer"), store=True),
+    )
+
+
 class TestPgsqlAsync(IsolatedAsyncioTestCase):
     def test_init(self):
         """Test basic initialization"""
@@ -26,6 +76,39 @@ class TestPgsqlAsync(IsolatedAsyncioTestCase):
         self.assertIsInstance(pool, PgsqlWithPoolingAsync)
         self.assertEqual(pool.config["hostname"], "localhost")
 
+    async def test_prefetch_batches(self):
+        """Test read-ahead of batches in a background task"""
+        wrapper = DBWrapperPgsqlAsync()
+        closed: list[bool] = []
+
+        async def batches(count: int, fail_at: int | None = None):
+            try:
+                for index in range(count):
+                    if index == fail_at:
+                        raise RuntimeError("Fetch failed")
+                    yield [index]
+            finally:
+                closed.append(True)
+
+        # Test 1: Batches come in the same order
+        result = [batch async for batch in wrapper._prefetch_batches(batches(10), 2)]
+        self.assertEqual(result, [[index] for index in range(10)])
+
+        # Test 2: Errors of the reader are raised in the caller
+        with self.assertRaises(RuntimeError):
+            async for _batch in wrapper._prefetch_batches(batches(10, fail_at=3), 2):
+                pass
+
+        # Test 3: Stopping early closes the batches
+        closed.clear()
+        prefetched = wrapper._prefetch_batches(batches(10), 2)
+        self.assertEqual(await anext(prefetched), [0])
+        await prefetched.aclose()
+        self.assertEqual(closed, [True])
+
+        with self.assertRaises(ValueError):
+            await anext(wrapper._prefetch_batches(batches(1), 0))
+
     @unittest.skipUnless(
         os.environ.get("TEST_CONNECTIONS", "").lower() in ("1", "true", "yes"),
         "Skipping connection test. Set TEST_CONNECTIONS=1 to run.",
@@ -51,3 +134,237 @@ class TestPgsqlAsync(IsolatedAsyncioTestCase):
             await pool.close_pool()
         except Exception as e:
             self.fail(f"PGSQL test failed with error: {e}")
+
+    @unittest.skipUnless(
+        os.environ.get("TEST_CONNECTIONS", "").lower() in ("1", "true", "yes"),
+        "Skipping connection test. Set TEST_CONNECTIONS=1 to run.",
+    )
+    async def test_stream(self):
+        """Test server-side cursor streams, sync and async"""
+        db = Pgsql(POSTGRES_CONFIG)
+        db.open()
+        pool = PgsqlWithPoolingAsync(POSTGRES_CONFIG)
+        await pool.open_pool()
+
+        try:
+            db.cursor.execute("DROP TABLE IF EXISTS dbw_test_items")
+            db.cursor.execute("CREATE TABLE dbw_test_items (id serial PRIMARY KEY, name text)")
+            db.cursor.execute("INSERT INTO dbw_test_items (name) SELECT 'item ' || i FROM generate_series(1, 50) AS i")
+            wrapper = DBWrapperPgsql(db_cursor=db.cursor)
+
+            # Test 1: All rows arrive in order, fetched itersize rows at a time
+            records = list(wrapper.get_filtered_stream(ItemModel(), order_by=[("id", "ASC")], itersize=7))
+            self.assertEqual([record.id for record in records], list(range(1, 51)))
+            self.assertEqual(records[9].name, "item 10")
+
+            # Test 2: Filter, offset and limit are applied
+            stream = wrapper.get_filtered_stream(
+                ItemModel(), {"id": {"$gt": 10}}, order_by=[("id", "ASC")], offset=5, limit=3, itersize=2
+            )
+            self.assertEqual([record.id for record in stream], [16, 17, 18])
+
+            # Test 3: Stopping early closes the cursor and its transaction
+            stream = wrapper.get_filtered_stream(ItemModel(), itersize=5)
+            self.assertIsInstance(next(stream), ItemModel)
+            stream.close()
+            self.assertEqual(wrapper.count(ItemModel()), 50)
+
+            # Test 4: Inside an open transaction the stream uses a savepoint
+            with db.connection.transaction():
+                records = list(wrapper.get_filtered_stream(ItemModel(), {"id": {"$lte": 3}}, itersize=2))
+                self.assertEqual(len(records), 3)
+
+            # Test 5: Async stream
+            async with pool as (_conn, cursor):
+                async_wrapper = DBWrapperPgsqlAsync(db_cursor=cursor)
+                stream = async_wrapper.get_filtered_stream(ItemModel(), order_by=[("id", "DESC")], itersize=7)
+                self.assertEqual([record.id async for record in stream], list(range(50, 0, -1)))
+
+            db.cursor.execute("DROP TABLE dbw_test_items")
+        finally:
+            db.close()
+            await pool.close_pool()
+
+    @unittest.skipUnless(
+        os.environ.get("TEST_CONNECTIONS", "").lower() in ("1", "true", "yes"),
+        "Skipping connection test. Set TEST_CONNECTIONS=1 to run.",
+    )
+    async def test_count_exists(self):
+        """Test count and exists queries"""
+        pool = PgsqlWithPoolingAsync(POSTGRES_CONFIG)
+        await pool.open_pool()
+
+        try:
+            async with pool as (_conn, cursor):
+                await cursor.execute("DROP TABLE IF EXISTS dbw_test_items")
+                await cursor.execute("CREATE TABLE dbw_test_items (id serial PRIMARY KEY, name text)")
+                wrapper = DBWrapperPgsqlAsync(db_cursor=cursor)
+
+                self.assertEqual(await wrapper.count(ItemModel()), 0)
+                self.assertIs(await wrapper.exists(ItemModel()), False)
+
+                await cursor.execute(
+                    "INSERT INTO dbw_test_items (name) SELECT 'item ' || i FROM generate_series(1, 10) AS i"
+                )
+                self.assertEqual(await wrapper.count(ItemModel(), {"id": {"$gt": 3}}), 7)
+                self.assertIs(await wrapper.exists(ItemModel(), {"name": "item 10"}), True)
+                self.assertIs(await wrapper.exists(ItemModel(), {"name": "item 11"}), False)
+
+                await cursor.execute("DROP TABLE dbw_test_items")
+        finally:
+            await pool.close_pool()
+
+    @unittest.skipUnless(
+        os.environ.get("TEST_CONNECTIONS", "").lower() in ("1", "true", "yes"),
+        "Skipping connection test. Set TEST_CONNECTIONS=1 to run.",
+    )
+    async def test_parallel_scan(self):
+        """Test parallel scans by ctid and key ranges from one snapshot, and the server-side stream"""
+        pool = PgsqlWithPoolingAsync(POSTGRES_CONFIG)
+        await pool.open_pool()
+
+        try:
+            async with pool as (conn, cursor):
+                await cursor.execute("DROP TABLE IF EXISTS dbw_test_items")
+                await cursor.execute("CREATE TABLE dbw_test_items (id serial PRIMARY KEY, name text)")
+                await cursor.execute(
+                    "INSERT INTO dbw_test_items (name) SELECT 'item ' || i FROM generate_series(1, 5000) AS i"
+                )
+                wrapper = DBWrapperPgsqlAsync(db_cursor=cursor)
+                expected = list(range(1, 5001))
+
+                # Test 1: Ranges cover the whole key space, the outer ones are open-ended
+                ranges = wrapper._format_scan_ranges("id", 1, 5001, 4)
+                self.assertEqual(
+                    [params for (_condition, params) in ranges], [(1251,), (1251, 2501), (2501, 3751), (3751,)]
+                )
+                self.assertEqual(wrapper._format_scan_ranges("id", None, None, 4)[0][1], tuple())
+
+                # Test 2: Ctid ranges return every row once, merged from all partitions
+                records = [record async for record in wrapper.parallel_scan(ItemModel(), pool, partitions=4)]
+                self.assertEqual(sorted(record.id for record in records), expected)
+                self.assertEqual({record.name for record in records if record.id == 42}, {"item 42"})
+
+                # Test 3: Key ranges read from the exported snapshot, later changes are not seen
+                scan = wrapper.parallel_scan(ItemModel(), pool, partitions=4, partition_key="id", itersize=100)
+                records = [await anext(scan)]
+                async with pool as (_other_conn, other_cursor):
+                    await other_cursor.execute("DELETE FROM dbw_test_items WHERE id <= 100")
+                    await other_cursor.execute("INSERT INTO dbw_test_items (name) VALUES ('late')")
+                records.extend([record async for record in scan])
+                self.assertEqual(sorted(record.id for record in records), expected)
+
+                # Test 4: Scan inside an already open transaction uses it for the snapshot
+                async with conn.transaction():
+                    await cursor.execute("SELECT 1")
+                    records = [record async for record in wrapper.parallel_scan(ItemModel(), pool, partitions=2)]
+                self.assertEqual(len(records), 4901)
+
+                # Test 5: Server-side stream with prefetch returns all rows in order
+                stream = wrapper.get_filtered_stream(ItemModel(), order_by=[("id", "ASC")], itersize=500, prefetch=2)
+                records = [record async for record in stream]
+                self.assertEqual([record.id for record in records], expected[100:] + [5001])
+
+                # Test 6: Data models with a query base are rejected
+                with self.assertRaises(ValueError):
+                    async for _record in wrapper.parallel_scan(ItemViewModel(), pool):
+                        pass
+
+                await cursor.execute("DROP TABLE dbw_test_items")
+        finally:
+            await pool.close_pool()
+
+    @unittest.skipUnless(
+        os.environ.get("TEST_CONNECTIONS", "").lower() in ("1", "true", "yes"),
+        "Skipping connection test. Set TEST_CONNECTIONS=1 to run.",
+    )
+    async def test_bulk_load(self):
+        """Test COPY loads in the binary and text formats"""
+        pool = PgsqlWithPoolingAsync(POSTGRES_CONFIG)
+        await pool.open_pool()
+
+        try:
+            async with pool as (_conn, cursor):
+                await cursor.execute("DROP TABLE IF EXISTS dbw_test_loads")
+                await cursor.execute(
+                    "CREATE TABLE dbw_test_loads (id serial PRIMARY KEY, amount numeric, day date, count integer)"
+                )
+                wrapper = DBWrapperPgsqlAsync(db_cursor=cursor)
+                day = datetime.date(2024, 1, 2)
+
+                # Test 1: Binary types come from db_field metadata, not from the first record
+                (_query, types) = wrapper._format_copy_query(LoadModel(), LoadModel().store_data() or {})
+                self.assertEqual(types, ["numeric", "date", "integer"])
+
+                # Test 2: Mixed None, int and Decimal values load in the binary format
+                records = [
+                    LoadModel(),
+                    LoadModel(amount=5, day=day, count=1),
+                    LoadModel(amount=Decimal("2.25"), count=-(2**31)),
+                ]
+                self.assertEqual(await wrapper.bulk_load(records), 3)
+                await cursor.execute("SELECT amount, day, count FROM dbw_test_loads ORDER BY id")
+                rows = await cursor.fetchall()
+                self.assertEqual(
+                    [(row["amount"], row["day"], row["count"]) for row in rows],
+                    [(None, None, None), (Decimal(5), day, 1), (Decimal("2.25"), None, -(2**31))],
+                )
+
+                # Test 3: Values that binary COPY would store wrong are rejected
+                with self.assertRaises(ValueError):
+                    await wrapper.bulk_load([LoadModel(day=day), LoadModel(day=datetime.datetime(2024, 1, 2, 3))])
+                with self.assertRaises(ValueError):
+                    await wrapper.bulk_load([LoadModel(count=2**31)])
+                with self.assertRaises(ValueError):
+                    await wrapper.bulk_load([LoadModel(count=True)])
+
+                # Test 4: The text format takes them
+                loaded = await wrapper.bulk_load([LoadModel(day=datetime.datetime(2024, 1, 2, 3))], binary=False)
+                self.assertEqual(loaded, 1)
+                await cursor.execute("SELECT count(*) AS total FROM dbw_test_loads")
+                self.assertEqual((await cursor.fetchone() or {})["total"], 4)
+
+                await cursor.execute("DROP TABLE dbw_test_loads")
+        finally:
+            await pool.close_pool()
+
+    @unittest.skipUnless(
+        os.environ.get("TEST_CONNECTIONS", "").lower() in ("1", "true", "yes"),
+        "Skipping connection test. Set TEST_CONNECTIONS=1 to run.",
+    )
+    async def test_parallel_insert(self):
+        """Test inserts spread over pooled connections"""
+        pool = PgsqlWithPoolingAsync(POSTGRES_CONFIG)
+        await pool.open_pool()
+
+        try:
+            async with pool as (_conn, cursor):
+                await cursor.execute("DROP TABLE IF EXISTS dbw_test_items")
+                await cursor.execute("CREATE TABLE dbw_test_items (id serial PRIMARY KEY, name text UNIQUE)")
+                wrapper = DBWrapperPgsqlAsync(db_cursor=cursor)
+
+                # Test 1: Ids are set on the records and returned in input order
+                records = [ItemModel(name=f"item {i}") for i in range(250)]
+                results = await wrapper.parallel_insert(records, pool, concurrency=3, batch_size=20)
+                self.assertEqual(len(results), 250)
+                self.assertEqual([result[0] for result in results], [record.id for record in records])
+                self.assertEqual({result[1] for result in results}, {1})
+                await cursor.execute("SELECT id, name FROM dbw_test_items")
+                stored = {row["id"]: row["name"] for row in await cursor.fetchall()}
+                self.assertEqual(stored, {record.id: record.name for record in records})
+
+                # Test 2: A failing chunk raises the error and returns the connections to the pool
+                failing = [ItemModel(name=f"more {i}") for i in range(100)] + [ItemModel(name="item 7")]
+                with self.assertRaises(psycopg.errors.UniqueViolation):
+                    await wrapper.parallel_insert(failing, pool, concurrency=3, batch_size=20)
+                await cursor.execute("SELECT count(*) AS total FROM dbw_test_items WHERE name = 'item 7'")
+                self.assertEqual((await cursor.fetchone() or {})["total"], 1)
+
+                # Test 3: The pool is still usable, an empty list stores nothing
+                results = await wrapper.parallel_insert([ItemModel(name="last")], pool, concurrency=2)
+                self.assertEqual(len(results), 1)
+                self.assertEqual(await wrapper.parallel_insert([], pool), [])
+
+                await cursor.execute("DROP TABLE dbw_test_items")
+        finally:
+            await pool.close_pool()
@@ -1,8 +1,104 @@
+import datetime
+import importlib.util
 import unittest
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any, ClassVar
 
+from database_wrapper import BufferedWriter, DBDataModel, DBDefaultsDataModel, MetadataDict, pagination
 from database_wrapper_sqlite import DBWrapperSqlite, Sqlite, SqliteConfig
 
 
+@dataclass
+class UserModel(DBDataModel):
+    @property
+    def table_name(self) -> str:
+        return "users"
+
+    name: str = field(
+        default="",
+        metadata=MetadataDict(
+            db_field=("name", "text"),
+            store=True,
+            update=True,
+        ),
+    )
+
+
+@dataclass
+class LazyUserModel(UserModel):
+    _lazy_deserialize: ClassVar[bool] = True
+
+    tags: Any = field(
+        default=None,
+        metadata=MetadataDict(
+            db_field=("tags", "text"),
+            store=True,
+            update=True,
+            deserialize=lambda value: value.split(","),
+        ),
+    )
+
+
+@dataclass
+class TrackedUserModel(UserModel):
+    _track_changes: ClassVar[bool] = True
+
+
+@dataclass
+class ScoredUserModel(UserModel):
+    score: int = field(
+        default=0,
+        init=False,
+        metadata=MetadataDict(
+            db_field=("score", "integer"),
+            store=True,
+            update=True,
+        ),
+    )
+
+
+@dataclass
+class AccountModel(DBDefaultsDataModel):
+    _select_db_fields: ClassVar[bool] = True
+    _defaults_config: ClassVar[list[str]] = ["created_at"]
+
+    @property
+    def table_name(self) -> str:
+        return "accounts"
+
+    @property
+    def id_key(self) -> str:
+        return "uid"
+
+    uid: int = field(
+        default=0,
+        metadata=MetadataDict(
+            db_field=("uid", "integer"),
+            store=False,
+            update=False,
+        ),
+    )
+
+    name: str = field(
+        default="",
+        metadata=MetadataDict(
+            db_field=("name", "text"),
+            store=True,
+            update=True,
+        ),
+    )
+
+
+@dataclass
+class MissingTableModel(UserModel):
+    @property
+    def table_name(self) -> str:
+        return "missing"
+
+
 class TestSqlite(unittest.TestCase):
     def test_connection_and_query(self):
         # SQLite should always work as it can be in-memory
@@ -38,6 +134,300 @@ class TestSqlite(unittest.TestCase):
         self.assertIsInstance(user, dict)
         self.assertEqual(user["name"], "Alice")
 
+        # Test 5: Literal %s in the SQL text is not a placeholder
+        db.cursor.execute("SELECT '%s' AS val WHERE ? = 1", (1,))
+        self.assertEqual(db.cursor.fetchone()["val"], "%s")
+        self.assertEqual(wrapper.count(UserModel(), {"name": {"$starts_with": "Ali"}}), 1)
+
+        db.close()
+
+    def test_wrapper_batches(self):
+        config: SqliteConfig = {"database": ":memory:"}
+
+        db = Sqlite(config)
+        db.open()
+        db.cursor.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)")
+        db.cursor.executemany("INSERT INTO users (name) VALUES (?)", [(f"user{i}",) for i in range(10)])
+
+        wrapper = DBWrapperSqlite(db_cursor=db.cursor)
+
+        # Test 1: Batch size does not change the result
+        users = list(wrapper.get_all(UserModel(), limit=0, batch_size=3))
+        self.assertEqual([user.name for user in users], [f"user{i}" for i in range(10)])
+
+        # Test 2: Batches are filled up to batch size
+        batches = list(wrapper.iter_batches(UserModel(), order_by=[("id", "ASC")], limit=0, batch_size=4))
+        self.assertEqual([len(batch) for batch in batches], [4, 4, 2])
+        self.assertIsInstance(batches[0][0], UserModel)
+
+        # Test 3: Driver row factory builds the same models
+        wrapper.use_model_row_factory = True
+        users = list(wrapper.get_all(UserModel(), order_by=[("id", "ASC")], limit=0, batch_size=3))
+        self.assertEqual([user.name for user in users], [f"user{i}" for i in range(10)])
+        self.assertEqual(users[9].id, 10)
+
+        # Test 4: Raw rows skip the data model
+        rows = list(wrapper.get_all_raw(UserModel(), order_by=[("id", "ASC")], limit=2))
+        self.assertEqual(rows, [{"id": 1, "name": "user0"}, {"id": 2, "name": "user1"}])
+        rows = list(wrapper.get_filtered_raw(UserModel(), order_by=[("id", "ASC")], limit=2, as_tuples=True))
+        self.assertEqual(rows, [(1, "user0"), (2, "user1")])
+
+        # Test 5: Unselected columns keep their defaults
+        users = list(wrapper.get_all(UserModel(), order_by=[("id", "ASC")], limit=2, columns=["id"]))
+        self.assertEqual([(user.id, user.name) for user in users], [(1, ""), (2, "")])
+
+        # Test 6: Multi-get by id in input order, missing ids are left out
+        users = wrapper.get_many(UserModel(), [7, 2, 99, 5], chunk_size=2, as_list=True)
+        self.assertEqual([user.name for user in users], ["user6", "user1", "user4"])
+        self.assertEqual(list(wrapper.get_many(UserModel(), [3, 1]).keys()), [3, 1])
+
+        # Test 7: Count and exists without fetching rows
+        self.assertEqual(wrapper.count(UserModel(), {"id": {"$gt": 4}}), 6)
+        self.assertTrue(wrapper.exists(UserModel(), {"name": "user3"}))
+        self.assertFalse(wrapper.exists(UserModel(), {"name": "nobody"}))
+
+        # Test 8: Models built in an executor keep their order
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            wrapper.model_executor = executor
+            users = list(wrapper.get_all(UserModel(), order_by=[("id", "ASC")], limit=0, batch_size=3))
+            wrapper.model_executor = None
+        self.assertEqual([user.id for user in users], list(range(1, 11)))
+        self.assertEqual(users[0].raw_data["name"], "user0")
+
+        # Test 9: Materialized result spills to disk and can be read many times
+        result = wrapper.materialize(UserModel(), order_by=[("id", "ASC")], limit=0, batch_size=3, memory_budget=64)
+        with result:
+            self.assertTrue(result.spilled)
+            self.assertEqual(len(result), 10)
+            self.assertEqual([user.id for user in result], [user.id for user in result])
+            self.assertEqual((result[4].name, result[-1].name), ("user4", "user9"))
+
+        # Test 10: Multi-row insert sets the new ids in input order
+        new_users = [UserModel(name=f"new{i}") for i in range(5)]
+        self.assertEqual(
+            wrapper.insert(new_users, bulk=True, batch_size=2),
+            [(11, 1), (12, 1), (13, 1), (14, 1), (15, 1)],
+        )
+        self.assertEqual([user.id for user in new_users], [11, 12, 13, 14, 15])
+        self.assertEqual(wrapper.get_many(UserModel(), [14], as_list=True)[0].name, "new3")
+        self.assertEqual(
+            [(user.id, user.name) for user in wrapper.get_many(UserModel(), [11, 15], as_list=True)],
+            [(11, "new0"), (15, "new4")],
+        )
+
+        # Test 11: executemany batches report affected rows per chunk
+        self.assertEqual(wrapper.insert_batch([UserModel(name=f"bulk{i}") for i in range(5)], batch_size=2), [2, 2, 1])
+        for user in new_users:
+            user.name = user.name.upper()
+        self.assertEqual(wrapper.update_batch(new_users, batch_size=3), [3, 2])
+        self.assertEqual(wrapper.delete_batch(new_users[:4], batch_size=3), [3, 1])
+        self.assertEqual(wrapper.count(UserModel()), 16)
+
+        # Test 12: Bulk update reports affected rows per id, missing ids are 0
+        users = wrapper.get_many(UserModel(), [1, 2, 3], as_list=True)
+        for user in users:
+            user.name = f"renamed{user.id}"
+        users.insert(1, UserModel(id=99, name="missing"))
+        self.assertEqual(wrapper.update(users, bulk=True, batch_size=2), [1, 0, 1, 1])
+        self.assertEqual(wrapper.get_many(UserModel(), [3], as_list=True)[0].name, "renamed3")
+
+        # Test 13: Bulk delete by id, a repeated id is deleted once
+        self.assertEqual(wrapper.delete([users[0], users[1], users[2], users[0]], batch_size=2), [1, 0, 1, 0])
+        self.assertEqual(wrapper.count(UserModel(), {"id": {"$in": [1, 2, 3]}}), 1)
+
+        # Test 14: Upsert inserts new rows and returns the ids of existing ones
+        db.cursor.execute("CREATE UNIQUE INDEX users_name ON users (name)")
+        upserted = [UserModel(name="user5"), UserModel(name="fresh")]
+        self.assertEqual(wrapper.upsert(upserted, conflict_keys=["name"]), [(6, 1), (21, 1)])
+        self.assertEqual(wrapper.count(UserModel(), {"name": "user5"}), 1)
+
+        # Test 15: Tracked models send only changed fields and skip unchanged records
+        user = wrapper.get_many(TrackedUserModel(), [4], as_list=True)[0]
+        self.assertEqual(user.changed_update_data(), {})
+        self.assertEqual(wrapper.update(user), 0)
+        user.name = "changed"
+        self.assertEqual(user.changed_update_data(), {"name": "changed"})
+        self.assertEqual(wrapper.update(user), 1)
+        self.assertEqual(user.changed_update_data(), {})
+
+        db.close()
+
+    def test_select_columns(self):
+        # Only the active defaults and the key column of `id_key` are selected
+        self.assertEqual(AccountModel().select_columns(), ["created_at", "uid", "name"])
+
+        db = Sqlite({"database": ":memory:"})
+        db.open()
+        db.cursor.execute("CREATE TABLE accounts (uid INTEGER PRIMARY KEY, created_at TEXT, name TEXT)")
+        db.cursor.execute("INSERT INTO accounts (uid, created_at, name) VALUES (5, '2024-01-02T03:04:05+00:00', 'Eve')")
+        wrapper = DBWrapperSqlite(db_cursor=db.cursor)
+
+        account = wrapper.get_by_key(AccountModel(), "uid", 5)
+        assert account is not None
+        self.assertEqual((account.uid, account.name), (5, "Eve"))
+        self.assertEqual(account.created_at, datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.UTC))
+        db.close()
+
+    def test_count_exists(self):
+        config: SqliteConfig = {"database": ":memory:"}
+
+        db = Sqlite(config)
+        db.open()
+        db.cursor.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)")
+
+        wrapper = DBWrapperSqlite(db_cursor=db.cursor)
+
+        # Test 1: Empty table
+        self.assertEqual(wrapper.count(UserModel()), 0)
+        self.assertIs(wrapper.exists(UserModel()), False)
+
+        # Test 2: Filters are applied with their parameters
+        db.cursor.executemany("INSERT INTO users (name) VALUES (?)", [(f"user{i}",) for i in range(10)])
+        self.assertEqual(wrapper.count(UserModel()), 10)
+        self.assertEqual(wrapper.count(UserModel(), {"id": {"$in": [2, 4, 99]}}), 2)
+        self.assertEqual(wrapper.count(UserModel(), {"id": {"$gt": 3}, "name": {"$ends_with": "9"}}), 1)
+        self.assertIs(wrapper.exists(UserModel(), {"id": 10}), True)
+        self.assertIs(wrapper.exists(UserModel(), {"id": 11}), False)
+
+        # Test 3: Custom queries are wrapped as they are
+        custom_query = "SELECT * FROM users WHERE name LIKE 'user1%'"
+        self.assertEqual(wrapper.count(UserModel(), custom_query=custom_query), 1)
+        self.assertIs(wrapper.exists(UserModel(), custom_query=custom_query), True)
+        self.assertIs(wrapper.exists(UserModel(), custom_query="SELECT * FROM users WHERE id > 10"), False)
+
+        db.close()
+
+    def test_keyset_pagination(self):
+        # Test 1: Tokens bring back the same types
+        values = [
+            datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.UTC),
+            datetime.date(2024, 1, 2),
+            datetime.time(3, 4, 5),
+            Decimal("1.10"),
+            uuid.UUID(int=1),
+            "text",
+            7,
+            None,
+        ]
+        columns = [f"c{i}" for i in range(len(values))]
+        decoded = pagination.decode_page_token(pagination.encode_page_token(columns, values), columns)
+        self.assertEqual(decoded, values)
+        self.assertEqual([type(value) for value in decoded], [type(value) for value in values])
+
+        # Test 2: Invalid tokens and tokens of another sort order are rejected
+        self.assertRaises(ValueError, pagination.decode_page_token, "not a token!", columns)
+        self.assertRaises(
+            ValueError, pagination.decode_page_token, pagination.encode_page_token(["id"], [1]), ["name", "id"]
+        )
+
+        config: SqliteConfig = {"database": ":memory:"}
+
+        db = Sqlite(config)
+        db.open()
+        db.cursor.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)")
+        db.cursor.executemany("INSERT INTO users (name) VALUES (?)", [(f"user{i % 3}",) for i in range(10)])
+
+        wrapper = DBWrapperSqlite(db_cursor=db.cursor)
+
+        # Test 3: Pages follow each other, the last one has no token
+        pages = list(wrapper.iter_pages(UserModel(), page_size=4))
+        self.assertEqual([[user.id for user in page.items] for page in pages], [[1, 2, 3, 4], [5, 6, 7, 8], [9, 10]])
+        self.assertIsNone(pages[-1].next_token)
+
+        # Test 4: A full last page still has a token, the page after it is empty
+        pages = list(wrapper.iter_pages(UserModel(), page_size=5))
+        self.assertEqual([len(page.items) for page in pages], [5, 5, 0])
+        self.assertIsNotNone(pages[1].next_token)
+        self.assertIsNone(pages[2].next_token)
+
+        # Test 5: Sort keys with ties are continued on the unique column
+        order_by = [("name", "DESC"), ("id", "ASC")]
+        first = wrapper.get_page(UserModel(), {"id": {"$gt": 1}}, order_by=order_by, page_size=4)
+        second = wrapper.get_page(
+            UserModel(), {"id": {"$gt": 1}}, order_by=order_by, page_size=4, page_token=first.next_token
+        )
+        self.assertEqual([user.id for user in first.items + second.items], [3, 6, 9, 2, 5, 8, 4, 7])
+        with self.assertRaises(ValueError):
+            wrapper.get_page(UserModel(), page_size=4, page_token=first.next_token)
+
+        db.close()
+
+    def test_buffered_writer(self):
+        # The writer stores from its own thread
+        config: SqliteConfig = {"database": ":memory:", "kwargs": {"check_same_thread": False}}
+
+        db = Sqlite(config)
+        db.open()
+        db.cursor.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)")
+
+        wrapper = DBWrapperSqlite(db_cursor=db.cursor)
+
+        # Test 1: Full buffers are flushed, the rest on close
+        with BufferedWriter(wrapper, max_records=2, max_age=60, max_buffered=4) as writer:
+            writer.add_many(UserModel(name=f"user{i}") for i in range(5))
+            writer.flush()
+            self.assertEqual(writer.pending, 0)
+            writer.add(UserModel(name="last"))
+        self.assertEqual(wrapper.count(UserModel()), 6)
+        self.assertRaises(RuntimeError, writer.add, UserModel())
+
+        # Test 2: Failed flushes are passed to the error callback
+        failed: list[tuple[Exception, list[DBDataModel]]] = []
+        with BufferedWriter(wrapper, on_error=lambda error, records: failed.append((error, records))) as writer:
+            writer.add(MissingTableModel(name="lost"))
+        self.assertEqual(len(failed), 1)
+        self.assertEqual(failed[0][1][0].name, "lost")
+
+        db.close()
+
+    @unittest.skipUnless(importlib.util.find_spec("numpy"), "NumPy is not installed")
+    def test_wrapper_columnar(self):
+        config: SqliteConfig = {"database": ":memory:"}
+
+        db = Sqlite(config)
+        db.open()
+        db.cursor.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, score REAL)")
+        db.cursor.executemany(
+            "INSERT INTO users (name, score) VALUES (?, ?)",
+            [(f"user{i}", None if i == 3 else i / 2) for i in range(10)],
+        )
+
+        wrapper = DBWrapperSqlite(db_cursor=db.cursor)
+        columns = wrapper.get_filtered_columnar(UserModel(), limit=0, batch_size=4)
+
+        self.assertEqual(list(columns.keys()), ["id", "name", "score"])
+        self.assertEqual(columns["id"].dtype.name, "int64")
+        self.assertEqual(columns["score"].dtype.name, "float64")
+        self.assertEqual(columns["name"][9], "user9")
+        self.assertEqual(columns["id"].sum(), 55)
+
+        db.close()
+
+    def test_lazy_deserialize(self):
+        user = LazyUserModel.from_db_row({"id": 1, "name": "Alice", "tags": "a,b"})
+
+        # Raw value is kept until the field is read
+        self.assertEqual(user.__dict__["tags"].raw, "a,b")
+        self.assertEqual(user.tags, ["a", "b"])
+        self.assertEqual(user.__dict__["tags"], ["a", "b"])
+        self.assertEqual(LazyUserModel().tags, None)
+
+    def test_non_init_fields(self):
+        # Fields the constructor does not take are still filled from the row
+        user = ScoredUserModel.from_db_row({"id": 1, "name": "Alice", "score": 7})
+        self.assertEqual((user.name, user.score), ("Alice", 7))
+
+        user = ScoredUserModel.row_maker(["id", "score", "name"])((2, 8, "Bob"))
+        self.assertEqual((user.id, user.name, user.score), (2, "Bob", 8))
+        self.assertEqual(ScoredUserModel.from_db_row({"id": 3}).score, 0)
+
+        # init=False columns are selected too
+        db = Sqlite({"database": ":memory:"})
+        db.open()
+        db.cursor.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, score INTEGER)")
+        db.cursor.execute("INSERT INTO users (name, score) VALUES ('Carol', 9)")
+        wrapper = DBWrapperSqlite(db_cursor=db.cursor)
+        self.assertEqual([user.score for user in wrapper.get_all(ScoredUserModel())], [9])
         db.close()
 
 